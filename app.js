@@ -1,6 +1,9 @@
-// FPL API endpoints
-const PROXY_URL = 'https://corsproxy.io/?';
-const FPL_BASE_URL = 'https://fantasy.premierleague.com/api';
+// FPL API endpoints (proxied and cached by proxy_server.py)
+const FPL_BASE_URL = '/api';
+const STREAM_URL = '/stream';
+// Compact per-league payload (slim_payload.py); only served with proxy_server.py --leagues
+const SLIM_URL = '/slim';
+const SLIM_VERSION = 2;
 
 // Hardcoded H2H League
 const H2H_LEAGUE_ID = 1017641;
@@ -12,6 +15,16 @@ let playersData = {};
 let teamsInfo = {};
 let h2hMatches = [];
 let fixturesData = {};
+let liveElements = {};
+let picksByTeam = {};
+let liveStream = null;
+let lastDeltaSeq = null;
+let needsResync = false;
+let winOdds = {};
+let subbedOff = null;
+let provisionalBonus = {};
+// Live totals scored by the server (auto-subs and bonus included), by entry id
+let serverTotals = {};
 
 // Register service worker
 if ('serviceWorker' in navigator) {
@@ -37,7 +50,7 @@ window.addEventListener('load', () => {
 
 async function fetchWithProxy(url) {
     try {
-        const response = await fetch(PROXY_URL + encodeURIComponent(url));
+        const response = await fetch(url);
         if (!response.ok) throw new Error(`HTTP error! status: ${response.status}`);
         return await response.json();
     } catch (error) {
@@ -46,32 +59,57 @@ async function fetchWithProxy(url) {
     }
 }
 
+// Milliseconds per stage of the last load; also in the devtools Performance panel as fpl:<stage>
+let stageTimings = {};
+
+function startStage(name) {
+    const start = performance.now();
+    return () => {
+        stageTimings[name] = Math.round(performance.now() - start);
+        performance.measure(`fpl:${name}`, { start });
+    };
+}
+
 async function fetchLeagueData() {
     showLoading(true);
     hideError();
+    stageTimings = {};
+    const endLoad = startStage('total');
     
     try {
+        let endStage = startStage('slim');
+        const loadedSlim = await loadSlimPayload().catch(() => false);
+        endStage();
+        if (loadedSlim) return;
+        
         // Get current gameweek and player data
+        endStage = startStage('bootstrap');
         const bootstrapData = await fetchWithProxy(`${FPL_BASE_URL}/bootstrap-static/`);
         currentGameweek = bootstrapData.events.find(gw => gw.is_current)?.id || 1;
         gwInfo.textContent = `GW${currentGameweek}`;
         
+        // Index teams and positions once instead of searching per player
+        const teamsById = Object.fromEntries(bootstrapData.teams.map(t => [t.id, t]));
+        const positionsById = Object.fromEntries(bootstrapData.element_types.map(t => [t.id, t.singular_name_short]));
+        
         // Store player data for reference
         bootstrapData.elements.forEach(player => {
             playersData[player.id] = {
                 name: player.web_name,
-                team: bootstrapData.teams.find(t => t.id === player.team)?.short_name || '',
+                team: teamsById[player.team]?.short_name || '',
                 teamId: player.team,
-                position: bootstrapData.element_types.find(t => t.id === player.element_type)?.singular_name_short || ''
+                position: positionsById[player.element_type] || ''
             };
         });
+        endStage();
         
         // Fetch fixtures for current gameweek to determine game status
+        endStage = startStage('fixtures');
         const fixturesResponse = await fetchWithProxy(`${FPL_BASE_URL}/fixtures/?event=${currentGameweek}`);
         fixturesResponse.forEach(fixture => {
             // Store detailed fixture info for each team
-            const homeTeam = bootstrapData.teams.find(t => t.id === fixture.team_h);
-            const awayTeam = bootstrapData.teams.find(t => t.id === fixture.team_a);
+            const homeTeam = teamsById[fixture.team_h];
+            const awayTeam = teamsById[fixture.team_a];
             
             
             const homeFixtureInfo = {
@@ -95,8 +133,10 @@ async function fetchLeagueData() {
             fixturesData[fixture.team_h] = homeFixtureInfo;
             fixturesData[fixture.team_a] = awayFixtureInfo;
         });
+        endStage();
         
         // Get H2H league standings to get team info
+        endStage = startStage('standings');
         const leagueData = await fetchWithProxy(`${FPL_BASE_URL}/leagues-h2h/${H2H_LEAGUE_ID}/standings/`);
         
         // Store team info
@@ -111,9 +151,12 @@ async function fetchLeagueData() {
                 points: team.total
             };
         });
+        endStage();
         
         // Get H2H matches for current gameweek
+        endStage = startStage('h2h_matches');
         await fetchH2HMatches();
+        endStage();
         
         // Get live points and player details for all teams
         await fetchAllTeamDetails();
@@ -122,39 +165,111 @@ async function fetchLeagueData() {
         showError('Failed to load league');
         console.error('Error:', error);
     } finally {
+        endLoad();
+        console.table(stageTimings);
         showLoading(false);
     }
 }
 
+// Builds the same state as the full load from one slim payload plus two
+// content-hashed fragments the browser keeps cached until their hash changes
+async function loadSlimPayload() {
+    const response = await fetch(`${SLIM_URL}/${H2H_LEAGUE_ID}`);
+    if (!response.ok) return false;
+    const slim = await response.json();
+    if (slim.v !== SLIM_VERSION) return false;
+    
+    const [teams, players] = await Promise.all([
+        fetchWithProxy(`${SLIM_URL}/fragment/${slim.fragments.teams}`),
+        fetchWithProxy(`${SLIM_URL}/fragment/${slim.fragments.players}`)
+    ]);
+    const rows = (fields, values) => Object.fromEntries(fields.map((field, i) => [field, values[i]]));
+    
+    currentGameweek = slim.gw;
+    provisionalBonus = slim.bonus;
+    gwInfo.textContent = `GW${currentGameweek}`;
+    
+    const teamShortNames = Object.fromEntries(teams.id.map((id, i) => [id, teams.short[i]]));
+    players.id.forEach((id, i) => {
+        playersData[id] = {
+            name: players.name[i],
+            team: teamShortNames[players.team[i]] || '',
+            teamId: players.team[i],
+            position: teams.positions[players.pos[i]] || ''
+        };
+        liveElements[id] = rows(slim.fields.live, slim.live.map(column => column[i]));
+    });
+    
+    slim.fixtures.forEach(row => {
+        const fixture = rows(slim.fields.fixtures, row);
+        const state = {
+            finished: Boolean(fixture.finished),
+            finished_provisional: Boolean(fixture.finished_provisional),
+            started: Boolean(fixture.started),
+            minutes: fixture.minutes || 0,
+            fixtureId: fixture.id
+        };
+        fixturesData[fixture.team_h] = { ...state, opponent: teamShortNames[fixture.team_a] || '', isHome: true };
+        fixturesData[fixture.team_a] = { ...state, opponent: teamShortNames[fixture.team_h] || '', isHome: false };
+    });
+    
+    slim.entries.forEach(row => {
+        const entry = rows(slim.fields.entries, row);
+        if (entry.live !== null) serverTotals[entry.id] = entry.live;
+        teamsInfo[entry.id] = {
+            id: entry.id,
+            name: entry.name,
+            manager: entry.manager,
+            won: entry.won,
+            drawn: entry.drawn,
+            lost: entry.lost,
+            points: entry.total
+        };
+        const picks = slim.picks[entry.id];
+        if (!picks) {
+            teamsData[entry.id] = { ...teamsInfo[entry.id], xi: [], bench: [], livePoints: 0 };
+            return;
+        }
+        const [elements, captain, vice] = picks;
+        picksByTeam[entry.id] = {
+            picks: elements.map((element, slot) => ({
+                element,
+                position: slot + 1,
+                is_captain: slot === captain,
+                is_vice_captain: slot === vice
+            })),
+            entry_history: { event_transfers_cost: entry.cost }
+        };
+    });
+    h2hMatches = slim.matches.map(([team1, team2]) => ({ team1, team2 }));
+    
+    Object.keys(picksByTeam).forEach(teamId => {
+        teamsData[teamId] = buildTeamData(teamId, picksByTeam[teamId]);
+    });
+    const endStage = startStage('render');
+    displayMatches();
+    endStage();
+    connectLiveStream();
+    return true;
+}
+
 async function fetchH2HMatches() {
     try {
         let allMatches = [];
         let page = 1;
         let hasMorePages = true;
         
-        // Fetch all pages of H2H matches
+        // Only this gameweek's matches are requested, so this is usually one page
         while (hasMorePages) {
-            const matchesData = await fetchWithProxy(`${FPL_BASE_URL}/leagues-h2h-matches/league/${H2H_LEAGUE_ID}/?page=${page}`);
-            
-            if (matchesData.results && matchesData.results.length > 0) {
-                allMatches = allMatches.concat(matchesData.results);
-                page++;
-                
-                // Stop if we get less than 50 results (typical page size)
-                if (matchesData.results.length < 50) {
-                    hasMorePages = false;
-                }
-            } else {
-                hasMorePages = false;
-            }
+            const matchesData = await fetchWithProxy(`${FPL_BASE_URL}/leagues-h2h-matches/league/${H2H_LEAGUE_ID}/?event=${currentGameweek}&page=${page}`);
+            const results = matchesData.results || [];
             
-            // Safety break after 10 pages
-            if (page > 10) {
-                hasMorePages = false;
-            }
+            allMatches = allMatches.concat(results);
+            hasMorePages = Boolean(matchesData.has_next) && results.length > 0;
+            page++;
         }
         
-        console.log(`Fetched ${allMatches.length} total matches from ${page - 1} pages`);
+        console.log(`Fetched ${allMatches.length} matches from ${page - 1} pages`);
         
         // Filter for current gameweek matches
         h2hMatches = allMatches
@@ -179,7 +294,12 @@ async function fetchAllTeamDetails() {
     
     try {
         // Fetch live gameweek data once
+        let endStage = startStage('live');
         const liveData = await fetchWithProxy(`${FPL_BASE_URL}/event/${currentGameweek}/live/`);
+        liveElements = Object.fromEntries(liveData.elements.map(e => [e.id, e.stats]));
+        endStage();
+        
+        endStage = startStage('picks');
         
         // Process each team
         const teamPromises = Object.keys(teamsInfo).map(async (teamId) => {
@@ -187,129 +307,8 @@ async function fetchAllTeamDetails() {
                 // Fetch team picks
                 const picksData = await fetchWithProxy(`${FPL_BASE_URL}/entry/${teamId}/event/${currentGameweek}/picks/`);
                 
-                // Process players with live data
-                const players = picksData.picks.map(pick => {
-                    const playerInfo = playersData[pick.element];
-                    const liveStats = liveData.elements[pick.element - 1]?.stats || {};
-                    
-                    let points = liveStats.total_points || 0;
-                    if (pick.is_captain) points *= 2;
-                    
-                    // Get fixture info for player's team
-                    const fixtureInfo = playerInfo?.teamId ? fixturesData[playerInfo.teamId] : null;
-                    
-                    // Determine if player is "done" with more accurate logic
-                    let playerDone = false;
-                    let didntPlay = false;
-                    let gameInProgress = false;
-                    let bonusPending = false;
-                    
-                    if (fixtureInfo) {
-                        const gameMinutes = fixtureInfo.minutes || 0;
-                        const playerMinutes = liveStats.minutes || 0;
-                        const hasRedCard = liveStats.red_cards > 0;
-                        const hasBonus = liveStats.bonus > 0;
-                        
-                        // Check if game is in progress (started but whistle not yet blown)
-                        gameInProgress = fixtureInfo.started && !fixtureInfo.finished_provisional;
-                        
-                        // Check if whistle blown but bonus points not yet awarded
-                        bonusPending = fixtureInfo.finished_provisional && !fixtureInfo.finished && playerMinutes > 0;
-                        
-                        // Player is done if:
-                        // 1. Game is fully finished (with bonus points awarded)
-                        if (fixtureInfo.finished) {
-                            playerDone = true;
-                            didntPlay = playerMinutes === 0;
-                        }
-                        // 2. Game finished (whistle blown) - all players are done regardless of bonus status
-                        else if (fixtureInfo.finished_provisional) {
-                            playerDone = true;
-                            didntPlay = playerMinutes === 0;
-                        }
-                        // 3. Game in progress and player got a red card
-                        else if (hasRedCard) {
-                            playerDone = true;
-                        }
-                        // 4. Game in progress and player was subbed off (started but played less than game minutes - 5)
-                        else if (playerMinutes > 0 && playerMinutes < gameMinutes - 5 && liveStats.starts > 0) {
-                            playerDone = true;
-                        }
-                    }
-                    
-                    const opponentTeam = fixtureInfo?.opponent || '';
-                    const displayTeam = fixtureInfo?.isHome ? opponentTeam : opponentTeam.toLowerCase();
-                    
-                    // Generate event emojis based on stats
-                    let eventEmojis = '';
-                    if (liveStats.goals_scored > 0) {
-                        eventEmojis += '⚽️'.repeat(liveStats.goals_scored);
-                    }
-                    if (liveStats.assists > 0) {
-                        eventEmojis += '👟'.repeat(liveStats.assists);
-                    }
-                    if (liveStats.yellow_cards > 0) {
-                        eventEmojis += '🟨'.repeat(liveStats.yellow_cards);
-                    }
-                    if (liveStats.red_cards > 0) {
-                        eventEmojis += '🟥'.repeat(liveStats.red_cards);
-                    }
-                    if (liveStats.saves > 2 && playerInfo?.position === 'GKP') {
-                        eventEmojis += '🧤';
-                    }
-                    
-                    return {
-                        position: pick.position,
-                        name: playerInfo?.name || 'Unknown',
-                        team: displayTeam,
-                        playerPosition: playerInfo?.position || '',
-                        points: points,
-                        isCaptain: pick.is_captain,
-                        isViceCaptain: pick.is_vice_captain,
-                        minutes: liveStats.minutes || 0,
-                        playerDone: playerDone,
-                        didntPlay: didntPlay,
-                        eventEmojis: eventEmojis,
-                        gameInProgress: gameInProgress,
-                        bonusPending: bonusPending,
-                        gameStarted: fixtureInfo?.started || false
-                    };
-                });
-                
-                // Sort into XI and bench
-                const xi = players.filter(p => p.position <= 11).sort((a, b) => a.position - b.position);
-                const bench = players.filter(p => p.position > 11).sort((a, b) => a.position - b.position);
-                
-                // Determine auto-substitutions according to FPL rules
-                const autoSubs = calculateAutoSubs(xi, bench);
-                
-                // Mark bench players who will come on
-                bench.forEach(player => {
-                    player.willAutoSub = autoSubs.includes(player.position);
-                });
-                
-                // Calculate total live points (including auto-subs)
-                let livePoints = xi.reduce((sum, p) => sum + p.points, 0);
-                // Add points from auto-subs
-                bench.forEach(player => {
-                    if (player.willAutoSub) {
-                        livePoints += player.points;
-                        // Subtract the points of the player being replaced
-                        const replacedPlayer = xi.find(p => !p.didntPlay || p.position === player.position);
-                        if (replacedPlayer && replacedPlayer.didntPlay) {
-                            livePoints -= replacedPlayer.points;
-                        }
-                    }
-                });
-                livePoints -= (picksData.entry_history.event_transfers_cost || 0);
-                
-                teamsData[teamId] = {
-                    ...teamsInfo[teamId],
-                    xi: xi,
-                    bench: bench,
-                    livePoints: livePoints,
-                    transfersCost: picksData.entry_history.event_transfers_cost || 0
-                };
+                picksByTeam[teamId] = picksData;
+                teamsData[teamId] = buildTeamData(teamId, picksData);
                 
             } catch (error) {
                 console.error(`Error fetching team ${teamId}:`, error);
@@ -323,9 +322,15 @@ async function fetchAllTeamDetails() {
         });
         
         await Promise.all(teamPromises);
+        endStage();
         
         // Display H2H matches with player grids
+        endStage = startStage('render');
         displayMatches();
+        endStage();
+        
+        // From here on, live changes are pushed by the server
+        connectLiveStream();
         
     } catch (error) {
         console.error('Error fetching team details:', error);
@@ -335,6 +340,226 @@ async function fetchAllTeamDetails() {
     }
 }
 
+function buildTeamData(teamId, picksData) {
+    // Process players with live data
+    const players = picksData.picks.map(pick => {
+        const playerInfo = playersData[pick.element];
+        const liveStats = liveElements[pick.element] || {};
+    
+        // Provisional bonus from the live stream until FPL confirms it
+        let points = (liveStats.total_points || 0) + (provisionalBonus[pick.element] || 0);
+        if (pick.is_captain) points *= 2;
+    
+        // Get fixture info for player's team
+        const fixtureInfo = playerInfo?.teamId ? fixturesData[playerInfo.teamId] : null;
+    
+        // Determine if player is "done" (same rules as classify() in player_status.py,
+        // which `python3 player_status.py <archives>` scores against recorded gameweeks)
+        let playerDone = false;
+        let didntPlay = false;
+        let gameInProgress = false;
+        let bonusPending = false;
+    
+        if (fixtureInfo) {
+            const gameMinutes = fixtureInfo.minutes || 0;
+            const playerMinutes = liveStats.minutes || 0;
+            const hasRedCard = liveStats.red_cards > 0;
+            const hasBonus = liveStats.bonus > 0;
+    
+            // Check if game is in progress (started but whistle not yet blown)
+            gameInProgress = fixtureInfo.started && !fixtureInfo.finished_provisional;
+    
+            // Check if whistle blown but bonus points not yet awarded
+            bonusPending = fixtureInfo.finished_provisional && !fixtureInfo.finished && playerMinutes > 0;
+    
+            // Player is done if:
+            // 1. Game is fully finished (with bonus points awarded)
+            if (fixtureInfo.finished) {
+                playerDone = true;
+                didntPlay = playerMinutes === 0;
+            }
+            // 2. Game finished (whistle blown) - all players are done regardless of bonus status
+            else if (fixtureInfo.finished_provisional) {
+                playerDone = true;
+                didntPlay = playerMinutes === 0;
+            }
+            // 3. Game in progress and player got a red card
+            else if (hasRedCard) {
+                playerDone = true;
+            }
+            // 4. Game in progress and player was subbed off: from the live stream's
+            // event timeline when connected, else started but played less than game minutes - 5
+            else if (subbedOff ? pick.element in subbedOff : playerMinutes > 0 && playerMinutes < gameMinutes - 5 && liveStats.starts > 0) {
+                playerDone = true;
+            }
+        }
+    
+        const opponentTeam = fixtureInfo?.opponent || '';
+        const displayTeam = fixtureInfo?.isHome ? opponentTeam : opponentTeam.toLowerCase();
+    
+        // Generate event emojis based on stats
+        let eventEmojis = '';
+        if (liveStats.goals_scored > 0) {
+            eventEmojis += '⚽️'.repeat(liveStats.goals_scored);
+        }
+        if (liveStats.assists > 0) {
+            eventEmojis += '👟'.repeat(liveStats.assists);
+        }
+        if (liveStats.yellow_cards > 0) {
+            eventEmojis += '🟨'.repeat(liveStats.yellow_cards);
+        }
+        if (liveStats.red_cards > 0) {
+            eventEmojis += '🟥'.repeat(liveStats.red_cards);
+        }
+        if (liveStats.saves > 2 && playerInfo?.position === 'GKP') {
+            eventEmojis += '🧤';
+        }
+    
+        return {
+            position: pick.position,
+            name: playerInfo?.name || 'Unknown',
+            team: displayTeam,
+            playerPosition: playerInfo?.position || '',
+            points: points,
+            isCaptain: pick.is_captain,
+            isViceCaptain: pick.is_vice_captain,
+            minutes: liveStats.minutes || 0,
+            playerDone: playerDone,
+            didntPlay: didntPlay,
+            eventEmojis: eventEmojis,
+            gameInProgress: gameInProgress,
+            bonusPending: bonusPending,
+            gameStarted: fixtureInfo?.started || false
+        };
+    });
+    
+    // Sort into XI and bench
+    const xi = players.filter(p => p.position <= 11).sort((a, b) => a.position - b.position);
+    const bench = players.filter(p => p.position > 11).sort((a, b) => a.position - b.position);
+    
+    // Determine auto-substitutions according to FPL rules
+    const autoSubs = calculateAutoSubs(xi, bench);
+    
+    // Mark bench players who will come on
+    bench.forEach(player => {
+        player.willAutoSub = autoSubs.includes(player.position);
+    });
+    
+    // Calculate total live points (including auto-subs)
+    let livePoints = xi.reduce((sum, p) => sum + p.points, 0);
+    // Add points from auto-subs
+    bench.forEach(player => {
+        if (player.willAutoSub) {
+            livePoints += player.points;
+            // Subtract the points of the player being replaced
+            const replacedPlayer = xi.find(p => !p.didntPlay || p.position === player.position);
+            if (replacedPlayer && replacedPlayer.didntPlay) {
+                livePoints -= replacedPlayer.points;
+            }
+        }
+    });
+    livePoints -= (picksData.entry_history.event_transfers_cost || 0);
+    // The server's total applies FPL's auto-sub rules in full; ours is a fallback
+    if (teamId in serverTotals) livePoints = serverTotals[teamId];
+    
+    return {
+        ...teamsInfo[teamId],
+        xi: xi,
+        bench: bench,
+        livePoints: livePoints,
+        transfersCost: picksData.entry_history.event_transfers_cost || 0
+    };
+}
+
+function connectLiveStream() {
+    if (liveStream || !window.EventSource) return;
+    
+    liveStream = new EventSource(STREAM_URL);
+    // Sent first on every (re)connect: the full odds, substitutions and bonus
+    liveStream.addEventListener('state', event => {
+        const state = JSON.parse(event.data);
+        lastDeltaSeq = state.seq;
+        winOdds = state.odds;
+        subbedOff = state.subbed_off;
+        provisionalBonus = state.bonus;
+        serverTotals = state.totals;
+        
+        // Deltas sent while we were disconnected are gone; reload what they carried
+        if (state.gameweek !== currentGameweek || needsResync) {
+            needsResync = false;
+            fetchLeagueData();
+            return;
+        }
+        rebuildTeams();
+    });
+    liveStream.addEventListener('delta', event => {
+        const delta = JSON.parse(event.data);
+        
+        // A new gameweek or a missed message means our state is stale
+        const missedDelta = lastDeltaSeq !== null && delta.seq !== lastDeltaSeq + 1;
+        lastDeltaSeq = delta.seq;
+        if (delta.gameweek !== currentGameweek || missedDelta || needsResync) {
+            // Reconnect so the server's state message restores the diffed maps
+            liveStream.close();
+            liveStream = null;
+            needsResync = false;
+            lastDeltaSeq = null;
+            winOdds = {};
+            subbedOff = null;
+            provisionalBonus = {};
+            serverTotals = {};
+            fetchLeagueData();
+            return;
+        }
+        
+        applyLiveDelta(delta);
+    });
+    liveStream.addEventListener('error', () => {
+        // EventSource reconnects by itself; reload once it is back
+        needsResync = true;
+    });
+}
+
+// Applies a delta's changed keys to a map; null marks a key that has gone
+function mergeChanges(current, changes) {
+    const merged = { ...current };
+    Object.entries(changes).forEach(([key, value]) => {
+        if (value === null) delete merged[key];
+        else merged[key] = value;
+    });
+    return merged;
+}
+
+function applyLiveDelta(delta) {
+    winOdds = mergeChanges(winOdds, delta.odds);
+    subbedOff = mergeChanges(subbedOff || {}, delta.subbed_off);
+    provisionalBonus = mergeChanges(provisionalBonus, delta.bonus);
+    serverTotals = mergeChanges(serverTotals, delta.totals);
+    
+    Object.entries(delta.players).forEach(([elementId, stats]) => {
+        liveElements[elementId] = { ...liveElements[elementId], ...stats };
+    });
+    
+    Object.entries(delta.fixtures).forEach(([fixtureId, state]) => {
+        Object.values(fixturesData).forEach(fixtureInfo => {
+            if (fixtureInfo.fixtureId !== Number(fixtureId)) return;
+            ['started', 'finished', 'finished_provisional', 'minutes'].forEach(field => {
+                if (field in state) fixtureInfo[field] = field === 'minutes' ? (state[field] || 0) : state[field];
+            });
+        });
+    });
+    
+    rebuildTeams();
+}
+
+function rebuildTeams() {
+    // Rebuild from cached picks; nothing is refetched
+    Object.keys(picksByTeam).forEach(teamId => {
+        teamsData[teamId] = buildTeamData(teamId, picksByTeam[teamId]);
+    });
+    displayMatches();
+}
+
 function displayMatches() {
     matchesContainer.innerHTML = '';
     
@@ -367,6 +592,7 @@ function displayMatches() {
                 <div class="team-info">
                     <span class="team-name">${team1.name}</span>
                     <span class="manager-name">${team1.manager}</span>
+                    ${formatWinOdds(team1.id)}
                 </div>
                 <span class="score">${team1.transfersCost > 0 ? `<span class="points-hit">(-${team1.transfersCost}) </span>` : ''}${team1.livePoints}</span>
             </div>
@@ -374,6 +600,7 @@ function displayMatches() {
                 <div class="team-info">
                     <span class="team-name">${team2.name}</span>
                     <span class="manager-name">${team2.manager}</span>
+                    ${formatWinOdds(team2.id)}
                 </div>
                 <span class="score">${team2.transfersCost > 0 ? `<span class="points-hit">(-${team2.transfersCost}) </span>` : ''}${team2.livePoints}</span>
             </div>
@@ -405,6 +632,13 @@ function displayMatches() {
     matchesContainer.classList.remove('hidden');
 }
 
+function formatWinOdds(teamId) {
+    // Simulated by the live stream; absent until the first delta arrives
+    const odds = winOdds[teamId];
+    if (!odds) return '';
+    return `<span class="win-odds">${Math.round(odds.win * 100)}% win · ${odds.low}-${odds.high} pts</span>`;
+}
+
 function calculateAutoSubs(xi, bench) {
     // Returns array of bench positions that will auto-sub
     const autoSubs = [];
@@ -0,0 +1,110 @@
+#!/usr/bin/env python3
+"""Benchmark the live-scoring pipeline on synthetic leagues.
+
+    python3 bench_pipeline.py --sizes 8,1000,100000 --repeat 30
+
+For each league size, times every stage of a live poll (bootstrap indexing,
+fixture map, live vectors, player-done rules, engine build, auto-subs and
+full scoring) and reports p50/p99 latency, throughput and peak traced
+memory, so hot-path regressions show up as numbers.
+"""
+import argparse
+import json
+import time
+import tracemalloc
+
+from bootstrap_store import BootstrapStore
+from live_engine import LiveEngine, fixture_arrays, live_arrays, player_status
+from synthetic_data import advance_fixtures, generate_bootstrap, generate_fixtures, generate_live, generate_picks
+
+GAMEWEEK = 10
+MATCH_MINUTE = 100
+
+
+def percentile(samples, q):
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(round(q * (len(ordered) - 1))))]
+
+
+def measure(fn, repeat):
+    """Time ``fn`` ``repeat`` times, then once more under tracemalloc for peak memory"""
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        samples.append(time.perf_counter() - start)
+    tracemalloc.start()
+    fn()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return samples, peak
+
+
+def bench_league(bootstrap, gw_fixtures, live, n_entries, repeat, seed):
+    picks = generate_picks(bootstrap, n_entries, seed=seed)
+    store = BootstrapStore(bootstrap)
+    size = len(store.element_type)
+    n_teams = len(store.team_names) - 1
+    live_vecs = live_arrays(live, size)
+    fixture_vecs = fixture_arrays(gw_fixtures, n_teams)
+    status = player_status(store.team, live_vecs, fixture_vecs)
+    engine = LiveEngine.from_payloads(store, picks)
+    absent = (status['done'] & status['didnt_play'])[engine.picks]
+    n_elements = len(store)
+
+    # (stage, items processed per call, callable, repeat override)
+    stages = [
+        ('bootstrap_store', n_elements, lambda: BootstrapStore(bootstrap), None),
+        ('fixtures_map', len(gw_fixtures), lambda: fixture_arrays(gw_fixtures, n_teams), None),
+        ('live_arrays', n_elements, lambda: live_arrays(live, size), None),
+        ('player_status', n_elements, lambda: player_status(store.team, live_vecs, fixture_vecs), None),
+        ('engine_build', n_entries, lambda: LiveEngine.from_payloads(store, picks), max(1, min(repeat, 5))),
+        ('auto_subs', n_entries, lambda: engine.auto_subs(absent), None),
+        ('score', n_entries, lambda: engine.score_arrays(live_vecs['total_points'], status), None),
+        ('poll_total', n_entries, lambda: engine.score(live, gw_fixtures), None),
+    ]
+    rows = []
+    for name, items, fn, stage_repeat in stages:
+        samples, peak = measure(fn, stage_repeat or repeat)
+        p50 = percentile(samples, 0.5)
+        rows.append({
+            'entries': n_entries,
+            'stage': name,
+            'items': items,
+            'p50_ms': p50 * 1000,
+            'p99_ms': percentile(samples, 0.99) * 1000,
+            'throughput': items / p50 if p50 else float('inf'),
+            'peak_mb': peak / 1024 / 1024,
+        })
+    return rows
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark the live-scoring pipeline at synthetic scale')
+    parser.add_argument('--sizes', default='8,1000,100000', help='Comma-separated league sizes')
+    parser.add_argument('--repeat', type=int, default=30)
+    parser.add_argument('--seed', type=int, default=1)
+    parser.add_argument('--json', help='Also write results to this file')
+    args = parser.parse_args()
+
+    bootstrap = generate_bootstrap(current_gw=GAMEWEEK, seed=args.seed)
+    fixtures = generate_fixtures(bootstrap, seed=args.seed)
+    gw_fixtures = advance_fixtures(fixtures, GAMEWEEK, MATCH_MINUTE, seed=args.seed)
+    live = generate_live(bootstrap, gw_fixtures, seed=args.seed)
+    print(f"Synthetic season: {len(bootstrap['elements'])} players, {len(fixtures)} fixtures, GW{GAMEWEEK} at minute {MATCH_MINUTE}")
+
+    results = []
+    print(f"{'entries':>8} {'stage':<16} {'p50 ms':>9} {'p99 ms':>9} {'items/s':>12} {'peak MB':>8}")
+    for n_entries in (int(size) for size in args.sizes.split(',')):
+        for row in bench_league(bootstrap, gw_fixtures, live, n_entries, args.repeat, args.seed):
+            results.append(row)
+            print(f"{row['entries']:>8} {row['stage']:<16} {row['p50_ms']:>9.3f} {row['p99_ms']:>9.3f} "
+                  f"{row['throughput']:>12,.0f} {row['peak_mb']:>8.2f}")
+
+    if args.json:
+        with open(args.json, 'w') as out:
+            json.dump(results, out, indent=2)
+
+
+if __name__ == "__main__":
+    main()
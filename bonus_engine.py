@@ -0,0 +1,115 @@
+#!/usr/bin/env python3
+"""Provisional bonus points from each fixture's live BPS.
+
+FPL only adds bonus to ``total_points`` once it confirms it, up to an hour
+after full time. Until then each fixture's ``stats`` carries the running
+bonus points system scores for both sides:
+
+    {"identifier": "bps", "h": [{"value": 34, "element": 12}, ...], "a": [...]}
+
+The top three earn 3/2/1 with FPL's tie rules, which are competition
+ranking: players level on BPS share the higher award and the next player
+down drops a place per player tied. Two tied first get 3 each and the next
+gets 1; a tie for second gives 3, 2, 2; three tied first get 3 each and
+nobody else scores.
+
+BonusEngine keeps an id-indexed vector of provisional bonus and re-ranks
+only the fixtures whose BPS changed since the last update. Fixtures whose
+bonus FPL has confirmed (``finished``, or a ``bonus`` stat present)
+contribute nothing, as total_points already includes it.
+
+    python3 bonus_engine.py
+"""
+import numpy as np
+
+BONUS_AWARDS = (3, 2, 1)
+
+
+def fixture_stat(fixture, identifier):
+    """[(element, value)] for one of a fixture's stats, home then away"""
+    for stat in fixture.get('stats') or ():
+        if stat['identifier'] == identifier:
+            return [(row['element'], row['value']) for side in ('h', 'a') for row in stat[side]]
+    return []
+
+
+def bonus_confirmed(fixture):
+    return bool(fixture.get('finished')) or bool(fixture_stat(fixture, 'bonus'))
+
+
+def rank_bonus(bps):
+    """{element: bonus} from [(element, bps)] by FPL's tie rules"""
+    ordered = sorted(bps, key=lambda row: -row[1])
+    awards = {}
+    place = 0
+    for i, (element, value) in enumerate(ordered):
+        if i and value != ordered[i - 1][1]:
+            place = i
+        if place >= len(BONUS_AWARDS):
+            break
+        awards[element] = BONUS_AWARDS[place]
+    return awards
+
+
+class BonusEngine:
+    """Provisional bonus for every element, updated fixture by fixture
+
+    ``bonus`` is an int32 vector indexed by element id, to add to the live
+    ``total_points`` vector.
+    """
+
+    def __init__(self, size):
+        self.bonus = np.zeros(size, dtype=np.int32)
+        # fixture id -> (BPS rows it was ranked from, {element: bonus} applied)
+        self._fixtures = {}
+
+    def update(self, fixtures):
+        """Apply fixtures whose BPS changed; returns the ids that were re-ranked"""
+        size = len(self.bonus)
+        changed = []
+        for fixture in fixtures:
+            provisional = fixture.get('started') and not bonus_confirmed(fixture)
+            bps = fixture_stat(fixture, 'bps') if provisional else []
+            previous_bps, previous = self._fixtures.get(fixture['id'], ([], {}))
+            if bps == previous_bps:
+                continue
+            awards = {element: points for element, points in rank_bonus(bps).items() if element < size}
+            for element, points in previous.items():
+                self.bonus[element] -= points
+            for element, points in awards.items():
+                self.bonus[element] += points
+            self._fixtures[fixture['id']] = (bps, awards)
+            changed.append(fixture['id'])
+        return changed
+
+    def by_element(self):
+        """{element id: provisional bonus} for elements with any"""
+        elements = np.flatnonzero(self.bonus)
+        return dict(zip(elements.tolist(), self.bonus[elements].tolist()))
+
+
+def main():
+    from bootstrap_store import BootstrapStore
+    from fpl_client import FPLClient
+
+    client = FPLClient()
+    store = BootstrapStore.from_client(client)
+    fixtures = client.fixtures(store.current_gw)
+
+    print(f"GW{store.current_gw} provisional bonus")
+    for fixture in fixtures:
+        if not fixture['started']:
+            continue
+        home, away = store.team_short_names[fixture['team_h']], store.team_short_names[fixture['team_a']]
+        if bonus_confirmed(fixture):
+            print(f"{home} v {away}: confirmed")
+            continue
+        bps = dict(fixture_stat(fixture, 'bps'))
+        awards = rank_bonus(bps.items())
+        shown = ', '.join(f"{store.web_names[element]} {points} ({bps[element]} bps)"
+                          for element, points in sorted(awards.items(), key=lambda item: -item[1]))
+        print(f"{home} v {away} {fixture['minutes']}': {shown or '-'}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,139 @@
+"""Indexed, array-backed view of bootstrap-static.
+
+Loads the elements once into id-indexed NumPy columns (team, element_type,
+status, price, chance of playing, points per game) with interned name
+strings, plus name, fuzzy-name and team -> players indexes, so scripts can
+look players up in O(1) instead of rescanning the raw JSON list.
+"""
+import difflib
+import sys
+from collections import namedtuple
+
+import numpy as np
+
+from fpl_common import STATUS_CODES, STATUS_NAMES, UNKNOWN_STATUS, normalise_name
+
+Player = namedtuple('Player', 'id web_name full_name team team_short element_type position status price chance news')
+
+
+class BootstrapStore:
+    """Columnar snapshot of a bootstrap-static payload
+
+    Column arrays are indexed by element id; index 0 and any unused ids are
+    padding with ``present`` False.
+    """
+
+    def __init__(self, bootstrap):
+        elements = bootstrap['elements']
+        size = max((e['id'] for e in elements), default=0) + 1
+
+        self.events = bootstrap['events']
+        self.current_gw = next((gw['id'] for gw in self.events if gw['is_current']), None)
+
+        n_teams = max((t['id'] for t in bootstrap['teams']), default=0) + 1
+        self.team_names = [''] * n_teams
+        self.team_short_names = [''] * n_teams
+        for team in bootstrap['teams']:
+            self.team_names[team['id']] = sys.intern(team['name'])
+            self.team_short_names[team['id']] = sys.intern(team['short_name'])
+
+        self.positions = {t['id']: sys.intern(t['singular_name_short']) for t in bootstrap['element_types']}
+
+        self.present = np.zeros(size, dtype=bool)
+        self.team = np.zeros(size, dtype=np.int16)
+        self.element_type = np.zeros(size, dtype=np.int8)
+        self.status = np.zeros(size, dtype=np.int8)
+        self.price = np.zeros(size, dtype=np.int16)
+        # -1 when FPL has no estimate (chance_of_playing is null)
+        self.chance = np.full(size, -1, dtype=np.int8)
+        self.points_per_game = np.zeros(size, dtype=np.float32)
+        self.web_names = [''] * size
+        self.full_names = [''] * size
+        self.news = [''] * size
+
+        self._by_name = {}
+        for element in elements:
+            element_id = element['id']
+            self.present[element_id] = True
+            self.team[element_id] = element['team']
+            self.element_type[element_id] = element['element_type']
+            status = STATUS_CODES.find(element.get('status', 'a'))
+            self.status[element_id] = status if status >= 0 else STATUS_CODES.index(UNKNOWN_STATUS)
+            self.price[element_id] = element.get('now_cost') or 0
+            chance = element.get('chance_of_playing_this_round')
+            if chance is not None:
+                self.chance[element_id] = chance
+            self.points_per_game[element_id] = float(element.get('points_per_game') or 0)
+            web_name = sys.intern(element['web_name'])
+            full_name = f"{element.get('first_name', '')} {element.get('second_name', '')}".strip()
+            self.web_names[element_id] = web_name
+            self.full_names[element_id] = full_name
+            self.news[element_id] = sys.intern(element.get('news') or '')
+            for name in (web_name, full_name):
+                if name:
+                    self._by_name.setdefault(normalise_name(name), []).append(element_id)
+
+        self.ids = np.flatnonzero(self.present)
+        # team -> sorted element ids, via one stable sort of the team column
+        order = self.ids[np.argsort(self.team[self.ids], kind='stable')]
+        bounds = np.searchsorted(self.team[order], np.arange(n_teams + 1))
+        self._team_players = {t: order[bounds[t]:bounds[t + 1]] for t in range(1, n_teams)}
+        self._name_keys = list(self._by_name)
+
+    @classmethod
+    def from_client(cls, client):
+        return cls(client.bootstrap())
+
+    def __len__(self):
+        return len(self.ids)
+
+    def __contains__(self, element_id):
+        return 0 < element_id < len(self.present) and bool(self.present[element_id])
+
+    def player(self, element_id):
+        """Player record for an element id, or None if unknown"""
+        if element_id not in self:
+            return None
+        team = int(self.team[element_id])
+        element_type = int(self.element_type[element_id])
+        chance = int(self.chance[element_id])
+        return Player(
+            element_id,
+            self.web_names[element_id],
+            self.full_names[element_id],
+            team,
+            self.team_short_names[team],
+            element_type,
+            self.positions.get(element_type, ''),
+            STATUS_CODES[self.status[element_id]],
+            int(self.price[element_id]) / 10,
+            None if chance < 0 else chance,
+            self.news[element_id],
+        )
+
+    def find(self, name):
+        """Element id for an exact web or full name (case/accent-insensitive)"""
+        ids = self._by_name.get(normalise_name(name))
+        return ids[0] if ids else None
+
+    def search(self, name, limit=5, cutoff=0.6):
+        """Element ids whose names are closest to ``name``, best first"""
+        key = normalise_name(name)
+        if key in self._by_name:
+            return list(self._by_name[key][:limit])
+        matches = difflib.get_close_matches(key, self._name_keys, n=limit, cutoff=cutoff)
+        # Substring hits (e.g. a surname inside a full name) after close matches
+        matches += [k for k in self._name_keys if key in k and k not in matches]
+        ids = []
+        for match in matches:
+            for element_id in self._by_name[match]:
+                if element_id not in ids:
+                    ids.append(element_id)
+        return ids[:limit]
+
+    def team_players(self, team_id):
+        """Element ids for a team as an array"""
+        return self._team_players.get(team_id, np.empty(0, dtype=self.ids.dtype))
+
+    def status_name(self, element_id):
+        return STATUS_NAMES.get(STATUS_CODES[self.status[element_id]], '')
@@ -1,26 +1,17 @@
 #!/usr/bin/env python3
-import requests
-import json
+from fpl_client import FPLClient, current_gameweek
 
-# Get current gameweek from bootstrap-static
-bootstrap_url = "https://fantasy.premierleague.com/api/bootstrap-static/"
-bootstrap_response = requests.get(bootstrap_url)
-bootstrap_data = bootstrap_response.json()
+client = FPLClient()
 
-# Find current gameweek
-current_gw = None
-for event in bootstrap_data['events']:
-    if event['is_current']:
-        current_gw = event['id']
-        break
+# Get current gameweek from bootstrap-static
+bootstrap_data = client.bootstrap()
+current_gw = current_gameweek(bootstrap_data)
 
 print(f"Current Gameweek: {current_gw}")
 print()
 
 # Get fixtures for current gameweek
-fixtures_url = f"https://fantasy.premierleague.com/api/fixtures/?event={current_gw}"
-fixtures_response = requests.get(fixtures_url)
-fixtures_data = fixtures_response.json()
+fixtures_data = client.fixtures(current_gw)
 
 # Create team lookup
 teams = {team['id']: team['short_name'] for team in bootstrap_data['teams']}
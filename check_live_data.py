@@ -1,17 +1,22 @@
-import requests
 import json
 
+from bonus_engine import fixture_stat, rank_bonus
+from fpl_client import FPLClient, current_gameweek
+
 # Check what data is available in the live endpoint
-FPL_BASE_URL = 'https://fantasy.premierleague.com/api'
+client = FPLClient()
 
 # Get current gameweek
-bootstrap = requests.get(f'{FPL_BASE_URL}/bootstrap-static/').json()
-current_gw = next(gw['id'] for gw in bootstrap['events'] if gw['is_current'])
+bootstrap = client.bootstrap()
+current_gw = current_gameweek(bootstrap)
 
 print(f"Current Gameweek: {current_gw}")
 
-# Get live data
-live_data = requests.get(f'{FPL_BASE_URL}/event/{current_gw}/live/').json()
+# Get live data and fixtures together
+live_data, fixtures = client.get_many([
+    f'event/{current_gw}/live/',
+    ('fixtures/', {'event': current_gw}),
+])
 
 # Check a sample player's available stats
 if live_data['elements']:
@@ -24,8 +29,7 @@ if live_data['elements']:
         print("\nExplain data available:")
         print(json.dumps(sample_player['explain'][0] if sample_player['explain'] else {}, indent=2))
 
-# Get fixture data to see what's available
-fixtures = requests.get(f'{FPL_BASE_URL}/fixtures/?event={current_gw}').json()
+# Check fixture data to see what's available
 if fixtures:
     print("\nSample fixture data:")
     fixture = fixtures[0]
@@ -38,4 +42,5 @@ if fixtures:
     if 'stats' in fixture:
         print("\nFixture stats available:")
         for stat in fixture['stats']:
-            print(f"- {stat}")
\ No newline at end of file
+            print(f"- {stat}")
+        print(f"\nProvisional bonus from BPS: {rank_bonus(fixture_stat(fixture, 'bps'))}")
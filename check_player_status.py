@@ -1,35 +1,23 @@
-import requests
-import json
+from collections import Counter
 
-FPL_BASE_URL = 'https://fantasy.premierleague.com/api'
+from bootstrap_store import BootstrapStore
+from fpl_client import FPLClient
+from player_status import classify, fixtures_by_team
 
-# Get current gameweek
-bootstrap = requests.get(f'{FPL_BASE_URL}/bootstrap-static/').json()
-current_gw = next(gw['id'] for gw in bootstrap['events'] if gw['is_current'])
+client = FPLClient()
 
-# Get live data
-live_data = requests.get(f'{FPL_BASE_URL}/event/{current_gw}/live/').json()
+# Get current gameweek
+store = BootstrapStore.from_client(client)
+current_gw = store.current_gw
 
-# Get fixtures for current gameweek
-fixtures = requests.get(f'{FPL_BASE_URL}/fixtures/?event={current_gw}').json()
+# Get live data and fixtures for current gameweek
+live_data, fixtures = client.get_many([
+    f'event/{current_gw}/live/',
+    ('fixtures/', {'event': current_gw}),
+])
 
-# Create a mapping of team to fixture status
-team_fixture_status = {}
-for fixture in fixtures:
-    team_fixture_status[fixture['team_h']] = {
-        'finished': fixture['finished'],
-        'finished_provisional': fixture['finished_provisional'],
-        'started': fixture['started'],
-        'minutes': fixture.get('minutes', 0),
-        'fixture_id': fixture['id']
-    }
-    team_fixture_status[fixture['team_a']] = {
-        'finished': fixture['finished'],
-        'finished_provisional': fixture['finished_provisional'],
-        'started': fixture['started'],
-        'minutes': fixture.get('minutes', 0),
-        'fixture_id': fixture['id']
-    }
+# Create a mapping of team to fixture
+team_fixture_status = fixtures_by_team(fixtures)
 
 print("Checking player status determination:")
 print("=" * 50)
@@ -46,23 +34,25 @@ players_to_check = [
 players_with_minutes = []
 players_with_red_cards = []
 players_with_zero_minutes_finished_game = []
+rule_counts = Counter()
 
-for i, element in enumerate(live_data['elements'][:500]):  # Check first 500 players
+for element in live_data['elements'][:500]:  # Check first 500 players
     stats = element['stats']
-    player_id = i + 1
     
     # Get player info from bootstrap
-    player_info = next((p for p in bootstrap['elements'] if p['id'] == player_id), None)
+    player_info = store.player(element['id'])
     if not player_info:
         continue
     
-    team_id = player_info['team']
+    team_id = player_info.team
     fixture_status = team_fixture_status.get(team_id, {})
+    if fixture_status.get('started'):
+        rule_counts[classify(stats, fixture_status)['rule'] or 'not done'] += 1
     
     # Different scenarios
     if stats['red_cards'] > 0:
         players_with_red_cards.append({
-            'name': player_info['web_name'],
+            'name': player_info.web_name,
             'minutes': stats['minutes'],
             'red_cards': stats['red_cards'],
             'game_finished': fixture_status.get('finished', False),
@@ -71,14 +61,14 @@ for i, element in enumerate(live_data['elements'][:500]):  # Check first 500 pla
     
     if fixture_status.get('finished') and stats['minutes'] == 0:
         players_with_zero_minutes_finished_game.append({
-            'name': player_info['web_name'],
-            'team': player_info['team'],
+            'name': player_info.web_name,
+            'team': player_info.team,
             'minutes': stats['minutes']
         })
     
     if stats['minutes'] > 0 and stats['minutes'] < 90 and fixture_status.get('minutes', 0) >= 90:
         players_with_minutes.append({
-            'name': player_info['web_name'],
+            'name': player_info.web_name,
             'minutes': stats['minutes'],
             'game_minutes': fixture_status.get('minutes', 0),
             'game_finished': fixture_status.get('finished', False),
@@ -98,9 +88,7 @@ for p in players_with_zero_minutes_finished_game[:5]:
     print(f"  {p['name']}: Didn't play (game finished)")
 
 print("\n" + "=" * 50)
-print("Key insights for determining if player is 'done':")
-print("1. If game is finished OR finished_provisional → Player is done")
-print("2. If player has red_card > 0 → Player is done")
-print("3. If player minutes > 0 AND < game minutes - 5 → Likely subbed off")
-print("4. If game minutes >= 90 AND player minutes = 0 → Unused sub")
-print("5. If game started AND player minutes = 0 AND game minutes > 70 → Very likely unused")
\ No newline at end of file
+print("Player status by rule (player_status.classify) in started games:")
+for rule in ('whistle', 'red_card', 'subbed_off', 'not done'):
+    print(f"  {rule}: {rule_counts[rule]}")
+print("Score the rules over recorded gameweeks with: python3 player_status.py <archive dirs>")
@@ -1,11 +1,16 @@
-import requests
-import json
+from fpl_client import FPLClient, current_gameweek
 
-FPL_BASE_URL = 'https://fantasy.premierleague.com/api'
+client = FPLClient()
 
 # Get current gameweek
-bootstrap = requests.get(f'{FPL_BASE_URL}/bootstrap-static/').json()
-current_gw = next(gw['id'] for gw in bootstrap['events'] if gw['is_current'])
+bootstrap = client.bootstrap()
+current_gw = current_gameweek(bootstrap)
+
+# Get live data and fixtures together
+live_data, fixtures = client.get_many([
+    f'event/{current_gw}/live/',
+    ('fixtures/', {'event': current_gw}),
+])
 
 print(f"Checking for squad/lineup data (GW{current_gw}):")
 print("=" * 60)
@@ -24,7 +29,6 @@ for field in relevant_fields:
         print(f"  {field}: {sample_player[field]}")
 
 # Check live data for squad information
-live_data = requests.get(f'{FPL_BASE_URL}/event/{current_gw}/live/').json()
 print(f"\nChecking live data for squad info...")
 if live_data['elements']:
     sample_live = live_data['elements'][0]
@@ -34,9 +38,7 @@ if live_data['elements']:
     if 'explain' in sample_live and sample_live['explain']:
         print(f"Explain data available: {sample_live['explain'][0].keys() if sample_live['explain'] else 'None'}")
 
-# Get fixtures to see if they have lineup data
-fixtures = requests.get(f'{FPL_BASE_URL}/fixtures/?event={current_gw}').json()
-
+# Check fixtures to see if they have lineup data
 print(f"\nChecking fixtures for lineup data...")
 for fixture in fixtures[:2]:
     print(f"\nFixture: Team {fixture['team_h']} vs Team {fixture['team_a']}")
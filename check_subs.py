@@ -1,14 +1,20 @@
-import requests
 import json
 
-FPL_BASE_URL = 'https://fantasy.premierleague.com/api'
+from bootstrap_store import BootstrapStore
+from event_timeline import EventTimeline
+from fpl_client import FPLClient
+
+client = FPLClient()
 
 # Get current gameweek
-bootstrap = requests.get(f'{FPL_BASE_URL}/bootstrap-static/').json()
-current_gw = next(gw['id'] for gw in bootstrap['events'] if gw['is_current'])
+store = BootstrapStore.from_client(client)
+current_gw = store.current_gw
 
-# Get fixtures for current gameweek
-fixtures = requests.get(f'{FPL_BASE_URL}/fixtures/?event={current_gw}').json()
+# Get fixtures and live data for current gameweek
+fixtures, live_data = client.get_many([
+    ('fixtures/', {'event': current_gw}),
+    f'event/{current_gw}/live/',
+])
 
 print(f"Checking fixture data for substitution info (GW{current_gw}):")
 print("=" * 60)
@@ -44,8 +50,7 @@ if sample_fixture_id:
     print(f"\nTrying fixture detail endpoint for fixture {sample_fixture_id}...")
     try:
         # This endpoint might not exist, but worth trying
-        detail_url = f'{FPL_BASE_URL}/fixtures/{sample_fixture_id}/'
-        response = requests.get(detail_url)
+        response = client.request(f'fixtures/{sample_fixture_id}/')
         if response.status_code == 200:
             detail_data = response.json()
             print("Found fixture detail data!")
@@ -57,42 +62,23 @@ if sample_fixture_id:
 
 # Check the live endpoint for more details
 print(f"\nChecking live endpoint for player appearance data...")
-live_data = requests.get(f'{FPL_BASE_URL}/event/{current_gw}/live/').json()
 
-# See if we can find players who came on as subs
-print("\nLooking for substitution patterns in player minutes...")
-team_subs = {}
+# Infer substitutions from this snapshot: a player with minutes but no start
+# came on at (game clock - minutes); a starter well behind the clock went off
+print("\nInferring substitutions from player minutes...")
+timeline = EventTimeline(store.team)
+timeline.feed(live_data, fixtures)
 
-for i, element in enumerate(live_data['elements'][:200]):  # Check first 200 players
-    stats = element['stats']
-    player_id = i + 1
-    
-    # Get player info
-    player_info = next((p for p in bootstrap['elements'] if p['id'] == player_id), None)
-    if not player_info:
+for fixture in fixtures:
+    subs = [e for e in timeline.timeline(fixture['id']) if e['type'] in ('sub_on', 'sub_off')]
+    if not subs:
         continue
-    
-    team_id = player_info['team']
-    minutes = stats['minutes']
-    
-    # Track players with specific minute patterns that indicate substitutions
-    if minutes > 0 and minutes < 90:
-        if team_id not in team_subs:
-            team_subs[team_id] = []
-        team_subs[team_id].append({
-            'name': player_info['web_name'],
-            'minutes': minutes,
-            'likely_sub': minutes <= 45  # Likely came on as sub if played 45 mins or less
-        })
+    print(f"\n{store.team_short_names[fixture['team_h']]} v {store.team_short_names[fixture['team_a']]} ({fixture.get('minutes', 0)} mins):")
+    for event in subs:
+        direction = 'on ' if event['type'] == 'sub_on' else 'off'
+        print(f"  {event['minute']:3}' {direction} {store.web_names[event['element']]}")
 
-# Show teams with potential subs
-for team_id, players in list(team_subs.items())[:3]:
-    team_name = next((t['short_name'] for t in bootstrap['teams'] if t['id'] == team_id), 'Unknown')
-    print(f"\n{team_name} - Players with < 90 mins:")
-    for p in players:
-        print(f"  {p['name']}: {p['minutes']} mins {'(likely sub)' if p['likely_sub'] else ''}")
-        
 print("\n" + "=" * 60)
 print("CONCLUSION: The API doesn't directly provide substitution events.")
-print("We can only infer from minutes played. Better to remove the 70-min rule.")
-print("Stick to: finished games, red cards, and subbed off (minutes < game mins).")
\ No newline at end of file
+print("Sub-on minutes are exact (clock - minutes for non-starters); sub-offs are")
+print("confirmed over successive polls by event_timeline.py (see live_stream.py).")
@@ -1,41 +1,25 @@
 #!/usr/bin/env python3
-import requests
-import json
+from bootstrap_store import BootstrapStore
+from fpl_client import FPLClient
+from player_status import classify, fixtures_by_team
 
-# Get current gameweek and team data
-bootstrap_url = "https://fantasy.premierleague.com/api/bootstrap-static/"
-bootstrap_response = requests.get(bootstrap_url)
-bootstrap_data = bootstrap_response.json()
+client = FPLClient()
 
-# Find current gameweek
-current_gw = None
-for event in bootstrap_data['events']:
-    if event['is_current']:
-        current_gw = event['id']
-        break
+# Get current gameweek and indexed player/team data
+store = BootstrapStore.from_client(client)
+current_gw = store.current_gw
 
 print(f"Current Gameweek: {current_gw}")
 print()
 
-# Create player and team lookups
-players_lookup = {player['web_name'].lower(): player for player in bootstrap_data['elements']}
-teams_lookup = {team['id']: team for team in bootstrap_data['teams']}
-
-# Get fixtures for current gameweek
-fixtures_url = f"https://fantasy.premierleague.com/api/fixtures/?event={current_gw}"
-fixtures_response = requests.get(fixtures_url)
-fixtures_data = fixtures_response.json()
+# Get fixtures and live data for current gameweek
+fixtures_data, live_data = client.get_many([
+    ('fixtures/', {'event': current_gw}),
+    f'event/{current_gw}/live/',
+])
 
 # Create fixture lookup by team ID
-fixtures_by_team = {}
-for fixture in fixtures_data:
-    fixtures_by_team[fixture['team_h']] = fixture
-    fixtures_by_team[fixture['team_a']] = fixture
-
-# Get live data
-live_url = f"https://fantasy.premierleague.com/api/event/{current_gw}/live/"
-live_response = requests.get(live_url)
-live_data = live_response.json()
+team_fixtures = fixtures_by_team(fixtures_data)
 
 # Create live data lookup
 live_lookup = {element['id']: element['stats'] for element in live_data['elements']}
@@ -43,25 +27,27 @@ live_lookup = {element['id']: element['stats'] for element in live_data['element
 def analyze_player(player_name):
     print(f"\n=== {player_name.upper()} ===")
     
-    # Find player
-    player = players_lookup.get(player_name.lower())
-    if not player:
-        print(f"Player '{player_name}' not found!")
-        return
+    # Find player, falling back to the closest fuzzy match
+    player_id = store.find(player_name)
+    if player_id is None:
+        matches = store.search(player_name, limit=1)
+        if not matches:
+            print(f"Player '{player_name}' not found!")
+            return
+        player_id = matches[0]
+    player = store.player(player_id)
     
-    player_id = player['id']
-    team_id = player['team']
-    team_info = teams_lookup[team_id]
+    team_id = player.team
     
-    print(f"Player ID: {player_id}")
-    print(f"Team: {team_info['name']} ({team_info['short_name']})")
-    print(f"Position: {player['element_type']}")
+    print(f"Player ID: {player_id} ({player.web_name})")
+    print(f"Team: {store.team_names[team_id]} ({player.team_short})")
+    print(f"Position: {player.position}")
     
     # Get fixture info
-    fixture = fixtures_by_team.get(team_id)
+    fixture = team_fixtures.get(team_id)
     if fixture:
-        home_team = teams_lookup[fixture['team_h']]['short_name']
-        away_team = teams_lookup[fixture['team_a']]['short_name']
+        home_team = store.team_short_names[fixture['team_h']]
+        away_team = store.team_short_names[fixture['team_a']]
         is_home = fixture['team_h'] == team_id
         
         print(f"Fixture: {home_team} vs {away_team} {'(HOME)' if is_home else '(AWAY)'}")
@@ -81,31 +67,16 @@ def analyze_player(player_name):
     print(f"  Yellow Cards: {live_stats.get('yellow_cards', 0)}")
     print(f"  Red Cards: {live_stats.get('red_cards', 0)}")
     
-    # Apply our logic
+    # Apply the app's rules
     if fixture:
-        game_minutes = fixture['minutes'] or 0
-        player_minutes = live_stats.get('minutes', 0)
-        has_red_card = live_stats.get('red_cards', 0) > 0
-        
-        # Our logic from the app
-        game_in_progress = fixture['started'] and not fixture['finished_provisional']
-        bonus_pending = fixture['finished_provisional'] and not fixture['finished'] and player_minutes > 0
-        
-        player_done = False
-        didnt_play = False
-        
-        if fixture['finished']:
-            player_done = True
-            didnt_play = player_minutes == 0
-        elif has_red_card:
-            player_done = True
-        elif player_minutes > 0 and player_minutes < game_minutes - 5:
-            player_done = True
+        status = classify(live_stats, fixture)
+        player_done = status['done']
+        didnt_play = status['didnt_play']
         
         print(f"\nOur Logic Results:")
-        print(f"  Game In Progress: {game_in_progress}")
-        print(f"  Bonus Pending: {bonus_pending}")
-        print(f"  Player Done: {player_done}")
+        print(f"  Game In Progress: {status['in_progress']}")
+        print(f"  Bonus Pending: {status['bonus_pending']}")
+        print(f"  Player Done: {player_done} ({status['rule'] or 'still playing'})")
         print(f"  Didn't Play: {didnt_play}")
         
         # Determine expected color
@@ -0,0 +1,228 @@
+#!/usr/bin/env python3
+"""Match events inferred from successive live snapshots.
+
+The live endpoint only gives running totals, so events are recovered by
+diffing them poll to poll. Counter increases (goals, assists, cards, own
+goals, penalties, every third save) become events at the current match
+minute; decreases (VAR, stat corrections) come through as negative deltas.
+Substitutions come from minutes: a player appearing without a start came on
+at ``clock - minutes``, and a player whose minutes stop moving while their
+match clock runs on has gone off at ``on + minutes`` (fpl_common.substitution
+is the single-snapshot form). In a double gameweek live minutes and starts
+add up over both fixtures, so when a team moves on to its next fixture each
+player's totals so far become the new baseline.
+
+State is a handful of id-indexed arrays, so memory is fixed per player
+however many snapshots a matchday produces; only the emitted events grow.
+
+    timeline = EventTimeline(store.team)
+    for live, fixtures in snapshots:
+        for event in timeline.feed(live, fixtures):
+            ...
+"""
+import sys
+import time
+
+import numpy as np
+
+from fpl_common import SUB_TOLERANCE
+
+COUNTER_FIELDS = (
+    'goals_scored', 'assists', 'yellow_cards', 'red_cards', 'own_goals', 'penalties_saved', 'penalties_missed',
+)
+EVENT_TYPES = {
+    'goals_scored': 'goal',
+    'assists': 'assist',
+    'yellow_cards': 'yellow_card',
+    'red_cards': 'red_card',
+    'own_goals': 'own_goal',
+    'penalties_saved': 'penalty_saved',
+    'penalties_missed': 'penalty_missed',
+}
+SAVES_PER_POINT = 3
+
+
+def team_fixtures(fixtures, n_teams):
+    """Team-indexed (fixture id, match clock) for each team's current fixture
+
+    In a double gameweek the fixture in play wins, then the latest started.
+    """
+    fixture_id = np.zeros(n_teams + 1, dtype=np.int32)
+    clock = np.zeros(n_teams + 1, dtype=np.int32)
+    in_play = np.zeros(n_teams + 1, dtype=bool)
+    for fixture in sorted(fixtures, key=lambda f: f.get('kickoff_time') or ''):
+        if not fixture.get('started'):
+            continue
+        live = not (fixture.get('finished') or fixture.get('finished_provisional'))
+        for team in (fixture['team_h'], fixture['team_a']):
+            if team > n_teams or (in_play[team] and not live):
+                continue
+            fixture_id[team] = fixture['id']
+            clock[team] = fixture.get('minutes') or 0
+            in_play[team] = live
+    return fixture_id, clock
+
+
+class EventTimeline:
+    """Rolling per-player state that turns live snapshots into events
+
+    Each event is a dict with ``fixture``, ``minute`` (None when it happened
+    before the first snapshot and its time can't be known), ``element``,
+    ``type`` and ``delta`` (+1, or negative for a correction).
+    """
+
+    def __init__(self, element_team):
+        self.element_team = element_team
+        self.n_teams = int(element_team.max())
+        size = len(element_team)
+        self.counters = np.zeros((size, len(COUNTER_FIELDS)), dtype=np.int16)
+        self.save_points = np.zeros(size, dtype=np.int16)
+        self.minutes = np.zeros(size, dtype=np.int16)
+        self.starts = np.zeros(size, dtype=np.int16)
+        self.clock = np.zeros(size, dtype=np.int16)
+        # Fixture each player was last seen in, and their minutes / starts
+        # from earlier fixtures this gameweek
+        self.fixture = np.zeros(size, dtype=np.int32)
+        self.base_minutes = np.zeros(size, dtype=np.int16)
+        self.base_starts = np.zeros(size, dtype=np.int16)
+        # Match minute a player came on / went off, -1 if not (yet)
+        self.on_minute = np.full(size, -1, dtype=np.int16)
+        self.off_minute = np.full(size, -1, dtype=np.int16)
+        self.snapshots = 0
+        self.timelines = {}
+
+    def feed(self, live, fixtures):
+        """Diff one live/fixtures snapshot against the last; returns new events"""
+        size = len(self.element_team)
+        counters = np.zeros_like(self.counters)
+        minutes = np.zeros(size, dtype=np.int16)
+        starts = np.zeros(size, dtype=np.int16)
+        saves = np.zeros(size, dtype=np.int16)
+        for element in live['elements']:
+            element_id = element['id']
+            if element_id >= size:
+                continue
+            stats = element['stats']
+            counters[element_id] = [stats.get(field) or 0 for field in COUNTER_FIELDS]
+            minutes[element_id] = stats.get('minutes') or 0
+            starts[element_id] = stats.get('starts') or 0
+            saves[element_id] = stats.get('saves') or 0
+
+        fixture_by_team, clock_by_team = team_fixtures(fixtures, self.n_teams)
+        fixture = fixture_by_team[self.element_team]
+        clock = clock_by_team[self.element_team].astype(np.int16)
+        first = self.snapshots == 0
+        minute = None if first else clock
+
+        # A team's next fixture in a double gameweek is a fresh appearance
+        moved = (fixture > 0) & (self.fixture > 0) & (fixture != self.fixture)
+        self.base_minutes[moved] = self.minutes[moved]
+        self.base_starts[moved] = self.starts[moved]
+        self.on_minute[moved] = -1
+        self.off_minute[moved] = -1
+        self.fixture = np.where(fixture > 0, fixture, self.fixture)
+        match_minutes = minutes - self.base_minutes
+        started = starts > self.base_starts
+        events = []
+
+        def emit(ids, kind, deltas, minutes_at):
+            for i, element_id in enumerate(ids):
+                if not fixture[element_id]:
+                    continue
+                event = {
+                    'fixture': int(fixture[element_id]),
+                    'minute': None if minutes_at is None else int(minutes_at[i]),
+                    'element': int(element_id),
+                    'type': kind,
+                    'delta': int(deltas[i]),
+                }
+                events.append(event)
+                self.timelines.setdefault(event['fixture'], []).append(event)
+
+        # Appearances: starters from kick-off, substitutes from clock - minutes
+        arrived = (match_minutes > 0) & (self.on_minute < 0)
+        on_at = np.where(started, 0, np.maximum(clock - match_minutes, 0)).astype(np.int16)
+        self.on_minute[arrived] = on_at[arrived]
+        ids = np.flatnonzero(arrived & ~started)
+        emit(ids, 'sub_on', np.ones(len(ids)), on_at[ids])
+
+        # Minutes moving again means the live data had just lagged
+        ids = np.flatnonzero((self.off_minute >= 0) & (minutes > self.minutes))
+        emit(ids, 'sub_off', -np.ones(len(ids)), self.off_minute[ids])
+        self.off_minute[ids] = -1
+
+        # A player off the pitch stops accruing minutes while the clock runs on
+        on_pitch = (self.on_minute >= 0) & (self.off_minute < 0) & (counters[:, COUNTER_FIELDS.index('red_cards')] == 0)
+        behind = self.on_minute + match_minutes < clock - SUB_TOLERANCE
+        stalled = first | ((minutes == self.minutes) & (clock > self.clock))
+        ids = np.flatnonzero(on_pitch & behind & stalled & (match_minutes > 0))
+        self.off_minute[ids] = self.on_minute[ids] + match_minutes[ids]
+        emit(ids, 'sub_off', np.ones(len(ids)), self.off_minute[ids])
+
+        for column, field in enumerate(COUNTER_FIELDS):
+            change = counters[:, column] - self.counters[:, column]
+            ids = np.flatnonzero(change)
+            emit(ids, EVENT_TYPES[field], change[ids], None if minute is None else minute[ids])
+
+        save_points = saves // SAVES_PER_POINT
+        change = save_points - self.save_points
+        ids = np.flatnonzero(change)
+        emit(ids, 'saves', change[ids], None if minute is None else minute[ids])
+
+        self.counters = counters
+        self.save_points = save_points
+        self.minutes = minutes
+        self.starts = starts
+        self.clock = clock
+        self.snapshots += 1
+        return events
+
+    def subbed_off_mask(self):
+        """Id-indexed bool mask for player_status(subbed_off=...)"""
+        return self.off_minute >= 0
+
+    def subbed_off(self):
+        """{element id: minute} for players currently judged substituted off"""
+        ids = np.flatnonzero(self.off_minute >= 0)
+        return {int(element_id): int(self.off_minute[element_id]) for element_id in ids}
+
+    def timeline(self, fixture_id):
+        """A fixture's events in match order (untimed ones first)"""
+        return sorted(self.timelines.get(fixture_id, []), key=lambda e: -1 if e['minute'] is None else e['minute'])
+
+
+def describe(event, store):
+    minute = '  ?' if event['minute'] is None else f"{event['minute']:3}'"
+    kind = event['type'].replace('_', ' ')
+    if event['delta'] < 0:
+        kind += ' (reversed)'
+    elif event['delta'] > 1:
+        kind += f" x{event['delta']}"
+    return f"{minute} {store.web_names[event['element']]:<20} {kind}"
+
+
+def main():
+    from bootstrap_store import BootstrapStore
+    from fpl_client import FPLClient
+
+    interval = int(sys.argv[1]) if len(sys.argv) > 1 else 60
+    client = FPLClient()
+    store = BootstrapStore.from_client(client)
+    gw = store.current_gw
+    timeline = EventTimeline(store.team)
+    print(f"Following GW{gw} every {interval}s (Ctrl-C to stop)")
+    try:
+        while True:
+            live, fixtures = client.get_many([f'event/{gw}/live/', ('fixtures/', {'event': gw})])
+            names = {f['id']: f"{store.team_short_names[f['team_h']]} v {store.team_short_names[f['team_a']]}" for f in fixtures}
+            for event in timeline.feed(live, fixtures):
+                print(f"{names.get(event['fixture'], event['fixture']):<12} {describe(event, store)}")
+            if all(f.get('finished') for f in fixtures):
+                break
+            time.sleep(interval)
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
@@ -1,25 +1,49 @@
-import requests
+import asyncio
 import json
 
-# FPL API endpoints
-FPL_BASE_URL = 'https://fantasy.premierleague.com/api'
+from fpl_client import AsyncFPLClient, current_gameweek
+from league_pages import collect, iter_h2h_matches, iter_pages
+
 H2H_LEAGUE_ID = 1017641
 
+async def fetch_league(league_id):
+    """League info, current gameweek, every standings row and this gameweek's matches"""
+    league = None
+
+    def standings_page(page):
+        nonlocal league
+        league = league or page['league']
+        return page['standings']['results']
+
+    async with AsyncFPLClient() as client:
+        async def gameweek_matches():
+            current_gw = current_gameweek(await client.bootstrap())
+            return current_gw, await collect(iter_h2h_matches(client, league_id, event=current_gw))
+
+        # The league's name comes with every standings page, so no separate request
+        standings, (current_gw, matches) = await asyncio.gather(
+            collect(iter_pages(
+                lambda page: client.h2h_standings(league_id, page),
+                standings_page,
+                lambda data: data['standings']['has_next'],
+            )),
+            gameweek_matches(),
+        )
+    return league, current_gw, standings, matches
+
 def fetch_h2h_league_teams():
     """Fetch all team IDs from the H2H league"""
     
-    # Get H2H league standings
-    url = f'{FPL_BASE_URL}/leagues-h2h/{H2H_LEAGUE_ID}/standings/'
-    response = requests.get(url)
-    data = response.json()
+    league, current_gw, standings, matches = asyncio.run(fetch_league(H2H_LEAGUE_ID))
+    standings.sort(key=lambda team: team['rank'])
     
-    print(f"League Name: {data['league']['name']}")
-    print(f"Number of teams: {len(data['standings']['results'])}")
+    print(f"League Name: {league['name']}")
+    print(f"Number of teams: {len(standings)}")
     print("\nTeams in league:")
     print("-" * 50)
     
     teams = []
-    for team in data['standings']['results']:
+    for team in standings:
         teams.append({
             'id': team['entry'],
             'name': team['entry_name'],
@@ -32,25 +56,18 @@ def fetch_h2h_league_teams():
     print("\nTeam IDs array for hardcoding:")
     print(json.dumps(team_ids))
     
-    # Get current H2H matches
-    print("\nFetching current gameweek H2H matches...")
-    matches_url = f'{FPL_BASE_URL}/leagues-h2h-matches/league/{H2H_LEAGUE_ID}/'
-    matches_response = requests.get(matches_url)
-    matches_data = matches_response.json()
-    
-    if matches_data['results']:
-        current_gw = matches_data['results'][0]['event']
+    # Show current H2H matches
+    if matches:
         print(f"\nGameweek {current_gw} H2H Matchups:")
         print("-" * 50)
         
-        current_matches = [m for m in matches_data['results'] if m['event'] == current_gw]
-        
-        for match in current_matches:
-            team1_name = next((t['name'] for t in teams if t['id'] == match['entry_1_entry']), 'Unknown')
-            team2_name = next((t['name'] for t in teams if t['id'] == match['entry_2_entry']), 'Unknown')
+        team_names = {team['id']: team['name'] for team in teams}
+        for match in matches:
+            team1_name = team_names.get(match['entry_1_entry'], 'Unknown')
+            team2_name = team_names.get(match['entry_2_entry'], 'Unknown')
             print(f"{team1_name[:20]:<20} vs {team2_name[:20]:<20}")
     
     return teams
 
 if __name__ == "__main__":
-    fetch_h2h_league_teams()
\ No newline at end of file
+    fetch_h2h_league_teams()
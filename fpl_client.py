@@ -0,0 +1,266 @@
+"""Shared FPL API client for the diagnostic scripts and server-side tools.
+
+One pooled keep-alive session per client, gzip on every request, and
+ETag / Last-Modified revalidation so an unchanged resource comes back as a
+304 instead of a full body. Point FPL_BASE_URL at another host (e.g. a
+local replay server) to run everything offline. Pass a scheduler from
+request_scheduler.py to rate-limit and prioritise upstream calls. Every
+upstream call is recorded in metrics.REGISTRY (latency, status, bytes).
+"""
+import os
+import asyncio
+import json
+import time
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import urlsplit
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from metrics import REGISTRY
+
+FPL_BASE_URL = os.environ.get('FPL_BASE_URL', 'https://fantasy.premierleague.com/api').rstrip('/')
+
+POOL_SIZE = 16
+TIMEOUT = 15
+HEADERS = {
+    'Accept': 'application/json',
+    'Accept-Encoding': 'gzip, deflate',
+    'User-Agent': 'fpl-pwa/1.0',
+}
+
+
+def endpoint_path(path, params=None):
+    """Normalise an endpoint path (and optional query params) into a cache key"""
+    path = path.lstrip('/')
+    if params:
+        query = '&'.join(f'{k}={v}' for k, v in sorted(params.items()) if v is not None)
+        if query:
+            path = f'{path}?{query}'
+    return path
+
+
+class _EndpointsMixin:
+    """Named helpers for the endpoints the app and scripts use"""
+
+    def bootstrap(self):
+        return self.get('bootstrap-static/')
+
+    def fixtures(self, gw=None):
+        return self.get('fixtures/', {'event': gw})
+
+    def live(self, gw):
+        return self.get(f'event/{gw}/live/')
+
+    def entry(self, entry_id):
+        return self.get(f'entry/{entry_id}/')
+
+    def picks(self, entry_id, gw):
+        return self.get(f'entry/{entry_id}/event/{gw}/picks/')
+
+    def h2h_standings(self, league_id, page=1):
+        return self.get(f'leagues-h2h/{league_id}/standings/', {'page_standings': page if page > 1 else None})
+
+    def h2h_matches(self, league_id, page=1, event=None):
+        return self.get(f'leagues-h2h-matches/league/{league_id}/', {'event': event, 'page': page if page > 1 else None})
+
+    def classic_standings(self, league_id, page=1):
+        return self.get(f'leagues-classic/{league_id}/standings/', {'page_standings': page if page > 1 else None})
+
+
+def current_gameweek(bootstrap):
+    """Id of the current gameweek from a bootstrap-static payload"""
+    return next((gw['id'] for gw in bootstrap['events'] if gw['is_current']), None)
+
+
+class FPLClient(_EndpointsMixin):
+    """Blocking client backed by a pooled requests.Session"""
+
+    def __init__(self, base_url=FPL_BASE_URL, pool_size=POOL_SIZE, timeout=TIMEOUT, scheduler=None):
+        self.base_url = base_url.rstrip('/')
+        self.host = urlsplit(self.base_url).netloc
+        self.timeout = timeout
+        self.pool_size = pool_size
+        self.scheduler = scheduler
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+        self.session.mount('https://', adapter)
+        self.session.mount('http://', adapter)
+        self.session.headers.update(HEADERS)
+        # path -> (etag, last_modified, parsed body)
+        self._validators = {}
+
+    def url(self, path, params=None):
+        return f'{self.base_url}/{endpoint_path(path, params)}'
+
+    def request(self, path, params=None):
+        """Raw conditional GET; returns the requests.Response (304s included)"""
+        key = endpoint_path(path, params)
+        headers = {}
+        cached = self._validators.get(key)
+        if cached:
+            etag, last_modified, _ = cached
+            if etag:
+                headers['If-None-Match'] = etag
+            if last_modified:
+                headers['If-Modified-Since'] = last_modified
+        return self.send(key, lambda: self.session.get(f'{self.base_url}/{key}', headers=headers, timeout=self.timeout),
+                         headers)
+
+    def send(self, key, fetch, headers=None):
+        """Run ``fetch()`` for an endpoint key, through the scheduler if there is one
+
+        Pass the request ``headers`` so conditional requests are only merged
+        with identical ones.
+        """
+        def timed():
+            start = time.perf_counter()
+            try:
+                response = fetch()
+            except Exception as error:
+                REGISTRY.request(self.host, key, time.perf_counter() - start, error=error)
+                raise
+            REGISTRY.request(self.host, key, time.perf_counter() - start, response.status_code, len(response.content))
+            return response
+
+        if self.scheduler is None:
+            return timed()
+        return self.scheduler.call(key, timed, headers=headers)
+
+    def get(self, path, params=None):
+        """GET an endpoint and return parsed JSON, reusing the body on a 304"""
+        key = endpoint_path(path, params)
+        response = self.request(path, params)
+        if response.status_code == 304 and key in self._validators:
+            return self._validators[key][2]
+        response.raise_for_status()
+        data = response.json()
+        etag = response.headers.get('ETag')
+        last_modified = response.headers.get('Last-Modified')
+        if etag or last_modified:
+            self._validators[key] = (etag, last_modified, data)
+        return data
+
+    def get_many(self, paths, max_workers=None):
+        """Fetch several endpoints concurrently over the shared pool, in order"""
+        paths = list(paths)
+        if not paths:
+            return []
+        workers = min(max_workers or self.pool_size, len(paths))
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            return list(pool.map(self._get_spec, paths))
+
+    def _get_spec(self, spec):
+        if isinstance(spec, tuple):
+            return self.get(*spec)
+        return self.get(spec)
+
+    def close(self):
+        self.session.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+class AsyncFPLClient(_EndpointsMixin):
+    """asyncio client backed by an aiohttp keep-alive connector
+
+    Use as ``async with AsyncFPLClient() as client``; endpoint helpers return
+    coroutines.
+    """
+
+    def __init__(self, base_url=FPL_BASE_URL, pool_size=POOL_SIZE, timeout=TIMEOUT, scheduler=None):
+        self.base_url = base_url.rstrip('/')
+        self.host = urlsplit(self.base_url).netloc
+        self.pool_size = pool_size
+        self.timeout = timeout
+        self.scheduler = scheduler
+        self.session = None
+        self._validators = {}
+
+    async def __aenter__(self):
+        await self.open()
+        return self
+
+    async def __aexit__(self, *exc):
+        await self.close()
+
+    async def open(self):
+        import aiohttp
+        if self.session is None:
+            connector = aiohttp.TCPConnector(limit=self.pool_size, keepalive_timeout=60)
+            self.session = aiohttp.ClientSession(
+                connector=connector,
+                headers=HEADERS,
+                timeout=aiohttp.ClientTimeout(total=self.timeout),
+            )
+
+    async def close(self):
+        if self.session is not None:
+            await self.session.close()
+            self.session = None
+
+    def url(self, path, params=None):
+        return f'{self.base_url}/{endpoint_path(path, params)}'
+
+    async def get(self, path, params=None):
+        """GET an endpoint and return parsed JSON, reusing the body on a 304"""
+        await self.open()
+        key = endpoint_path(path, params)
+        headers = {}
+        cached = self._validators.get(key)
+        if cached:
+            etag, last_modified, _ = cached
+            if etag:
+                headers['If-None-Match'] = etag
+            if last_modified:
+                headers['If-Modified-Since'] = last_modified
+
+        async def fetch():
+            import aiohttp
+            start = time.perf_counter()
+            try:
+                async with self.session.get(f'{self.base_url}/{key}', headers=headers) as response:
+                    body = await response.read()
+            except Exception as error:
+                REGISTRY.request(self.host, key, time.perf_counter() - start, error=error)
+                raise
+            REGISTRY.request(self.host, key, time.perf_counter() - start, response.status, len(body))
+            if response.status == 304 and cached:
+                return response.status, response.headers, cached[2], None
+            try:
+                response.raise_for_status()
+            except aiohttp.ClientResponseError as error:
+                # Returned rather than raised so the scheduler can retry 429/5xx
+                return response.status, response.headers, None, error
+            return response.status, response.headers, json.loads(body), None
+
+        if self.scheduler is None:
+            status, response_headers, data, error = await fetch()
+        else:
+            status, response_headers, data, error = await self.scheduler.call(
+                key, fetch, status=lambda result: result[0], retry_after=lambda result: result[1].get('Retry-After'),
+                headers=headers)
+        if error is not None:
+            raise error
+        if status != 304:
+            etag = response_headers.get('ETag')
+            last_modified = response_headers.get('Last-Modified')
+            if etag or last_modified:
+                self._validators[key] = (etag, last_modified, data)
+        return data
+
+    async def get_many(self, paths, max_concurrency=None):
+        """Fetch several endpoints concurrently, returning results in order"""
+        semaphore = asyncio.Semaphore(max_concurrency or self.pool_size)
+
+        async def fetch(spec):
+            async with semaphore:
+                if isinstance(spec, tuple):
+                    return await self.get(*spec)
+                return await self.get(spec)
+
+        return await asyncio.gather(*(fetch(spec) for spec in paths))
@@ -0,0 +1,47 @@
+"""Pure-Python pieces shared by the NumPy modules and fpl_diag.py.
+
+fpl_diag.py has to start without NumPy, so the name folding and status
+labels behind BootstrapStore, and the scalar form of EventTimeline's
+substitution rule, live here rather than being copied into it.
+"""
+import unicodedata
+
+# Statuses FPL doesn't document (yet) are stored as UNKNOWN_STATUS
+UNKNOWN_STATUS = '?'
+STATUS_CODES = 'adinsu' + UNKNOWN_STATUS
+STATUS_NAMES = {
+    'a': 'Available',
+    'd': 'Doubtful',
+    'i': 'Injured',
+    'n': 'Not available',
+    's': 'Suspended',
+    'u': 'Unavailable',
+    UNKNOWN_STATUS: 'Unknown',
+}
+
+# Live minutes can trail the fixture clock by a poll or two
+SUB_TOLERANCE = 3
+
+
+def normalise_name(name):
+    """Casefolded, accent-free form used by the name indexes"""
+    decomposed = unicodedata.normalize('NFKD', name)
+    return ''.join(c for c in decomposed if not unicodedata.combining(c)).casefold().strip()
+
+
+def substitution(stats, clock):
+    """(on, off) match minutes for one player from a single live snapshot
+
+    A starter comes on at 0 and a substitute at ``clock - minutes``; a player
+    without a red card whose minutes trail the clock by more than
+    SUB_TOLERANCE went off at ``on + minutes``. Either is None when it
+    hasn't happened. EventTimeline applies the same rule to every player at
+    once, poll after poll.
+    """
+    minutes = stats.get('minutes') or 0
+    if not minutes:
+        return None, None
+    on = 0 if stats.get('starts') else max(clock - minutes, 0)
+    if (stats.get('red_cards') or 0) == 0 and on + minutes < clock - SUB_TOLERANCE:
+        return on, on + minutes
+    return on, None
@@ -0,0 +1,412 @@
+#!/usr/bin/env python3
+"""One fast-starting CLI for the matchday diagnostics.
+
+Each check_*.py script spends most of its run re-downloading bootstrap-static,
+fixtures and live data before it prints anything. This one reads a local
+snapshot first. Each part (a trimmed bootstrap, this gameweek's fixtures and
+live stats, an H2H league's teams and matches) is a gzipped JSON file in
+FPL_DIAG_CACHE (default ``.fpl_diag/``).
+
+Parts older than the poll schedule allows (poll_scheduler.py: seconds while
+matches are live, hours when idle) are refreshed by a detached
+``fpl_diag.py refresh`` process, while the command prints from the snapshot
+so the next run sees fresh data. Only a cold cache, a new gameweek or
+``--fresh`` waits for the network.
+
+The cached path imports no requests, aiohttp or NumPy, so a repeated run
+costs little more than interpreter startup.
+
+    python3 fpl_diag.py fixtures
+    python3 fpl_diag.py live Salah Haaland
+    python3 fpl_diag.py status Sels "De Cuyper"
+    python3 fpl_diag.py squad ARS
+    python3 fpl_diag.py subs
+    python3 fpl_diag.py teams --league 1017641
+"""
+import argparse
+import gzip
+import json
+import os
+import sys
+import time
+
+from fpl_common import STATUS_NAMES, normalise_name, substitution
+from poll_scheduler import PollScheduler
+
+CACHE_DIR = os.environ.get('FPL_DIAG_CACHE', '.fpl_diag')
+# Snapshots from different API hosts (e.g. a replay server) are kept apart
+SOURCE = os.environ.get('FPL_BASE_URL', 'fpl')
+H2H_LEAGUE_ID = 1017641
+# A refresh lock older than this belongs to a refresher that died
+LOCK_TIMEOUT = 120
+
+ELEMENT_FIELDS = ('id', 'web_name', 'team', 'element_type', 'status', 'chance_of_playing_this_round', 'news')
+FIXTURE_FIELDS = ('id', 'team_h', 'team_a', 'started', 'finished', 'finished_provisional', 'minutes',
+                  'team_h_score', 'team_a_score', 'kickoff_time')
+LIVE_FIELDS = ('minutes', 'starts', 'total_points', 'bonus', 'bps', 'goals_scored', 'assists',
+               'yellow_cards', 'red_cards', 'saves')
+# Poll schedule endpoint that sets each part's lifetime
+PART_ENDPOINTS = {'bootstrap': 'bootstrap', 'fixtures': 'fixtures', 'live': 'live'}
+
+
+def trim_bootstrap(bootstrap):
+    return {
+        'elements': [{field: element.get(field) for field in ELEMENT_FIELDS} for element in bootstrap['elements']],
+        'teams': [{'id': team['id'], 'name': team['name'], 'short_name': team['short_name']} for team in bootstrap['teams']],
+        'events': [{'id': event['id'], 'is_current': event['is_current']} for event in bootstrap['events']],
+        'element_types': [{'id': t['id'], 'singular_name_short': t['singular_name_short']} for t in bootstrap['element_types']],
+    }
+
+
+def trim_fixtures(fixtures):
+    return [{field: fixture.get(field) for field in FIXTURE_FIELDS} for fixture in fixtures]
+
+
+def trim_live(live):
+    return {'elements': [{'id': element['id'], 'stats': {field: element['stats'].get(field) or 0 for field in LIVE_FIELDS}}
+                         for element in live['elements']]}
+
+
+class Snapshot:
+    """Parts of the API cached on disk as gzipped JSON, with their age"""
+
+    def __init__(self, root=CACHE_DIR):
+        self.root = root
+
+    def path(self, part):
+        return os.path.join(self.root, f'{part}.json.gz')
+
+    def load(self, part):
+        """(data, gameweek, age in seconds) of a cached part, or (None, None, None)"""
+        path = self.path(part)
+        try:
+            with open(path, 'rb') as f:
+                record = json.loads(gzip.decompress(f.read()))
+            age = time.time() - os.stat(path).st_mtime
+        except (OSError, ValueError):
+            return None, None, None
+        if record.get('source') != SOURCE:
+            return None, None, None
+        return record['data'], record.get('gw'), age
+
+    def save(self, part, data, gw=None):
+        os.makedirs(self.root, exist_ok=True)
+        body = gzip.compress(json.dumps({'source': SOURCE, 'gw': gw, 'data': data}, separators=(',', ':')).encode())
+        temp = f'{self.path(part)}.{os.getpid()}.tmp'
+        with open(temp, 'wb') as out:
+            out.write(body)
+        os.replace(temp, self.path(part))
+
+    def lock(self):
+        """Take the refresh lock; False if a live refresher holds it"""
+        os.makedirs(self.root, exist_ok=True)
+        path = os.path.join(self.root, 'refresh.lock')
+        try:
+            if time.time() - os.stat(path).st_mtime > LOCK_TIMEOUT:
+                os.remove(path)
+        except OSError:
+            pass
+        try:
+            os.close(os.open(path, os.O_CREAT | os.O_EXCL | os.O_WRONLY))
+        except FileExistsError:
+            return False
+        return True
+
+    def unlock(self):
+        try:
+            os.remove(os.path.join(self.root, 'refresh.lock'))
+        except OSError:
+            pass
+
+
+def current_gw(bootstrap):
+    return next((event['id'] for event in bootstrap['events'] if event['is_current']), None)
+
+
+def league_part(league_id):
+    return f'league-{league_id}'
+
+
+def fetch_parts(snapshot, parts):
+    """Download parts into the snapshot (bootstrap first, as it sets the gameweek)"""
+    wanted = [part for part in ('fixtures', 'live') if part in parts]
+    if 'bootstrap' in parts or wanted:
+        from fpl_client import FPLClient
+
+        with FPLClient() as client:
+            if 'bootstrap' in parts:
+                bootstrap = trim_bootstrap(client.bootstrap())
+                snapshot.save('bootstrap', bootstrap)
+            else:
+                bootstrap = snapshot.load('bootstrap')[0]
+            gw = current_gw(bootstrap)
+            paths = {'fixtures': ('fixtures/', {'event': gw}), 'live': f'event/{gw}/live/'}
+            for part, data in zip(wanted, client.get_many([paths[part] for part in wanted])):
+                snapshot.save(part, trim_fixtures(data) if part == 'fixtures' else trim_live(data), gw)
+
+    for part in parts:
+        if part.startswith('league-'):
+            import asyncio
+
+            from fetch_teams import fetch_league
+
+            league, league_gw, standings, matches = asyncio.run(fetch_league(int(part.split('-', 1)[1])))
+            snapshot.save(part, {
+                'name': league['name'],
+                'standings': [[row['entry'], row['entry_name'], row['player_name'], row['rank'], row['total']]
+                              for row in sorted(standings, key=lambda row: row['rank'])],
+                'matches': [[m['entry_1_entry'], m['entry_2_entry']] for m in matches],
+            }, league_gw)
+
+
+def refresh_in_background(snapshot, parts):
+    """Start a detached ``fpl_diag.py refresh``; False if one is already running"""
+    import subprocess
+
+    lock = os.path.join(snapshot.root, 'refresh.lock')
+    if os.path.exists(lock) and time.time() - os.path.getmtime(lock) < LOCK_TIMEOUT:
+        return False
+    subprocess.Popen(
+        [sys.executable, os.path.abspath(__file__), '--cache', snapshot.root, 'refresh', *parts],
+        stdin=subprocess.DEVNULL, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+        start_new_session=True,
+    )
+    return True
+
+
+def load_parts(snapshot, parts, fresh=False, background=True):
+    """{part: data} for the parts a command needs, refreshing what is missing or stale
+
+    Missing parts (or all of them with ``fresh``) are fetched before
+    returning. Stale ones are returned as they are and refreshed by a
+    background process.
+    """
+    if fresh:
+        fetch_parts(snapshot, ['bootstrap', *parts])
+    bootstrap, _, bootstrap_age = snapshot.load('bootstrap')
+    if bootstrap is None:
+        fetch_parts(snapshot, ['bootstrap', *parts])
+        bootstrap, _, bootstrap_age = snapshot.load('bootstrap')
+    gw = current_gw(bootstrap)
+
+    loaded = {part: snapshot.load(part) for part in parts}
+    missing = [part for part, (data, part_gw, _) in loaded.items() if data is None or part_gw != gw]
+    if missing:
+        fetch_parts(snapshot, missing)
+        loaded.update({part: snapshot.load(part) for part in missing})
+
+    scheduler = PollScheduler()
+    fixtures = loaded.get('fixtures', (None,))[0] or snapshot.load('fixtures')[0]
+    if fixtures:
+        scheduler.update(fixtures)
+    ages = {'bootstrap': bootstrap_age, **{part: age for part, (_, _, age) in loaded.items()}}
+    stale = [part for part, age in ages.items()
+             if age is not None and age > scheduler.interval(PART_ENDPOINTS.get(part, 'standings'))]
+    if stale:
+        oldest = max(ages[part] for part in stale)
+        note = 'refreshing in the background' if background and refresh_in_background(snapshot, stale) else 'run with --fresh to update'
+        print(f"(snapshot {oldest:.0f}s old: {', '.join(stale)}; {note})", file=sys.stderr)
+
+    data = {part: record[0] for part, record in loaded.items()}
+    data['bootstrap'] = bootstrap
+    data['gw'] = gw
+    return data
+
+
+class Names:
+    """Player and team lookups over a trimmed bootstrap"""
+
+    def __init__(self, bootstrap):
+        self.players = {element['id']: element for element in bootstrap['elements']}
+        self.teams = {team['id']: team['short_name'] for team in bootstrap['teams']}
+        self.positions = {t['id']: t['singular_name_short'] for t in bootstrap['element_types']}
+
+    def find(self, name):
+        """Element ids for a name: exact web name matches, else substring matches"""
+        wanted = normalise_name(name)
+        exact = [element_id for element_id, p in self.players.items() if normalise_name(p['web_name']) == wanted]
+        return exact or [element_id for element_id, p in self.players.items() if wanted in normalise_name(p['web_name'])]
+
+    def fixture(self, fixture):
+        return f"{self.teams.get(fixture['team_h'], '?')} v {self.teams.get(fixture['team_a'], '?')}"
+
+
+def fixture_state(fixture):
+    if fixture['finished']:
+        return 'FT'
+    if fixture['finished_provisional']:
+        return 'FT (bonus pending)'
+    if fixture['started']:
+        return f"{fixture['minutes']}'"
+    return (fixture.get('kickoff_time') or 'TBC').replace('T', ' ').replace('Z', '')
+
+
+def show_fixtures(data, args):
+    names = Names(data['bootstrap'])
+    print(f"GW{data['gw']} fixtures")
+    for fixture in data['fixtures']:
+        score = f"{fixture['team_h_score']}-{fixture['team_a_score']}" if fixture['started'] else ' - '
+        print(f"{names.fixture(fixture):<11} {score:^5} {fixture_state(fixture)}")
+
+
+def _element_ids(names, queries):
+    element_ids = []
+    for query in queries:
+        found = names.find(query)
+        if not found:
+            print(f"Player '{query}' not found!")
+        element_ids += found
+    return element_ids
+
+
+def show_live(data, args):
+    names = Names(data['bootstrap'])
+    stats = {element['id']: element['stats'] for element in data['live']['elements']}
+    element_ids = _element_ids(names, args.players) if args.players else \
+        sorted(stats, key=lambda element_id: -stats[element_id]['total_points'])[:args.top]
+    print(f"GW{data['gw']} live stats")
+    print(f"{'Player':<18} {'Team':<4} {'Min':>3} {'Pts':>3} {'G':>2} {'A':>2} {'YC':>2} {'RC':>2} {'Bon':>3} {'BPS':>4}")
+    for element_id in element_ids:
+        player, s = names.players[element_id], stats.get(element_id, dict.fromkeys(LIVE_FIELDS, 0))
+        print(f"{player['web_name'][:18]:<18} {names.teams.get(player['team'], '?'):<4} {s['minutes']:>3} {s['total_points']:>3} "
+              f"{s['goals_scored']:>2} {s['assists']:>2} {s['yellow_cards']:>2} {s['red_cards']:>2} {s['bonus']:>3} {s['bps']:>4}")
+
+
+def show_status(data, args):
+    from player_status import classify, fixtures_by_team
+
+    names = Names(data['bootstrap'])
+    stats = {element['id']: element['stats'] for element in data['live']['elements']}
+    team_fixtures = fixtures_by_team(data['fixtures'])
+    element_ids = _element_ids(names, args.players) if args.players else list(stats)
+    counts = {}
+    for element_id in element_ids:
+        player = names.players[element_id]
+        fixture = team_fixtures.get(player['team'])
+        status = classify(stats.get(element_id, {}), fixture)
+        if not args.players:
+            if fixture and fixture['started']:
+                rule = status['rule'] or 'not done'
+                counts[rule] = counts.get(rule, 0) + 1
+            continue
+        flags = ', '.join(flag for flag in ('done', 'didnt_play', 'in_progress', 'bonus_pending') if status[flag]) or '-'
+        where = f"{names.fixture(fixture)} {fixture_state(fixture)}" if fixture else 'no fixture'
+        print(f"{player['web_name']:<18} {where:<24} {stats.get(element_id, {}).get('minutes', 0):>3} min  "
+              f"{flags} ({status['rule'] or 'still playing'})")
+    if not args.players:
+        print(f"GW{data['gw']} players in started games by rule (player_status.classify)")
+        for rule in ('whistle', 'red_card', 'subbed_off', 'not done'):
+            print(f"  {rule}: {counts.get(rule, 0)}")
+
+
+def show_squad(data, args):
+    names = Names(data['bootstrap'])
+    team = args.team.upper() if args.team else None
+    print(f"Availability{' for ' + team if team else ''} (GW{data['gw']})")
+    for player in sorted(names.players.values(), key=lambda p: (names.teams.get(p['team'], ''), p['web_name'])):
+        if team and names.teams.get(player['team']) != team:
+            continue
+        chance = player['chance_of_playing_this_round']
+        if player['status'] == 'a' and (chance is None or chance >= 100):
+            continue
+        chance = '  -' if chance is None else f'{chance:>3}%'
+        print(f"{names.teams.get(player['team'], '?'):<4} {player['web_name'][:18]:<18} {names.positions.get(player['element_type'], ''):<3} "
+              f"{STATUS_NAMES.get(player['status'], player['status']):<13} {chance:>4}  {player['news'] or ''}")
+
+
+def show_subs(data, args):
+    """Substitutions from the one snapshot (fpl_common.substitution)"""
+    names = Names(data['bootstrap'])
+    stats = {element['id']: element['stats'] for element in data['live']['elements']}
+    by_team = {}
+    for element_id, player in names.players.items():
+        by_team.setdefault(player['team'], []).append(element_id)
+    print(f"GW{data['gw']} substitutions (sub-offs inferred from minutes behind the clock)")
+    for fixture in data['fixtures']:
+        if not fixture['started']:
+            continue
+        events = []
+        for team in (fixture['team_h'], fixture['team_a']):
+            for element_id in by_team.get(team, ()):
+                s = stats.get(element_id, {})
+                on, off = substitution(s, fixture['minutes'])
+                if on is not None and not s.get('starts'):
+                    events.append((on, 'on ', element_id))
+                if off is not None:
+                    events.append((off, 'off', element_id))
+        if events:
+            print(f"\n{names.fixture(fixture)} ({fixture_state(fixture)})")
+            for minute, direction, element_id in sorted(events):
+                print(f"  {minute:3}' {direction} {names.players[element_id]['web_name']}")
+
+
+def show_teams(data, args):
+    league = data[league_part(args.league)]
+    print(f"League Name: {league['name']}")
+    print(f"Number of teams: {len(league['standings'])}")
+    for entry_id, name, manager, rank, total in league['standings']:
+        print(f"{rank:3} ID: {entry_id:8} | {name[:25]:<25} | {manager} ({total})")
+    print("\nTeam IDs array for hardcoding:")
+    print(json.dumps([row[0] for row in league['standings']]))
+    if league['matches']:
+        team_names = {row[0]: row[1] for row in league['standings']}
+        print(f"\nGameweek {data['gw']} H2H Matchups:")
+        for entry_1, entry_2 in league['matches']:
+            print(f"{team_names.get(entry_1, 'Unknown')[:20]:<20} vs {team_names.get(entry_2, 'Unknown')[:20]:<20}")
+
+
+def refresh(args):
+    snapshot = Snapshot(args.cache)
+    if not snapshot.lock():
+        return
+    try:
+        fetch_parts(snapshot, args.parts)
+    finally:
+        snapshot.unlock()
+
+
+# command -> (parts needed, renderer)
+COMMANDS = {
+    'fixtures': (['fixtures'], show_fixtures),
+    'live': (['live'], show_live),
+    'status': (['fixtures', 'live'], show_status),
+    'squad': ([], show_squad),
+    'subs': (['fixtures', 'live'], show_subs),
+    'teams': ([], show_teams),
+}
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Matchday diagnostics from a local snapshot cache')
+    parser.add_argument('--cache', default=CACHE_DIR, help='Snapshot directory')
+    parser.add_argument('--fresh', action='store_true', help='Fetch everything the command needs before printing')
+    parser.add_argument('--no-refresh', action='store_true', help="Don't start a background refresh of stale parts")
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    commands.add_parser('fixtures', help="This gameweek's fixtures and their state")
+    live_parser = commands.add_parser('live', help='Live stats for named players, or the top scorers')
+    live_parser.add_argument('players', nargs='*')
+    live_parser.add_argument('--top', type=int, default=15)
+    status_parser = commands.add_parser('status', help="Done / didn't play / bonus pending per player, or counts by rule")
+    status_parser.add_argument('players', nargs='*')
+    squad_parser = commands.add_parser('squad', help='Injured, doubtful and suspended players')
+    squad_parser.add_argument('team', nargs='?', help='Team short name, e.g. ARS')
+    commands.add_parser('subs', help='Substitutions inferred from minutes')
+    teams_parser = commands.add_parser('teams', help="An H2H league's teams and this gameweek's matchups")
+    teams_parser.add_argument('--league', type=int, default=H2H_LEAGUE_ID)
+    refresh_parser = commands.add_parser('refresh', help='Fetch parts into the snapshot (what the background refresh runs)')
+    refresh_parser.add_argument('parts', nargs='+')
+    args = parser.parse_args()
+
+    if args.command == 'refresh':
+        refresh(args)
+        return
+    parts, show = COMMANDS[args.command]
+    if args.command == 'teams':
+        parts = [league_part(args.league)]
+    data = load_parts(Snapshot(args.cache), parts, fresh=args.fresh, background=not args.no_refresh)
+    show(data, args)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,331 @@
+#!/usr/bin/env python3
+"""Record FPL API responses to disk and replay them from a local server.
+
+    python3 fpl_replay.py record archive/gw7 --h2h 1017641 --classic 1549023
+    python3 fpl_replay.py serve archive/gw7 --port 8765 --speed 60
+
+An archive is a directory holding ``index.jsonl`` (one line per recorded
+response: timestamp, endpoint path, body hash) and ``bodies/<sha1>.json.gz``.
+Identical bodies are stored once, so polling an idle endpoint costs nothing.
+
+The replay server answers ``/api/<endpoint>`` with the latest recording at
+or before its virtual clock, which can start anywhere in the archive and run
+faster than real time. Point FPL_BASE_URL at ``http://localhost:<port>/api``
+to run the scripts (or proxy_server.py, and so the app) against it.
+"""
+import argparse
+import bisect
+import gzip
+import hashlib
+import json
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qsl, urlsplit
+
+from fpl_client import FPLClient, current_gameweek, endpoint_path
+
+API_PREFIX = '/api/'
+# fpl_client leaves the first page implicit; the app asks for it explicitly
+PAGE_PARAMS = ('page', 'page_standings')
+
+
+def normalise_key(path):
+    """Endpoint key with a canonical query string, as fpl_client builds them"""
+    parts = urlsplit(path.lstrip('/'))
+    params = dict(parse_qsl(parts.query))
+    for name in PAGE_PARAMS:
+        if params.get(name) == '1':
+            del params[name]
+    return endpoint_path(parts.path, params)
+
+
+class Archive:
+    """Append-only store of timestamped endpoint responses"""
+
+    def __init__(self, root):
+        self.root = root
+        self.bodies_dir = os.path.join(root, 'bodies')
+        self.index_path = os.path.join(root, 'index.jsonl')
+        os.makedirs(self.bodies_dir, exist_ok=True)
+        self._lock = threading.Lock()
+        # key -> (sorted timestamps, body hashes)
+        self._timeline = {}
+        self._load_index()
+
+    def _load_index(self):
+        if not os.path.exists(self.index_path):
+            return
+        with open(self.index_path) as index:
+            records = [json.loads(line) for line in index if line.strip()]
+        for record in sorted(records, key=lambda r: r['t']):
+            times, hashes = self._timeline.setdefault(record['path'], ([], []))
+            times.append(record['t'])
+            hashes.append(record['sha1'])
+
+    def record(self, path, body, t=None):
+        """Store a response body; returns False if it matches the previous one"""
+        key = normalise_key(path)
+        t = time.time() if t is None else t
+        digest = hashlib.sha1(body).hexdigest()
+        with self._lock:
+            times, hashes = self._timeline.setdefault(key, ([], []))
+            if hashes and hashes[-1] == digest:
+                return False
+            body_path = os.path.join(self.bodies_dir, f'{digest}.json.gz')
+            if not os.path.exists(body_path):
+                with open(body_path, 'wb') as out:
+                    out.write(gzip.compress(body))
+            with open(self.index_path, 'a') as index:
+                index.write(json.dumps({'t': t, 'path': key, 'sha1': digest}) + '\n')
+            times.append(t)
+            hashes.append(digest)
+        return True
+
+    @property
+    def paths(self):
+        return list(self._timeline)
+
+    def span(self):
+        """(first, last) recording timestamps across all endpoints"""
+        starts = [times[0] for times, _ in self._timeline.values() if times]
+        ends = [times[-1] for times, _ in self._timeline.values() if times]
+        return (min(starts), max(ends)) if starts else (None, None)
+
+    def times(self, path):
+        return list(self._timeline.get(normalise_key(path), ([], []))[0])
+
+    def lookup(self, path, t):
+        """Body hash of the latest recording at or before ``t``
+
+        Before an endpoint's first recording its earliest body is used, so
+        one-off captures such as picks are visible from the start of a replay.
+        """
+        times, hashes = self._timeline.get(normalise_key(path), ([], []))
+        if not times:
+            return None
+        i = bisect.bisect_right(times, t)
+        return hashes[max(i - 1, 0)]
+
+    def body(self, digest, compressed=False):
+        with open(os.path.join(self.bodies_dir, f'{digest}.json.gz'), 'rb') as f:
+            data = f.read()
+        return data if compressed else gzip.decompress(data)
+
+    def at(self, path, t):
+        """Decoded JSON of an endpoint as it was at ``t``, or None"""
+        digest = self.lookup(path, t)
+        return None if digest is None else json.loads(self.body(digest))
+
+
+class Recorder:
+    """Captures the endpoints the app and scripts use into an Archive"""
+
+    def __init__(self, archive, client, h2h_leagues=(), classic_leagues=()):
+        self.archive = archive
+        self.client = client
+        self.h2h_leagues = list(h2h_leagues)
+        self.classic_leagues = list(classic_leagues)
+        self._picks_recorded = set()
+
+    def fetch(self, path):
+        response = self.client.session.get(self.client.url(path), timeout=self.client.timeout)
+        response.raise_for_status()
+        self.archive.record(path, response.content)
+        return response.json()
+
+    def fetch_many(self, paths):
+        if not paths:
+            return []
+        with ThreadPoolExecutor(max_workers=min(self.client.pool_size, len(paths))) as pool:
+            return list(pool.map(self.fetch, paths))
+
+    def fetch_pages(self, spec):
+        """Every page of a league endpoint; returns (rows, pages fetched)
+
+        ``spec`` is (path, params, page parameter, rows_of, has_next_of).
+        """
+        path, params, page_param, rows_of, has_next_of = spec
+        rows = []
+        page = 1
+        while True:
+            data = self.fetch(endpoint_path(path, {**params, page_param: page if page > 1 else None}))
+            page_rows = rows_of(data)
+            rows += page_rows
+            if not page_rows or not has_next_of(data):
+                return rows, page
+            page += 1
+
+    def capture(self):
+        """Record one snapshot of every endpoint; returns the number of requests"""
+        bootstrap = self.fetch('bootstrap-static/')
+        gw = current_gameweek(bootstrap)
+        requests_made = 1
+        paths = [endpoint_path('fixtures/', {'event': gw}), f'event/{gw}/live/']
+        self.fetch_many(paths)
+        requests_made += len(paths)
+
+        def standings(data):
+            return data['standings']['results']
+
+        def standings_next(data):
+            return data['standings']['has_next']
+
+        leagues = []
+        for league_id in self.h2h_leagues:
+            leagues += [
+                (f'leagues-h2h/{league_id}/standings/', {}, 'page_standings', standings, standings_next),
+                (f'leagues-h2h-matches/league/{league_id}/', {'event': gw}, 'page',
+                 lambda data: data['results'], lambda data: data['has_next']),
+            ]
+        for league_id in self.classic_leagues:
+            leagues.append((f'leagues-classic/{league_id}/standings/', {}, 'page_standings', standings, standings_next))
+        # Pages of one league follow has_next in turn; the leagues run side by side
+        with ThreadPoolExecutor(max_workers=min(self.client.pool_size, len(leagues) or 1)) as pool:
+            results = list(pool.map(self.fetch_pages, leagues))
+
+        entries = set()
+        for (path, *_), (rows, pages) in zip(leagues, results):
+            requests_made += pages
+            if path.startswith(('leagues-h2h/', 'leagues-classic/')):
+                entries.update(standing['entry'] for standing in rows)
+        # Picks are frozen for the gameweek, so each is captured once
+        new_entries = sorted(e for e in entries if (e, gw) not in self._picks_recorded)
+        entry_paths = [path for e in new_entries for path in (f'entry/{e}/event/{gw}/picks/', f'entry/{e}/')]
+        self.fetch_many(entry_paths)
+        self._picks_recorded.update((e, gw) for e in new_entries)
+        return requests_made + len(entry_paths)
+
+
+class ReplayClock:
+    """Virtual time: ``start`` at launch, advancing ``speed`` times real time"""
+
+    def __init__(self, start, speed=1.0):
+        self.start = start
+        self.speed = speed
+        self._launched = time.time()
+
+    def now(self):
+        return self.start + (time.time() - self._launched) * self.speed
+
+
+class ReplayHandler(BaseHTTPRequestHandler):
+    archive = None
+    clock = None
+
+    def do_GET(self):
+        if self.path == '/__clock':
+            now = self.clock.now()
+            self.send_json(200, json.dumps({
+                'now': now,
+                'iso': datetime.fromtimestamp(now, timezone.utc).isoformat(),
+                'speed': self.clock.speed,
+            }).encode())
+            return
+        if not self.path.startswith(API_PREFIX):
+            self.send_error(404)
+            return
+
+        digest = self.archive.lookup(self.path[len(API_PREFIX):], self.clock.now())
+        if digest is None:
+            self.send_error(404, 'Not in archive')
+            return
+        etag = f'"{digest}"'
+        if self.headers.get('If-None-Match') == etag:
+            self.send_response(304)
+            self.send_header('ETag', etag)
+            self.end_headers()
+            return
+
+        accepts_gzip = 'gzip' in self.headers.get('Accept-Encoding', '')
+        body = self.archive.body(digest, compressed=accepts_gzip)
+        self.send_json(200, body, etag=etag, gzipped=accepts_gzip)
+
+    def send_json(self, status, body, etag=None, gzipped=False):
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        if etag:
+            self.send_header('ETag', etag)
+        if gzipped:
+            self.send_header('Content-Encoding', 'gzip')
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+def parse_time(value, archive_start):
+    """Absolute ISO time, or an offset in minutes from the archive start"""
+    if value is None:
+        return archive_start
+    try:
+        return archive_start + float(value) * 60
+    except ValueError:
+        return datetime.fromisoformat(value.replace('Z', '+00:00')).timestamp()
+
+
+def record(args):
+    archive = Archive(args.archive)
+    recorder = Recorder(archive, FPLClient(), args.h2h, args.classic)
+    stop_at = time.time() + args.duration * 60 if args.duration else None
+    while True:
+        started = time.time()
+        try:
+            count = recorder.capture()
+            print(f"{datetime.now():%H:%M:%S} captured {count} responses")
+        except Exception as error:
+            print(f"Capture failed: {error}")
+        if args.once or (stop_at and time.time() >= stop_at):
+            break
+        time.sleep(max(0, args.interval - (time.time() - started)))
+
+
+def serve(args):
+    archive = Archive(args.archive)
+    first, last = archive.span()
+    if first is None:
+        raise SystemExit(f"{args.archive} has no recordings")
+    ReplayHandler.archive = archive
+    ReplayHandler.clock = ReplayClock(parse_time(args.start, first), args.speed)
+    server = ThreadingHTTPServer((args.bind, args.port), ReplayHandler)
+    print(f"Replaying {len(archive.paths)} endpoints "
+          f"({datetime.fromtimestamp(first):%Y-%m-%d %H:%M} to {datetime.fromtimestamp(last):%H:%M}) at {args.speed}x")
+    print(f"FPL_BASE_URL=http://localhost:{args.port}/api")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Record and replay FPL API responses')
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    record_parser = commands.add_parser('record', help='Capture endpoint responses into an archive')
+    record_parser.add_argument('archive')
+    record_parser.add_argument('--h2h', type=int, action='append', default=[], help='H2H league id (repeatable)')
+    record_parser.add_argument('--classic', type=int, action='append', default=[], help='Classic league id (repeatable)')
+    record_parser.add_argument('--interval', type=int, default=60, help='Seconds between captures')
+    record_parser.add_argument('--duration', type=float, help='Stop after this many minutes')
+    record_parser.add_argument('--once', action='store_true', help='Capture a single snapshot and exit')
+    record_parser.set_defaults(func=record)
+
+    serve_parser = commands.add_parser('serve', help='Serve an archive as a local FPL API')
+    serve_parser.add_argument('archive')
+    serve_parser.add_argument('--port', type=int, default=8765)
+    serve_parser.add_argument('--bind', default='127.0.0.1')
+    serve_parser.add_argument('--start', help='ISO time, or minutes after the first recording')
+    serve_parser.add_argument('--speed', type=float, default=1.0, help='Virtual seconds per real second')
+    serve_parser.set_defaults(func=serve)
+
+    args = parser.parse_args()
+    args.func(args)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,6 +1,6 @@
 // FPLLLM - FPL Normal League Live Tracker adapted to look like H2H
-const FPL_BASE_URL = 'https://fantasy.premierleague.com/api';
-const PROXY_URL = 'https://corsproxy.io/?';
+// FPL API endpoints (proxied and cached by proxy_server.py)
+const FPL_BASE_URL = '/api';
 
 // Hardcoded Normal League
 const LEAGUE_ID = 1549023;
@@ -11,6 +11,10 @@ let fixturesData = {};
 let liveData = null;
 let teamsData = {};
 let fakeMatches = [];
+let gwFixtures = [];
+let nextDeadline = null;
+let refreshTimer = null;
+let whistleSeenAt = {};
 
 // DOM elements
 const matchesContainer = document.getElementById('matchesContainer');
@@ -39,7 +43,7 @@ function stopLoadingAnimation() {
 }
 
 async function fetchWithProxy(url) {
-    const response = await fetch(PROXY_URL + encodeURIComponent(url));
+    const response = await fetch(url);
     if (!response.ok) {
         throw new Error(`HTTP error! status: ${response.status}`);
     }
@@ -77,17 +81,24 @@ async function loadData() {
         const bootstrapData = await fetchWithProxy(`${FPL_BASE_URL}/bootstrap-static/`);
         gameweekData = bootstrapData.events.find(gw => gw.is_current);
         currentGW = gameweekData.id;
+        const nextEvent = bootstrapData.events.find(gw => gw.is_next);
+        nextDeadline = nextEvent?.deadline_time ? new Date(nextEvent.deadline_time).getTime() : null;
         
         gwInfoSpan.textContent = `GW${currentGW}`;
         
         // Get fixtures for current gameweek  
         const fixturesResponse = await fetchWithProxy(`${FPL_BASE_URL}/fixtures/?event=${currentGW}`);
+        gwFixtures = fixturesResponse;
+        
+        // Index players and teams once instead of searching per pick
+        const elementsById = Object.fromEntries(bootstrapData.elements.map(p => [p.id, p]));
+        const teamsById = Object.fromEntries(bootstrapData.teams.map(t => [t.id, t]));
         
         // Create lookup for team fixtures
         fixturesData = {};
         for (const fixture of fixturesResponse) {
-            const homeTeam = bootstrapData.teams.find(t => t.id === fixture.team_h);
-            const awayTeam = bootstrapData.teams.find(t => t.id === fixture.team_a);
+            const homeTeam = teamsById[fixture.team_h];
+            const awayTeam = teamsById[fixture.team_a];
             
             fixturesData[fixture.team_h] = {
                 ...fixture,
@@ -122,13 +133,13 @@ async function loadData() {
                 
                 // Process players
                 const players = pickData.picks.map(pick => {
-                    const playerInfo = bootstrapData.elements.find(p => p.id === pick.element);
+                    const playerInfo = elementsById[pick.element];
                     const liveStats = liveData.elements[pick.element - 1]?.stats || {};
                     
                     // Get fixture info for player's team
                     const fixtureInfo = playerInfo?.team ? fixturesData[playerInfo.team] : null;
                     
-                    // Determine if player is "done" 
+                    // Determine if player is "done" (same rules as classify() in player_status.py)
                     let playerDone = false;
                     let didntPlay = false;
                     let gameInProgress = false;
@@ -482,11 +493,59 @@ function createTeamGrid(team) {
     return gridDiv;
 }
 
+// Milliseconds until the next auto-refresh, following the fixtures
+// (same phases as poll_scheduler.py)
+function nextRefreshDelay(fixtures) {
+    const now = Date.now();
+    let inPlay = false;
+    let burst = false;
+    let bonus = false;
+    let nextKickoff = null;
+    
+    fixtures.forEach(fixture => {
+        if (fixture.finished) {
+            delete whistleSeenAt[fixture.id];
+        } else if (fixture.finished_provisional) {
+            // Bonus is confirmed some time after the whistle; poll hard at first
+            whistleSeenAt[fixture.id] = whistleSeenAt[fixture.id] || now;
+            burst = burst || now - whistleSeenAt[fixture.id] < 20 * 60 * 1000;
+            bonus = true;
+        } else if (fixture.started) {
+            inPlay = true;
+        } else if (fixture.kickoff_time) {
+            const kickoff = new Date(fixture.kickoff_time).getTime();
+            if (nextKickoff === null || kickoff < nextKickoff) nextKickoff = kickoff;
+        }
+    });
+    
+    let delay;
+    if (inPlay) delay = 30 * 1000;
+    else if (burst) delay = 15 * 1000;
+    else if (bonus) delay = 2 * 60 * 1000;
+    else if (nextKickoff !== null && nextKickoff - now <= 30 * 60 * 1000) delay = 5 * 60 * 1000;
+    else delay = 60 * 60 * 1000;
+    
+    // Never sleep through a kickoff; poll as if live once it's overdue
+    if (nextKickoff !== null) {
+        const untilKickoff = nextKickoff - now;
+        delay = Math.min(delay, untilKickoff > 0 ? Math.max(untilKickoff, 10 * 1000) : 30 * 1000);
+    }
+    // Wake at the next deadline so the new gameweek loads before its first match
+    if (nextDeadline !== null) {
+        const untilDeadline = nextDeadline - now;
+        delay = Math.min(delay, untilDeadline > 0 ? Math.max(untilDeadline, 10 * 1000) : 60 * 1000);
+    }
+    return delay;
+}
+
+async function refreshLoop() {
+    await loadData();
+    clearTimeout(refreshTimer);
+    refreshTimer = setTimeout(refreshLoop, nextRefreshDelay(gwFixtures));
+}
+
 // Event listeners
 refreshBtn.addEventListener('click', loadData);
 
-// Auto-refresh every 30 seconds
-setInterval(loadData, 30000);
-
-// Initial load
-loadData();
\ No newline at end of file
+// Initial load, then auto-refresh as often as the fixtures warrant
+refreshLoop();
\ No newline at end of file
@@ -0,0 +1,105 @@
+"""Concurrent, streaming pagination over league standings and H2H matches.
+
+FPL pages league endpoints 50 rows at a time and only says whether another
+page exists (``has_next``), so the page count is discovered on the way: a
+window of up to ``max_concurrency`` pages is kept in flight, the first page
+reporting no successor (or no rows) marks the end, and speculative requests
+past it are cancelled. Rows are yielded as soon as their page lands, in
+completion order, so scoring can start long before a league with hundreds
+of thousands of entries has finished downloading.
+
+    async with AsyncFPLClient() as client:
+        async for standing in iter_classic_standings(client, 314):
+            ...
+"""
+import asyncio
+
+DEFAULT_CONCURRENCY = 8
+
+
+async def iter_pages(fetch_page, rows_of, has_next_of, max_concurrency=DEFAULT_CONCURRENCY, max_pages=None):
+    """Yield rows from pages 1..N fetched concurrently
+
+    ``fetch_page(page)`` is a coroutine returning a page payload;
+    ``rows_of`` / ``has_next_of`` pull the rows and continuation flag out of it.
+    """
+    pending = {}
+    next_page = 1
+    last_page = None
+    # A failed page may just be a speculative one past the end; it only
+    # counts once an earlier page says there is more
+    errors = {}
+
+    def limit():
+        bounds = [b for b in (last_page, max_pages, min(errors, default=None)) if b is not None]
+        return min(bounds, default=None)
+
+    def schedule():
+        nonlocal next_page
+        while len(pending) < max_concurrency and (limit() is None or next_page <= limit()):
+            pending[asyncio.ensure_future(fetch_page(next_page))] = next_page
+            next_page += 1
+
+    schedule()
+    try:
+        while pending:
+            done, _ = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+            for task in sorted(done, key=pending.get):
+                page = pending.pop(task, None)
+                if page is None or (last_page is not None and page > last_page):
+                    continue
+                if task.exception() is not None:
+                    errors[page] = task.exception()
+                    continue
+                data = task.result()
+                rows = rows_of(data)
+                if rows and has_next_of(data):
+                    if page + 1 in errors:
+                        raise errors[page + 1]
+                else:
+                    last_page = page if last_page is None else min(last_page, page)
+                    for other, other_page in list(pending.items()):
+                        if other_page > last_page:
+                            other.cancel()
+                            del pending[other]
+                for row in rows:
+                    yield row
+            schedule()
+        first_error = min(errors, default=None)
+        if first_error is not None and (last_page is None or first_error <= last_page):
+            raise errors[first_error]
+    finally:
+        for task in pending:
+            task.cancel()
+
+
+def iter_classic_standings(client, league_id, **kwargs):
+    return iter_pages(
+        lambda page: client.classic_standings(league_id, page),
+        lambda data: data['standings']['results'],
+        lambda data: data['standings']['has_next'],
+        **kwargs,
+    )
+
+
+def iter_h2h_standings(client, league_id, **kwargs):
+    return iter_pages(
+        lambda page: client.h2h_standings(league_id, page),
+        lambda data: data['standings']['results'],
+        lambda data: data['standings']['has_next'],
+        **kwargs,
+    )
+
+
+def iter_h2h_matches(client, league_id, event=None, **kwargs):
+    """H2H matches, optionally only one gameweek's (far fewer pages)"""
+    return iter_pages(
+        lambda page: client.h2h_matches(league_id, page, event=event),
+        lambda data: data['results'],
+        lambda data: data['has_next'],
+        **kwargs,
+    )
+
+
+async def collect(rows):
+    return [row async for row in rows]
@@ -0,0 +1,246 @@
+#!/usr/bin/env python3
+"""Vectorised live-points engine for large leagues.
+
+Ports the scoring in fetchAllTeamDetails / calculateAutoSubs (app.js) to
+NumPy. Every entry's picks sit in an (entries x 15) matrix of element ids
+that indexes straight into per-element live vectors, so each live poll
+re-scores the whole league with a few array operations instead of a loop
+over entries and picks.
+"""
+import sys
+import time
+
+import numpy as np
+
+from bonus_engine import BonusEngine
+from metrics import span
+from player_status import SUB_MARGIN
+
+GKP, DEF, MID, FWD = 1, 2, 3, 4
+SQUAD_SIZE = 15
+XI_SIZE = 11
+BENCH_GK_SLOT = 11
+
+LIVE_FIELDS = ('total_points', 'minutes', 'red_cards', 'starts', 'bonus', 'bps')
+FIXTURE_FIELDS = ('started', 'finished', 'finished_provisional', 'minutes')
+
+
+def live_arrays(live, size):
+    """Id-indexed vectors of the live stats the scoring rules need"""
+    arrays = {field: np.zeros(size, dtype=np.int32) for field in LIVE_FIELDS}
+    for element in live['elements']:
+        element_id = element['id']
+        if element_id >= size:
+            continue
+        stats = element['stats']
+        for field in LIVE_FIELDS:
+            arrays[field][element_id] = stats.get(field) or 0
+    return arrays
+
+
+def fixture_arrays(fixtures, n_teams):
+    """Team-indexed fixture state; a team's last fixture wins, as in app.js"""
+    arrays = {field: np.zeros(n_teams + 1, dtype=np.int32) for field in FIXTURE_FIELDS}
+    arrays['has_fixture'] = np.zeros(n_teams + 1, dtype=bool)
+    for fixture in fixtures:
+        for team in (fixture['team_h'], fixture['team_a']):
+            if team > n_teams:
+                continue
+            arrays['has_fixture'][team] = True
+            for field in FIXTURE_FIELDS:
+                arrays[field][team] = fixture.get(field) or 0
+    return arrays
+
+
+def player_status(element_team, live, fixtures, subbed_off=None):
+    """Per-element done / didn't-play / in-progress / bonus-pending flags
+
+    Array form of player_status.classify (the rules app.js applies per pick):
+    a player is done once the whistle has gone, after a red card, or when a
+    starter has stopped accruing minutes more than SUB_MARGIN minutes behind
+    the match clock.
+    ``subbed_off`` (an id-indexed bool mask, e.g. from EventTimeline)
+    replaces that last guess when given.
+    """
+    has_fixture = fixtures['has_fixture'][element_team]
+    started = fixtures['started'][element_team].astype(bool)
+    finished = fixtures['finished'][element_team].astype(bool)
+    provisional = fixtures['finished_provisional'][element_team].astype(bool)
+    game_minutes = fixtures['minutes'][element_team]
+
+    minutes = live['minutes']
+    played = minutes > 0
+    whistle = finished | provisional
+    if subbed_off is None:
+        subbed_off = played & (minutes < game_minutes - SUB_MARGIN) & (live['starts'] > 0)
+
+    return {
+        'done': has_fixture & (whistle | (live['red_cards'] > 0) | subbed_off),
+        'didnt_play': has_fixture & whistle & ~played,
+        'in_progress': has_fixture & started & ~provisional,
+        'bonus_pending': has_fixture & provisional & ~finished & played,
+    }
+
+
+class LiveEngine:
+    """Scores every entry in a league from a picks matrix
+
+    Build once per gameweek with from_payloads(); then call score() with
+    each new live/fixtures snapshot.
+    """
+
+    def __init__(self, element_type, element_team, entry_ids, picks, multipliers, transfer_costs):
+        self.element_type = element_type
+        self.element_team = element_team
+        self.entry_ids = np.asarray(entry_ids, dtype=np.int64)
+        self.picks = picks
+        self.multipliers = multipliers
+        self.transfer_costs = transfer_costs
+        self.n_teams = int(element_team.max())
+        self.index = {int(entry_id): i for i, entry_id in enumerate(self.entry_ids)}
+        # Squad composition doesn't change during a gameweek
+        self.types = element_type[picks]
+        self.bonus = BonusEngine(len(element_type))
+
+    @classmethod
+    def from_payloads(cls, store, picks_by_entry):
+        """Build from a BootstrapStore and {entry_id: picks payload}"""
+        element_type, element_team = store.element_type, store.team
+        entry_ids = list(picks_by_entry)
+        n = len(entry_ids)
+        picks = np.zeros((n, SQUAD_SIZE), dtype=np.int32)
+        multipliers = np.zeros((n, SQUAD_SIZE), dtype=np.int8)
+        transfer_costs = np.zeros(n, dtype=np.int16)
+        for row, entry_id in enumerate(entry_ids):
+            payload = picks_by_entry[entry_id]
+            for pick in payload['picks']:
+                slot = pick['position'] - 1
+                picks[row, slot] = pick['element'] if pick['element'] < len(element_type) else 0
+                multipliers[row, slot] = pick['multiplier']
+            history = payload.get('entry_history') or {}
+            transfer_costs[row] = history.get('event_transfers_cost') or 0
+        return cls(element_type, element_team, entry_ids, picks, multipliers, transfer_costs)
+
+    def score(self, live, fixtures, subbed_off=None):
+        """Live totals for every entry from raw live and fixtures payloads
+
+        Points include provisional bonus from the fixtures' BPS until FPL
+        confirms it. Returns a dict with ``totals`` (entries,), ``auto_subs``
+        (entries x 15 bool, bench slots coming on) and ``replaced`` (entries
+        x 15 bool, XI slots going off).
+        """
+        size = len(self.element_type)
+        with span('live_arrays'):
+            live_vecs = live_arrays(live, size)
+        with span('fixtures_map'):
+            fixture_vecs = fixture_arrays(fixtures, self.n_teams)
+        status = player_status(self.element_team, live_vecs, fixture_vecs, subbed_off)
+        return self.score_arrays(self.live_points(live_vecs, fixtures), status)
+
+    def live_points(self, live_vecs, fixtures):
+        """Id-indexed live points plus provisional bonus"""
+        with span('provisional_bonus'):
+            self.bonus.update(fixtures)
+        return live_vecs['total_points'] + self.bonus.bonus
+
+    def score_arrays(self, points_by_element, status):
+        """Live totals from an id-indexed points vector and player_status flags"""
+        points = points_by_element[self.picks]
+        absent = (status['done'] & status['didnt_play'])[self.picks]
+        with span('auto_subs'):
+            auto_subs, replaced = self.auto_subs(absent)
+
+        xi_points = (points[:, :XI_SIZE] * self.multipliers[:, :XI_SIZE]).sum(axis=1)
+        # Bench boost already gives bench slots a multiplier; auto-subs only
+        # apply to bench slots that would otherwise score nothing
+        bench_points = (points[:, XI_SIZE:] * self.multipliers[:, XI_SIZE:]).sum(axis=1)
+        sub_points = (points * auto_subs).sum(axis=1)
+        totals = xi_points + bench_points + sub_points - self.transfer_costs
+        return {'totals': totals, 'auto_subs': auto_subs, 'replaced': replaced}
+
+    def auto_subs(self, absent):
+        """FPL auto-substitutions for every entry at once
+
+        ``absent`` is (entries x 15) bool for picks who are done and didn't
+        play. Bench players are tried in order; the bench keeper may only
+        replace the XI keeper, outfielders replace the first absent XI
+        outfielder that keeps at least 3 DEF and 1 FWD.
+        """
+        n = len(self.picks)
+        types = self.types
+        bench_boost = self.multipliers[:, XI_SIZE:].any(axis=1)
+        # Squad players who haven't been ruled out can still come on
+        available = ~absent & (self.picks > 0)
+
+        auto_subs = np.zeros((n, SQUAD_SIZE), dtype=bool)
+        replaced = np.zeros((n, SQUAD_SIZE), dtype=bool)
+        pending = absent.copy()
+        pending[:, XI_SIZE:] = False
+        pending[bench_boost] = False
+
+        xi_types = types[:, :XI_SIZE]
+        counts = {t: (xi_types == t).sum(axis=1) for t in (DEF, MID, FWD)}
+
+        gk_out = pending[:, :XI_SIZE] & (xi_types == GKP)
+        gk_sub = gk_out.any(axis=1) & available[:, BENCH_GK_SLOT] & (types[:, BENCH_GK_SLOT] == GKP)
+        auto_subs[:, BENCH_GK_SLOT] = gk_sub
+        replaced[:, :XI_SIZE] |= gk_out & gk_sub[:, None]
+        pending[:, :XI_SIZE] &= ~(gk_out & gk_sub[:, None])
+
+        rows = np.arange(n)
+        for bench_slot in range(BENCH_GK_SLOT + 1, SQUAD_SIZE):
+            bench_type = types[:, bench_slot]
+            candidate = available[:, bench_slot] & (bench_type != GKP)
+            done_row = ~candidate
+            for slot in range(XI_SIZE):
+                out_type = xi_types[:, slot]
+                eligible = ~done_row & pending[:, slot] & (out_type != GKP)
+                if not eligible.any():
+                    continue
+                defs = counts[DEF] - (out_type == DEF) + (bench_type == DEF)
+                fwds = counts[FWD] - (out_type == FWD) + (bench_type == FWD)
+                swap = eligible & (defs >= 3) & (fwds >= 1)
+                if not swap.any():
+                    continue
+                swap_rows = rows[swap]
+                for t in (DEF, MID, FWD):
+                    counts[t][swap_rows] += (bench_type[swap_rows] == t).astype(counts[t].dtype)
+                    counts[t][swap_rows] -= (out_type[swap_rows] == t).astype(counts[t].dtype)
+                auto_subs[swap_rows, bench_slot] = True
+                replaced[swap_rows, slot] = True
+                pending[swap_rows, slot] = False
+                done_row |= swap
+
+        return auto_subs, replaced
+
+    def totals_by_entry(self, totals):
+        return dict(zip(self.entry_ids.tolist(), totals.tolist()))
+
+
+def main():
+    from bootstrap_store import BootstrapStore
+    from fpl_client import FPLClient
+
+    league_id = int(sys.argv[1]) if len(sys.argv) > 1 else 1549023
+    client = FPLClient()
+    store = BootstrapStore.from_client(client)
+    current_gw = store.current_gw
+    standings = client.classic_standings(league_id)['standings']['results']
+    entry_ids = [standing['entry'] for standing in standings]
+    payloads = client.get_many([f'entry/{entry_id}/event/{current_gw}/picks/' for entry_id in entry_ids])
+    live, fixtures = client.get_many([f'event/{current_gw}/live/', ('fixtures/', {'event': current_gw})])
+
+    engine = LiveEngine.from_payloads(store, dict(zip(entry_ids, payloads)))
+    start = time.perf_counter()
+    result = engine.score(live, fixtures)
+    elapsed = (time.perf_counter() - start) * 1000
+
+    names = {standing['entry']: standing['entry_name'] for standing in standings}
+    totals = engine.totals_by_entry(result['totals'])
+    print(f"GW{current_gw} live totals ({len(entry_ids)} entries scored in {elapsed:.1f} ms)")
+    for rank, (entry_id, points) in enumerate(sorted(totals.items(), key=lambda t: -t[1]), 1):
+        print(f"{rank:3} {names[entry_id][:25]:<25} {points:4}")
+
+
+if __name__ == "__main__":
+    main()
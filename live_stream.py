@@ -0,0 +1,301 @@
+"""Server-side live poller that pushes deltas to the PWA over Server-Sent Events.
+
+Instead of every browser re-downloading bootstrap, fixtures, live data and
+all picks on each refresh, one LivePoller fetches ``event/{gw}/live/`` and
+fixtures, diffs them against the previous snapshot, re-scores the league
+with LiveEngine, and publishes only what changed:
+
+    event: delta
+    data: {"seq": 42, "gameweek": 7,
+           "players": {"<element id>": {"<stat>": value, ...}},
+           "fixtures": {"<fixture id>": {"<field>": value, ...}},
+           "totals": {"<entry id>": live points},
+           "odds": {"<entry id>": {"win": p, "draw": p, "low": pts, "high": pts}},
+           "events": [{"fixture": id, "minute": m, "element": id, "type": "goal", "delta": 1}, ...],
+           "subbed_off": {"<element id>": minute},
+           "bonus": {"<element id>": provisional bonus}}
+
+``seq`` increases by one per message so clients can detect a gap and fall
+back to a full reload. ``odds`` comes from a fresh MatchupSimulator run over
+the gameweek's H2H pairings, ``subbed_off`` from EventTimeline's inferred
+substitutions (replacing the app's minutes-behind-the-clock guess) and
+``bonus`` is the provisional 3/2/1 bonus from each unconfirmed fixture's BPS
+(bonus_engine.py), which the app adds to live points until FPL confirms it.
+Like ``totals``, these three only carry the keys that changed, with ``null``
+for a key that has gone. ``events`` are what EventTimeline inferred since the
+last poll.
+
+Every client is first sent the full current ``totals``, ``odds``,
+``subbed_off`` and ``bonus`` as one message, so a page opened (or
+reconnected) between deltas still has them:
+
+    event: state
+    data: {"seq": 42, "gameweek": 7, "totals": {...}, "odds": {...}, "subbed_off": {...}, "bonus": {...}}
+"""
+import json
+import queue
+import threading
+import time
+
+from bootstrap_store import BootstrapStore
+from event_timeline import EventTimeline
+from live_engine import LiveEngine
+from metrics import span
+from picks_cache import cached_picks
+from poll_scheduler import PollScheduler
+from win_probability import MatchupSimulator, odds_by_entry
+
+FIXTURE_STATE_FIELDS = ('started', 'finished', 'finished_provisional', 'minutes', 'team_h_score', 'team_a_score')
+KEEPALIVE = 15
+SUBSCRIBER_BACKLOG = 100
+
+
+def diff_live(previous, live):
+    """Return (snapshot, changes) where changes maps element id to changed stats"""
+    snapshot = {element['id']: element['stats'] for element in live['elements']}
+    changes = {}
+    for element_id, stats in snapshot.items():
+        before = previous.get(element_id)
+        if before == stats:
+            continue
+        if before is None:
+            changes[element_id] = dict(stats)
+        else:
+            changes[element_id] = {k: v for k, v in stats.items() if before.get(k) != v}
+    return snapshot, changes
+
+
+def diff_fixtures(previous, fixtures):
+    """Return (snapshot, changes) where changes maps fixture id to changed state"""
+    snapshot = {f['id']: {field: f.get(field) for field in FIXTURE_STATE_FIELDS} for f in fixtures}
+    changes = {}
+    for fixture_id, state in snapshot.items():
+        before = previous.get(fixture_id, {})
+        changed = {k: v for k, v in state.items() if before.get(k) != v}
+        if changed:
+            changes[fixture_id] = changed
+    return snapshot, changes
+
+
+def diff_totals(previous, totals):
+    return {entry_id: points for entry_id, points in totals.items() if previous.get(entry_id) != points}
+
+
+def diff_mapping(previous, current):
+    """Changed keys of ``current``, plus None for keys it no longer has"""
+    changes = diff_totals(previous, current)
+    changes.update((key, None) for key in previous if key not in current)
+    return changes
+
+
+class Broadcaster:
+    """Fans SSE messages out to per-client queues"""
+
+    def __init__(self):
+        self.seq = 0
+        self._state = None
+        self._subscribers = set()
+        self._lock = threading.Lock()
+
+    def subscribe(self):
+        """New client queue, primed with the current state if there is one"""
+        subscriber = queue.Queue(maxsize=SUBSCRIBER_BACKLOG)
+        with self._lock:
+            if self._state is not None:
+                subscriber.put_nowait(self._message('state', self._state))
+            self._subscribers.add(subscriber)
+        return subscriber
+
+    def unsubscribe(self, subscriber):
+        with self._lock:
+            self._subscribers.discard(subscriber)
+
+    @property
+    def client_count(self):
+        return len(self._subscribers)
+
+    def set_state(self, state):
+        """Replace the state sent to clients when they subscribe"""
+        with self._lock:
+            self._state = state
+
+    def _message(self, event, data):
+        payload = json.dumps({'seq': self.seq, **data}, separators=(',', ':'))
+        return f'event: {event}\nid: {self.seq}\ndata: {payload}\n\n'.encode()
+
+    def publish(self, event, data, state=None):
+        """Send a message to every client; ``state`` replaces the subscribe state"""
+        with self._lock:
+            self.seq += 1
+            if state is not None:
+                self._state = state
+            message = self._message(event, data)
+            for subscriber in list(self._subscribers):
+                try:
+                    subscriber.put_nowait(message)
+                except queue.Full:
+                    # A client this far behind is dropped; it reconnects and reloads
+                    self._subscribers.discard(subscriber)
+                    _drain(subscriber)
+                    subscriber.put_nowait(None)
+        return self.seq
+
+
+def _drain(subscriber):
+    try:
+        while True:
+            subscriber.get_nowait()
+    except queue.Empty:
+        pass
+
+
+def serve_sse(handler, broadcaster):
+    """Stream broadcaster messages to one HTTP client until it disconnects"""
+    handler.send_response(200)
+    handler.send_header('Content-Type', 'text/event-stream')
+    handler.send_header('Cache-Control', 'no-cache')
+    handler.send_header('Connection', 'keep-alive')
+    handler.send_header('Access-Control-Allow-Origin', '*')
+    handler.end_headers()
+
+    subscriber = broadcaster.subscribe()
+    try:
+        handler.wfile.write(b'retry: 5000\n\n')
+        handler.wfile.flush()
+        while True:
+            try:
+                message = subscriber.get(timeout=KEEPALIVE)
+            except queue.Empty:
+                message = b': keepalive\n\n'
+            if message is None:
+                break
+            handler.wfile.write(message)
+            handler.wfile.flush()
+    except (BrokenPipeError, ConnectionResetError):
+        pass
+    finally:
+        broadcaster.unsubscribe(subscriber)
+
+
+class LivePoller(threading.Thread):
+    """Polls live data and fixtures for one H2H league and publishes deltas
+
+    By default a PollScheduler paces each endpoint from the fixtures (hours
+    when idle, seconds while matches are live); a fixed ``interval`` polls
+    live and fixtures every that many seconds instead.
+    """
+
+    def __init__(self, client, league_id, broadcaster, interval=None, picks_cache=None):
+        super().__init__(daemon=True)
+        self.client = client
+        self.picks_cache = picks_cache
+        self.league_id = league_id
+        self.broadcaster = broadcaster
+        self.interval = interval
+        self.scheduler = PollScheduler()
+        self.store = None
+        self.gameweek = None
+        self.engine = None
+        self.simulator = None
+        self.timeline = None
+        self._bootstrap_at = 0
+        self._fixtures_at = 0
+        self._fixtures_payload = None
+        self._live = None
+        self._fixtures = None
+        self._totals = {}
+        self._bonus = {}
+        self._odds = {}
+        self._subbed_off = {}
+
+    def run(self):
+        while True:
+            try:
+                self.poll()
+            except Exception as error:
+                print(f"Live poll failed: {error}")
+            time.sleep(self.wait('live'))
+
+    def wait(self, endpoint):
+        return self.scheduler.interval(endpoint) if self.interval is None else self.interval
+
+    def poll(self):
+        self._refresh_gameweek()
+        gw = self.gameweek
+        with span('live_fetch'):
+            if self._fixtures_payload is None or time.time() - self._fixtures_at >= self.wait('fixtures'):
+                live, fixtures = self.client.get_many([f'event/{gw}/live/', ('fixtures/', {'event': gw})])
+                self._fixtures_payload, self._fixtures_at = fixtures, time.time()
+                self.scheduler.update(fixtures)
+            else:
+                live, fixtures = self.client.live(gw), self._fixtures_payload
+
+        with span('diff'):
+            live_snapshot, players = diff_live(self._live or {}, live)
+            fixture_snapshot, fixture_changes = diff_fixtures(self._fixtures or {}, fixtures)
+            events = self.timeline.feed(live, fixtures)
+        subbed_off = self.timeline.subbed_off_mask()
+        with span('score'):
+            totals = self.engine.totals_by_entry(self.engine.score(live, fixtures, subbed_off)['totals'])
+        total_changes = diff_totals(self._totals, totals)
+        bonus = self.engine.bonus.by_element()
+        bonus_changes = diff_mapping(self._bonus, bonus)
+
+        baseline = self._live is None
+        changed = players or fixture_changes or total_changes or events or bonus_changes
+        self._live, self._fixtures, self._totals, self._bonus = live_snapshot, fixture_snapshot, totals, bonus
+        if not (baseline or changed):
+            return None
+        with span('win_odds'):
+            odds = odds_by_entry(self.simulator.simulate(live, fixtures, subbed_off=subbed_off))
+        subbed = self.timeline.subbed_off()
+        state = {'gameweek': gw, 'totals': totals, 'odds': odds, 'subbed_off': subbed, 'bonus': bonus}
+        odds_changes, subbed_changes = diff_mapping(self._odds, odds), diff_mapping(self._subbed_off, subbed)
+        self._odds, self._subbed_off = odds, subbed
+        if baseline:
+            # Nothing to diff against yet, but new clients get the state
+            self.broadcaster.set_state(state)
+            return None
+        with span('render_payload'):
+            return self.broadcaster.publish('delta', {
+                'gameweek': gw,
+                'players': players,
+                'fixtures': fixture_changes,
+                'totals': total_changes,
+                'odds': odds_changes,
+                'events': events,
+                'subbed_off': subbed_changes,
+                'bonus': bonus_changes,
+            }, state=state)
+
+    def _refresh_gameweek(self):
+        if self.engine is not None and time.time() - self._bootstrap_at < self.scheduler.interval('bootstrap'):
+            return
+        with span('bootstrap'):
+            store = BootstrapStore.from_client(self.client)
+        if self.picks_cache is not None:
+            self.picks_cache.update_events(store.events)
+        self.scheduler.update_events(store.events)
+        if store.current_gw != self.gameweek or self.engine is None:
+            standings = self.client.h2h_standings(self.league_id)['standings']['results']
+            entry_ids = [standing['entry'] for standing in standings]
+            with span('picks_fetch'):
+                payloads = cached_picks(self.client, self.picks_cache, entry_ids, store.current_gw)
+            engine = LiveEngine.from_payloads(store, payloads)
+            matches = self.client.h2h_matches(self.league_id, event=store.current_gw)['results']
+            self.simulator = MatchupSimulator(engine, store, [(m['entry_1_entry'], m['entry_2_entry']) for m in matches])
+            self.engine = engine
+            self.timeline = EventTimeline(store.team)
+            self.gameweek = store.current_gw
+            self._reset_snapshots()
+        self.store = store
+        self._bootstrap_at = time.time()
+
+    def _reset_snapshots(self):
+        self._fixtures_payload = None
+        self._live = None
+        self._fixtures = None
+        self._totals = {}
+        self._bonus = {}
+        self._odds = {}
+        self._subbed_off = {}
@@ -0,0 +1,197 @@
+"""Timing spans, per-endpoint counters and profiling hooks.
+
+One process-wide registry collects:
+
+- stage spans (bootstrap load, fixtures map, live fetch, picks fetch,
+  auto-subs, payload rendering, ...) as latency histograms
+- per-endpoint upstream counters: requests by status, latency, bytes and
+  errors, with ids folded out of the path so labels stay bounded and the
+  host as a label (a client pointed at the proxy is told apart from the
+  proxy's own calls to FPL)
+- per-endpoint proxy cache results (HIT, MISS, COALESCED, DISK)
+
+``render()`` returns the Prometheus text format that proxy_server.py serves
+on ``/metrics``.
+
+    from metrics import REGISTRY, span
+    with span('bootstrap'):
+        store = BootstrapStore.from_client(client)
+
+``profiled(path)`` wraps a block in cProfile for the CLIs, and
+``sample_stacks(seconds)`` samples every thread's stack (what
+``/metrics/profile`` returns) for a long-running server where cProfile would
+only see one thread.
+"""
+import re
+import sys
+import threading
+import time
+from collections import Counter, defaultdict
+from contextlib import contextmanager
+
+LATENCY_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30)
+SAMPLE_INTERVAL = 0.005
+ID_RE = re.compile(r'\b\d+\b')
+
+
+def endpoint_label(key):
+    """Endpoint key with query and ids folded: entry/{id}/event/{id}/picks/"""
+    return ID_RE.sub('{id}', key.split('?', 1)[0])
+
+
+def _labels(**labels):
+    return ','.join(f'{name}="{value}"' for name, value in labels.items())
+
+
+class Histogram:
+    __slots__ = ('counts', 'total', 'count')
+
+    def __init__(self):
+        self.counts = [0] * len(LATENCY_BUCKETS)
+        self.total = 0.0
+        self.count = 0
+
+    def observe(self, value):
+        self.total += value
+        self.count += 1
+        for i, bound in enumerate(LATENCY_BUCKETS):
+            if value <= bound:
+                self.counts[i] += 1
+                break
+
+    def lines(self, name, **labels):
+        cumulative = 0
+        for bound, count in zip(LATENCY_BUCKETS, self.counts):
+            cumulative += count
+            yield f'{name}_bucket{{{_labels(**labels, le=bound)}}} {cumulative}'
+        yield f'{name}_bucket{{{_labels(**labels, le="+Inf")}}} {self.count}'
+        yield f'{name}_sum{{{_labels(**labels)}}} {self.total:.6f}'
+        yield f'{name}_count{{{_labels(**labels)}}} {self.count}'
+
+
+class Registry:
+    """Thread-safe store of spans and endpoint counters"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.stages = defaultdict(Histogram)
+        self.latency = defaultdict(Histogram)
+        self.responses = Counter()
+        self.bytes = Counter()
+        self.errors = Counter()
+        self.cache = Counter()
+
+    @contextmanager
+    def span(self, stage):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            elapsed = time.perf_counter() - start
+            with self._lock:
+                self.stages[stage].observe(elapsed)
+
+    def request(self, host, key, seconds, status=None, size=0, error=None):
+        """Record one upstream call for an endpoint key"""
+        endpoint = host, endpoint_label(key)
+        with self._lock:
+            self.latency[endpoint].observe(seconds)
+            if error is not None:
+                self.errors[endpoint, type(error).__name__] += 1
+            else:
+                self.responses[endpoint, status] += 1
+                self.bytes[endpoint] += size
+
+    def cache_result(self, key, state):
+        with self._lock:
+            self.cache[endpoint_label(key), state] += 1
+
+    def render(self):
+        """All metrics in the Prometheus text exposition format"""
+        with self._lock:
+            lines = [
+                '# HELP fpl_stage_seconds Time spent in each pipeline stage',
+                '# TYPE fpl_stage_seconds histogram',
+            ]
+            for stage, histogram in sorted(self.stages.items()):
+                lines.extend(histogram.lines('fpl_stage_seconds', stage=stage))
+            lines += [
+                '# HELP fpl_upstream_request_seconds Upstream request latency by endpoint',
+                '# TYPE fpl_upstream_request_seconds histogram',
+            ]
+            for (host, endpoint), histogram in sorted(self.latency.items()):
+                lines.extend(histogram.lines('fpl_upstream_request_seconds', host=host, endpoint=endpoint))
+            lines += [
+                '# HELP fpl_upstream_responses_total Upstream responses by endpoint and status',
+                '# TYPE fpl_upstream_responses_total counter',
+            ]
+            for ((host, endpoint), status), count in sorted(self.responses.items(), key=str):
+                lines.append(f'fpl_upstream_responses_total{{{_labels(host=host, endpoint=endpoint, status=status)}}} {count}')
+            lines += [
+                '# HELP fpl_upstream_response_bytes_total Upstream body bytes by endpoint',
+                '# TYPE fpl_upstream_response_bytes_total counter',
+            ]
+            for (host, endpoint), size in sorted(self.bytes.items()):
+                lines.append(f'fpl_upstream_response_bytes_total{{{_labels(host=host, endpoint=endpoint)}}} {size}')
+            lines += [
+                '# HELP fpl_upstream_errors_total Upstream calls that raised, by endpoint and error',
+                '# TYPE fpl_upstream_errors_total counter',
+            ]
+            for ((host, endpoint), error), count in sorted(self.errors.items()):
+                lines.append(f'fpl_upstream_errors_total{{{_labels(host=host, endpoint=endpoint, error=error)}}} {count}')
+            lines += [
+                '# HELP fpl_cache_requests_total Proxy cache lookups by endpoint and result',
+                '# TYPE fpl_cache_requests_total counter',
+            ]
+            for (endpoint, state), count in sorted(self.cache.items()):
+                lines.append(f'fpl_cache_requests_total{{{_labels(endpoint=endpoint, state=state)}}} {count}')
+        return '\n'.join(lines) + '\n'
+
+    def summary(self):
+        """Stage name -> (count, mean ms, total s), for printing from the CLIs"""
+        with self._lock:
+            return {stage: (h.count, h.total / h.count * 1000 if h.count else 0, h.total) for stage, h in self.stages.items()}
+
+
+REGISTRY = Registry()
+span = REGISTRY.span
+
+
+@contextmanager
+def profiled(path=None):
+    """cProfile the block and dump stats to ``path`` (no-op when path is None)"""
+    if path is None:
+        yield
+        return
+    import cProfile
+    profiler = cProfile.Profile()
+    profiler.enable()
+    try:
+        yield
+    finally:
+        profiler.disable()
+        profiler.dump_stats(path)
+        print(f"Profile written to {path} (python3 -m pstats {path})")
+
+
+def sample_stacks(seconds, interval=SAMPLE_INTERVAL):
+    """Sample every other thread's stack; returns collapsed stacks, busiest first
+
+    Each line is ``frame;frame;frame count``, the input format of
+    flamegraph.pl and speedscope.
+    """
+    me = threading.get_ident()
+    stacks = Counter()
+    deadline = time.monotonic() + seconds
+    while time.monotonic() < deadline:
+        for thread_id, frame in sys._current_frames().items():
+            if thread_id == me:
+                continue
+            names = []
+            while frame is not None:
+                code = frame.f_code
+                names.append(f'{code.co_name} ({code.co_filename.rsplit("/", 1)[-1]}:{code.co_firstlineno})')
+                frame = frame.f_back
+            stacks[';'.join(reversed(names))] += 1
+        time.sleep(interval)
+    return '\n'.join(f'{stack} {count}' for stack, count in stacks.most_common()) + '\n'
@@ -0,0 +1,311 @@
+#!/usr/bin/env python3
+"""Host many H2H and classic leagues from one process.
+
+Each cycle fetches bootstrap (when due), live data and fixtures once, pages
+every configured league's standings (and this gameweek's H2H matches)
+concurrently, then fetches picks once per entry however many leagues the
+entry sits in, and only once per gameweek since picks are frozen at the
+deadline (with a PicksCache, across restarts too). One LiveEngine scores
+the union of entries and the totals are fanned back out into per-league
+tables, each a LiveLeagueTable that only re-ranks the entries whose totals
+changed since the last cycle.
+
+    python3 multi_league.py leagues.json --once
+
+leagues.json:
+
+    {"leagues": [
+        {"id": 1017641, "type": "h2h", "name": "Work H2H"},
+        {"id": 1549023, "type": "classic", "max_pages": 20}
+    ]}
+
+proxy_server.py --leagues leagues.json serves the results on /leagues/<id>.
+"""
+import argparse
+import asyncio
+import json
+import threading
+import time
+from collections import namedtuple
+
+from bootstrap_store import BootstrapStore
+from fpl_client import AsyncFPLClient
+from league_pages import collect, iter_classic_standings, iter_h2h_matches, iter_h2h_standings
+from live_engine import LiveEngine
+from live_rank import LiveLeagueTable
+from live_stream import diff_totals
+from metrics import REGISTRY, profiled, span
+from picks_cache import DEFAULT_PATH, PicksCache
+from poll_scheduler import PollScheduler
+from request_scheduler import AsyncRequestScheduler
+
+H2H, CLASSIC = 'h2h', 'classic'
+# Rows of each live table rendered per cycle; other entries are looked up on demand
+TABLE_ROWS = 50
+
+# Everything one refresh saw, swapped in whole so readers on other threads
+# (e.g. slim_payload.py) never mix two cycles
+Snapshot = namedtuple('Snapshot', 'cycle gameweek store live fixtures leagues picks totals bonus')
+
+
+def load_config(path):
+    """List of league dicts (id, type, name, max_pages) from a JSON config"""
+    with open(path) as f:
+        config = json.load(f)
+    leagues = []
+    for league in config['leagues']:
+        if league.get('type') not in (H2H, CLASSIC):
+            raise ValueError(f"League {league.get('id')}: type must be '{H2H}' or '{CLASSIC}'")
+        leagues.append({
+            'id': int(league['id']),
+            'type': league['type'],
+            'name': league.get('name'),
+            'max_pages': league.get('max_pages'),
+        })
+    return leagues
+
+
+class LeagueService:
+    """Refreshes every configured league, sharing fetches between them
+
+    ``results`` maps league id to the top of its latest table (``entry_row``
+    finds anyone else); ``last_cycle`` says how much work the last refresh
+    did; ``snapshot`` holds the raw inputs.
+    """
+
+    def __init__(self, client, leagues, picks_cache=None):
+        self.client = client
+        self.leagues = leagues
+        self.picks_cache = picks_cache
+        self.scheduler = PollScheduler()
+        self.gameweek = None
+        self.results = {}
+        self.last_cycle = {}
+        self.snapshot = None
+        self._store = None
+        self._bootstrap_at = 0
+        # entry id -> picks payload for self.gameweek
+        self.picks = {}
+        self._engine = None
+        self._engine_entries = None
+        self._totals = {}
+        # league id -> (standings, matches, settled) the table was built from, LiveLeagueTable
+        self._tables = {}
+        # Guards the tables between the refresh loop and entry_row callers
+        self._tables_lock = threading.Lock()
+
+    async def refresh(self):
+        started = time.perf_counter()
+        if self._store is None or time.time() - self._bootstrap_at >= self.scheduler.interval('bootstrap'):
+            with span('bootstrap'):
+                self._store = BootstrapStore(await self.client.bootstrap())
+            self._bootstrap_at = time.time()
+            if self.picks_cache is not None:
+                self.picks_cache.update_events(self._store.events)
+        store = self._store
+        gw = store.current_gw
+        if gw != self.gameweek:
+            self.gameweek = gw
+            self.picks = {}
+            self._engine = None
+            self._totals = {}
+            self._tables = {}
+
+        with span('live_and_leagues'):
+            live, fixtures, *league_data = await asyncio.gather(
+                self.client.live(gw),
+                self.client.fixtures(gw),
+                *(self._fetch_league(league, gw) for league in self.leagues),
+            )
+        self.scheduler.update(fixtures)
+
+        memberships = 0
+        entries = set()
+        for standings, matches in league_data:
+            memberships += len(standings)
+            entries.update(row['entry'] for row in standings)
+            entries.update(m[key] for m in matches for key in ('entry_1_entry', 'entry_2_entry') if m[key])
+        missing = sorted(entries - set(self.picks))
+        cached = self.picks_cache.get_picks(missing, gw) if self.picks_cache is not None and missing else {}
+        self.picks.update(cached)
+        missing = [entry_id for entry_id in missing if entry_id not in cached]
+        # Without a scheduler (e.g. behind the proxy) nothing else bounds this fan-out
+        semaphore = asyncio.Semaphore(self.client.pool_size)
+
+        async def fetch_picks(entry_id):
+            async with semaphore:
+                return await self.client.picks(entry_id, gw)
+
+        with span('picks_fetch'):
+            fetched = await asyncio.gather(*(fetch_picks(entry_id) for entry_id in missing), return_exceptions=True)
+        failed = 0
+        new_picks = {}
+        for entry_id, payload in zip(missing, fetched):
+            if isinstance(payload, Exception):
+                failed += 1
+            else:
+                new_picks[entry_id] = payload
+        self.picks.update(new_picks)
+        if self.picks_cache is not None and new_picks:
+            self.picks_cache.put_picks(gw, new_picks)
+
+        scored = frozenset(entries & set(self.picks))
+        if self._engine is None or scored != self._engine_entries:
+            with span('engine_build'):
+                self._engine = LiveEngine.from_payloads(store, {entry_id: self.picks[entry_id] for entry_id in sorted(scored)})
+            self._engine_entries = scored
+        with span('score'):
+            totals = self._engine.totals_by_entry(self._engine.score(live, fixtures)['totals'])
+
+        # H2H standings include the gameweek's results once it has finished
+        settled = any(event['id'] == gw and event.get('finished') for event in store.events)
+        with span('live_rank'), self._tables_lock:
+            changed = diff_totals(self._totals, totals)
+            tables = {}
+            for league, data in zip(self.leagues, league_data):
+                built_from, table = self._tables.get(league['id'], (None, None))
+                if built_from != (*data, settled):
+                    table = LiveLeagueTable(league['type'], *data, settled=settled)
+                    table.update(totals)
+                else:
+                    table.update(changed)
+                tables[league['id']] = ((*data, settled), table)
+            self._tables, self._totals = tables, totals
+
+        with span('render_payload'), self._tables_lock:
+            self.results = {
+                league['id']: summarise(league, gw, tables[league['id']][1], matches, totals)
+                for league, (_, matches) in zip(self.leagues, league_data)
+            }
+        self.snapshot = Snapshot(
+            (self.snapshot.cycle + 1) if self.snapshot else 1, gw, store, live, fixtures,
+            {league['id']: data for league, data in zip(self.leagues, league_data)}, dict(self.picks), totals,
+            self._engine.bonus.by_element(),
+        )
+        self.last_cycle = {
+            'gameweek': gw,
+            'leagues': len(self.leagues),
+            'memberships': memberships,
+            'entries': len(entries),
+            'picks_cached': len(cached),
+            'picks_fetched': len(missing) - failed,
+            'picks_failed': failed,
+            'seconds': round(time.perf_counter() - started, 3),
+        }
+        return self.results
+
+    def entry_row(self, league_id, entry_id):
+        """One entry's live table row from the latest cycle, or None"""
+        with self._tables_lock:
+            _, table = self._tables.get(league_id, (None, None))
+            if table is None or entry_id not in table.standings:
+                return None
+            return table_row(table, table.row(entry_id), self._totals)
+
+    async def _fetch_league(self, league, gw):
+        """(standings rows, this gameweek's H2H matches) for one league"""
+        if league['type'] == H2H:
+            return await asyncio.gather(
+                collect(iter_h2h_standings(self.client, league['id'], max_pages=league['max_pages'])),
+                collect(iter_h2h_matches(self.client, league['id'], event=gw)),
+            )
+        return await collect(iter_classic_standings(self.client, league['id'], max_pages=league['max_pages'])), []
+
+    async def run(self):
+        while True:
+            try:
+                await self.refresh()
+            except Exception as error:
+                print(f"League refresh failed: {error}")
+            await asyncio.sleep(self.scheduler.interval('live'))
+
+
+def table_row(table, live_row, totals):
+    """Standings row merged with its LiveLeagueTable live row"""
+    row = table.standings[live_row['entry']]
+    return {
+        'entry': row['entry'],
+        'entry_name': row['entry_name'],
+        'player_name': row['player_name'],
+        'rank': row['rank'],
+        'total': row['total'],
+        'live_points': totals.get(row['entry']),
+        **{key: value for key, value in live_row.items() if key not in ('entry', 'live_points', 'total')},
+    }
+
+
+def summarise(league, gw, table, matches, totals, rows=TABLE_ROWS):
+    """The top ``rows`` of a league's table in live rank order"""
+    summary = {
+        'id': league['id'], 'type': league['type'], 'name': league['name'], 'gameweek': gw,
+        'entries': len(table.standings),
+        'standings': [table_row(table, live_row, totals) for live_row in table.top(rows)],
+    }
+    if league['type'] == H2H:
+        summary['matches'] = [{
+            'entry_1': m['entry_1_entry'],
+            'entry_2': m['entry_2_entry'],
+            'points_1': totals.get(m['entry_1_entry']),
+            'points_2': totals.get(m['entry_2_entry']),
+        } for m in matches]
+    return summary
+
+
+def start_service(leagues, picks_cache=None, **client_kwargs):
+    """Run a LeagueService on its own event loop thread; returns the service"""
+    service = LeagueService(None, leagues, picks_cache)
+
+    async def main():
+        async with AsyncFPLClient(**client_kwargs) as client:
+            service.client = client
+            await service.run()
+
+    threading.Thread(target=asyncio.run, args=(main(),), daemon=True).start()
+    return service
+
+
+async def run_once(leagues, rate, burst, picks_cache):
+    async with AsyncFPLClient(scheduler=AsyncRequestScheduler(rate, burst)) as client:
+        service = LeagueService(client, leagues, picks_cache)
+        await service.refresh()
+        return service
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Live tables for several leagues with shared fetches')
+    parser.add_argument('config', help='JSON file listing leagues')
+    parser.add_argument('--once', action='store_true', help='Refresh once, print the tables and exit')
+    parser.add_argument('--rate', type=float, default=10, help='Upstream requests per second')
+    parser.add_argument('--burst', type=int, default=20)
+    parser.add_argument('--picks-cache', default=DEFAULT_PATH, help='SQLite picks cache (empty string disables)')
+    parser.add_argument('--profile', metavar='PATH', help='With --once, write cProfile stats for the refresh here')
+    args = parser.parse_args()
+    leagues = load_config(args.config)
+    picks_cache = PicksCache(args.picks_cache) if args.picks_cache else None
+
+    if not args.once:
+        async def forever():
+            async with AsyncFPLClient(scheduler=AsyncRequestScheduler(args.rate, args.burst)) as client:
+                await LeagueService(client, leagues, picks_cache).run()
+        asyncio.run(forever())
+        return
+
+    with profiled(args.profile):
+        service = asyncio.run(run_once(leagues, args.rate, args.burst, picks_cache))
+    cycle = service.last_cycle
+    print(f"GW{cycle['gameweek']}: {cycle['leagues']} leagues, {cycle['memberships']} memberships, "
+          f"{cycle['entries']} distinct entries, {cycle['picks_cached']} picks cached, "
+          f"{cycle['picks_fetched']} fetched in {cycle['seconds']}s")
+    for summary in service.results.values():
+        print(f"\n{summary['name'] or summary['id']} ({summary['type']})")
+        for row in summary['standings'][:10]:
+            live = '-' if row['live_points'] is None else row['live_points']
+            print(f"{row['live_rank']:4} {row['movement']:+3d} {row['entry_name'][:25]:<25} {row['total']:5} {live:>4}")
+
+    print("\nStage timings")
+    for stage, (count, mean_ms, total) in sorted(REGISTRY.summary().items(), key=lambda item: -item[1][2]):
+        print(f"{stage:<18} {count:4}x {mean_ms:9.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
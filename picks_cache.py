@@ -0,0 +1,211 @@
+#!/usr/bin/env python3
+"""Persistent SQLite cache of entry picks and metadata per gameweek.
+
+Picks (with entry_history and the active chip) for ``entry/{id}/event/{gw}/picks/``
+and ``entry/{id}/`` metadata are stored by (entry, gameweek) as the raw JSON
+bodies. Gameweek deadlines and bonus confirmation come from bootstrap
+``events`` and are stored too, so after a restart the cache can tell on its
+own which rows are final:
+
+- picks fetched after the gameweek deadline never change (the running
+  points in entry_history go stale, but the scoring only reads picks, chip
+  and transfer cost, which are fixed at the deadline)
+- entry metadata fetched after the gameweek's data was checked and before
+  the next deadline is that gameweek's closing state
+
+Anything else is served for a short TTL like the proxy's. A warm refresh of
+a league therefore makes no picks requests at all.
+
+    python3 picks_cache.py fpl_cache.sqlite3
+"""
+import json
+import os
+import re
+import sqlite3
+import sys
+import threading
+import time
+from datetime import datetime
+
+DEFAULT_PATH = os.environ.get('FPL_PICKS_CACHE', 'fpl_cache.sqlite3')
+PICKS_TTL = 60
+ENTRY_TTL = 300
+# Bound on host parameters per query (older SQLite builds allow 999)
+QUERY_CHUNK = 500
+
+PICKS_RE = re.compile(r'^entry/(\d+)/event/(\d+)/picks/$')
+ENTRY_RE = re.compile(r'^entry/(\d+)/$')
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS events (
+    gw INTEGER PRIMARY KEY,
+    deadline REAL,
+    data_checked INTEGER NOT NULL DEFAULT 0
+);
+CREATE TABLE IF NOT EXISTS picks (
+    entry INTEGER NOT NULL,
+    gw INTEGER NOT NULL,
+    body TEXT NOT NULL,
+    fetched_at REAL NOT NULL,
+    PRIMARY KEY (entry, gw)
+);
+CREATE TABLE IF NOT EXISTS entries (
+    entry INTEGER NOT NULL,
+    gw INTEGER NOT NULL,
+    body TEXT NOT NULL,
+    fetched_at REAL NOT NULL,
+    PRIMARY KEY (entry, gw)
+);
+"""
+
+
+def parse_deadline(value):
+    return datetime.fromisoformat(value.replace('Z', '+00:00')).timestamp() if value else None
+
+
+class PicksCache:
+    """Thread-safe store of picks and entry bodies keyed by (entry, gameweek)"""
+
+    def __init__(self, path=DEFAULT_PATH):
+        self.path = path
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(path, check_same_thread=False)
+        self._db.execute('PRAGMA journal_mode=WAL')
+        self._db.execute('PRAGMA synchronous=NORMAL')
+        self._db.executescript(SCHEMA)
+        self._events = {}
+        self._load_events()
+        self.hits = 0
+        self.misses = 0
+
+    def _load_events(self):
+        rows = self._db.execute('SELECT gw, deadline, data_checked FROM events').fetchall()
+        self._events = {gw: (deadline, bool(checked)) for gw, deadline, checked in rows}
+
+    def update_events(self, events):
+        """Record deadlines and data_checked flags from bootstrap ``events``"""
+        rows = [(event['id'], parse_deadline(event.get('deadline_time')), int(bool(event.get('data_checked'))))
+                for event in events]
+        with self._lock, self._db:
+            self._db.executemany('INSERT OR REPLACE INTO events VALUES (?, ?, ?)', rows)
+            self._load_events()
+
+    def current_gw(self, now=None):
+        """Latest gameweek whose deadline has passed"""
+        now = time.time() if now is None else now
+        passed = [gw for gw, (deadline, _) in self._events.items() if deadline is not None and deadline <= now]
+        return max(passed, default=None)
+
+    def picks_final(self, gw, fetched_at):
+        deadline = self._events.get(gw, (None, False))[0]
+        return deadline is not None and fetched_at >= deadline
+
+    def entry_final(self, gw, fetched_at):
+        checked = self._events.get(gw, (None, False))[1]
+        next_deadline = self._events.get(gw + 1, (None, False))[0]
+        return checked and (next_deadline is None or fetched_at < next_deadline)
+
+    def _get(self, table, entry_ids, gw, final, ttl):
+        now = time.time()
+        wanted = list(dict.fromkeys(entry_ids))
+        rows = []
+        with self._lock:
+            for start in range(0, len(wanted), QUERY_CHUNK):
+                chunk = wanted[start:start + QUERY_CHUNK]
+                rows += self._db.execute(
+                    f'SELECT entry, body, fetched_at FROM {table} WHERE gw = ? AND entry IN ({",".join("?" * len(chunk))})',
+                    (gw, *chunk),
+                ).fetchall()
+            found = {entry_id: body for entry_id, body, fetched_at in rows
+                     if final(gw, fetched_at) or now - fetched_at < ttl}
+            self.hits += len(found)
+            self.misses += len(wanted) - len(found)
+        return found
+
+    def _put(self, table, gw, bodies):
+        now = time.time()
+        with self._lock, self._db:
+            self._db.executemany(
+                f'INSERT OR REPLACE INTO {table} VALUES (?, ?, ?, ?)',
+                [(entry_id, gw, body, now) for entry_id, body in bodies.items()],
+            )
+
+    def get_picks(self, entry_ids, gw):
+        """{entry_id: picks payload} for the requested entries still usable"""
+        return {entry_id: json.loads(body) for entry_id, body in self._get('picks', entry_ids, gw, self.picks_final, PICKS_TTL).items()}
+
+    def put_picks(self, gw, payloads):
+        self._put('picks', gw, {entry_id: json.dumps(payload) for entry_id, payload in payloads.items()})
+
+    def get_entries(self, entry_ids, gw):
+        return {entry_id: json.loads(body) for entry_id, body in self._get('entries', entry_ids, gw, self.entry_final, ENTRY_TTL).items()}
+
+    def put_entries(self, gw, payloads):
+        self._put('entries', gw, {entry_id: json.dumps(payload) for entry_id, payload in payloads.items()})
+
+    def _endpoint(self, key):
+        """(table, entry_id, gw) for a cacheable endpoint key, else None"""
+        match = PICKS_RE.match(key)
+        if match:
+            return 'picks', int(match.group(1)), int(match.group(2))
+        match = ENTRY_RE.match(key)
+        if match:
+            gw = self.current_gw()
+            if gw is not None:
+                return 'entries', int(match.group(1)), gw
+        return None
+
+    def lookup(self, key):
+        """Raw JSON body for an endpoint key if cached and usable, else None"""
+        endpoint = self._endpoint(key)
+        if endpoint is None:
+            return None
+        table, entry_id, gw = endpoint
+        final, ttl = (self.picks_final, PICKS_TTL) if table == 'picks' else (self.entry_final, ENTRY_TTL)
+        return self._get(table, [entry_id], gw, final, ttl).get(entry_id)
+
+    def save(self, key, body):
+        """Store a raw JSON body fetched for an endpoint key (ignored if not cacheable)"""
+        endpoint = self._endpoint(key)
+        if endpoint is not None:
+            table, entry_id, gw = endpoint
+            self._put(table, gw, {entry_id: body if isinstance(body, str) else body.decode()})
+
+    def stats(self):
+        with self._lock:
+            counts = {table: self._db.execute(f'SELECT COUNT(*) FROM {table}').fetchone()[0] for table in ('picks', 'entries')}
+        return {'hits': self.hits, 'misses': self.misses, 'events': len(self._events), **counts}
+
+    def picks_by_gameweek(self):
+        """[(gw, rows, oldest fetched_at)] for the stored picks"""
+        with self._lock:
+            return self._db.execute('SELECT gw, COUNT(*), MIN(fetched_at) FROM picks GROUP BY gw ORDER BY gw').fetchall()
+
+    def close(self):
+        with self._lock:
+            self._db.close()
+
+
+def cached_picks(client, cache, entry_ids, gw):
+    """Picks for every entry, fetching only what the cache can't answer"""
+    payloads = cache.get_picks(entry_ids, gw) if cache is not None else {}
+    missing = [entry_id for entry_id in entry_ids if entry_id not in payloads]
+    if missing:
+        fetched = dict(zip(missing, client.get_many([f'entry/{entry_id}/event/{gw}/picks/' for entry_id in missing])))
+        if cache is not None:
+            cache.put_picks(gw, fetched)
+        payloads.update(fetched)
+    return {entry_id: payloads[entry_id] for entry_id in entry_ids}
+
+
+def main():
+    cache = PicksCache(sys.argv[1] if len(sys.argv) > 1 else DEFAULT_PATH)
+    stats = cache.stats()
+    print(f"{cache.path}: {stats['picks']} picks, {stats['entries']} entries, {stats['events']} gameweeks")
+    for gw, count, oldest in cache.picks_by_gameweek():
+        state = 'final' if cache.picks_final(gw, oldest) else 'provisional'
+        print(f"GW{gw:>2}: {count:6} picks ({state})")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,222 @@
+#!/usr/bin/env python3
+"""Player done / didn't-play / bonus-pending rules, replayed over a season.
+
+``classify()`` is the scalar reference for the rules the app applies to each
+pick (app.js, fplllm.js) and live_engine.player_status applies as arrays:
+
+1. whistle blown (finished or finished_provisional) -> done, and didn't
+   play with no minutes
+2. red card -> done
+3. a starter more than SUB_MARGIN minutes behind the match clock -> subbed
+   off, so done (an EventTimeline's subbed-off set replaces the guess)
+4. optionally, no minutes once the clock passes ``unused_after`` -> an
+   unused sub, so done and didn't play (off by default, as in the app)
+
+The rules were tuned by eye on a single gameweek. ``replay`` checks them
+against fpl_replay.py archives instead: every recorded live/fixtures
+snapshot of every gameweek is classified and compared with how the
+gameweek actually ended, one gameweek per worker process.
+
+- done is right if the player's minutes and non-bonus points no longer
+  change after the snapshot
+- didn't play is right if they finish the gameweek without minutes
+- bonus pending is right if their bonus still changes after the snapshot
+
+Only players whose fixture has kicked off are counted, and only teams
+whose fixture finished within the recording.
+
+    python3 player_status.py archive/gw*
+    python3 player_status.py archive/gw* --sub-margin 3 --unused-after 80
+"""
+import argparse
+import os
+import re
+import time
+from collections import Counter, namedtuple
+
+SUB_MARGIN = 5
+
+Rules = namedtuple('Rules', 'sub_margin unused_after')
+DEFAULT_RULES = Rules(SUB_MARGIN, None)
+
+LABELS = ('done', 'didnt_play', 'bonus_pending')
+LIVE_RE = re.compile(r'^event/(\d+)/live/$')
+
+
+def fixtures_by_team(fixtures):
+    """team id -> fixture; the later fixture wins in a double gameweek, as in the app"""
+    by_team = {}
+    for fixture in fixtures:
+        by_team[fixture['team_h']] = fixture
+        by_team[fixture['team_a']] = fixture
+    return by_team
+
+
+def classify(stats, fixture, subbed_off=None, rules=DEFAULT_RULES):
+    """Status flags for one player's live stats against their team's fixture
+
+    Returns done, didnt_play, in_progress and bonus_pending, plus ``rule``:
+    which rule marked the player done ('whistle', 'red_card', 'subbed_off',
+    'unused') or None. ``subbed_off`` is True/False from an event timeline,
+    or None to guess from the clock.
+    """
+    status = {'done': False, 'didnt_play': False, 'in_progress': False, 'bonus_pending': False, 'rule': None}
+    if not fixture:
+        return status
+    game_minutes = fixture.get('minutes') or 0
+    minutes = stats.get('minutes') or 0
+    status['in_progress'] = bool(fixture['started'] and not fixture['finished_provisional'])
+    status['bonus_pending'] = bool(fixture['finished_provisional'] and not fixture['finished'] and minutes > 0)
+
+    if subbed_off is None:
+        subbed_off = 0 < minutes < game_minutes - rules.sub_margin and (stats.get('starts') or 0) > 0
+    if fixture['finished'] or fixture['finished_provisional']:
+        status.update(done=True, didnt_play=minutes == 0, rule='whistle')
+    elif (stats.get('red_cards') or 0) > 0:
+        status.update(done=True, rule='red_card')
+    elif subbed_off:
+        status.update(done=True, rule='subbed_off')
+    elif rules.unused_after is not None and fixture['started'] and minutes == 0 and game_minutes >= rules.unused_after:
+        status.update(done=True, didnt_play=True, rule='unused')
+    return status
+
+
+def _stats_by_element(live):
+    return {element['id']: element['stats'] for element in live['elements']} if live else {}
+
+
+def replay_gameweek(root, gw, rules=DEFAULT_RULES):
+    """Score the rules on every recorded snapshot of one gameweek in an archive
+
+    Runs in a worker process, so takes and returns plain picklable values.
+    """
+    from bootstrap_store import BootstrapStore
+    from fpl_client import endpoint_path
+    from fpl_replay import Archive
+
+    started = time.perf_counter()
+    archive = Archive(root)
+    live_path = f'event/{gw}/live/'
+    fixtures_path = endpoint_path('fixtures/', {'event': gw})
+    moments = sorted(set(archive.times(live_path)) | set(archive.times(fixtures_path)))
+    result = {'root': root, 'gw': gw, 'snapshots': len(moments), 'players': 0,
+              'counts': Counter(), 'false_done': Counter(), 'seconds': 0.0}
+    if not moments:
+        return result
+
+    # Bodies are content-addressed, so each distinct one is decoded once
+    decoded = {}
+
+    def body_at(path, t):
+        digest = archive.lookup(path, t)
+        if digest is not None and digest not in decoded:
+            decoded[digest] = archive.at(path, t)
+        return decoded.get(digest)
+
+    store = BootstrapStore(archive.at('bootstrap-static/', moments[0]))
+    final_fixtures = fixtures_by_team(body_at(fixtures_path, moments[-1]) or [])
+    final = _stats_by_element(body_at(live_path, moments[-1]))
+    teams = {team_id for team_id, fixture in final_fixtures.items() if fixture['finished']}
+    elements = [element_id for element_id in final if store.present[element_id] and int(store.team[element_id]) in teams]
+    result['players'] = len(elements)
+
+    counts = result['counts']
+    for t in moments:
+        fixtures = fixtures_by_team(body_at(fixtures_path, t) or [])
+        stats = _stats_by_element(body_at(live_path, t))
+        for element_id in elements:
+            fixture = fixtures.get(int(store.team[element_id]))
+            if not fixture or not fixture['started']:
+                continue
+            now = stats.get(element_id, {})
+            end = final[element_id]
+            status = classify(now, fixture, rules=rules)
+            minutes = now.get('minutes') or 0
+            bonus = now.get('bonus') or 0
+            truth = {
+                'done': minutes == end['minutes'] and (now.get('total_points') or 0) - bonus == end['total_points'] - end['bonus'],
+                'didnt_play': end['minutes'] == 0,
+                'bonus_pending': bonus != end['bonus'],
+            }
+            for label in LABELS:
+                counts[label, status[label], truth[label]] += 1
+            if status['done'] and not truth['done']:
+                result['false_done'][status['rule']] += 1
+    result['seconds'] = time.perf_counter() - started
+    return result
+
+
+def archive_gameweeks(root):
+    """Gameweeks with recorded live data in an archive"""
+    from fpl_replay import Archive
+    return sorted(int(match.group(1)) for match in map(LIVE_RE.match, Archive(root).paths) if match)
+
+
+def scores(counts, label):
+    """(precision, recall, accuracy) from (label, predicted, actual) counts"""
+    tp = counts[label, True, True]
+    fp = counts[label, True, False]
+    fn = counts[label, False, True]
+    total = tp + fp + fn + counts[label, False, False]
+    return (
+        tp / (tp + fp) if tp + fp else None,
+        tp / (tp + fn) if tp + fn else None,
+        (total - fp - fn) / total if total else None,
+    )
+
+
+def _pct(value):
+    return '    -' if value is None else f'{value * 100:5.1f}'
+
+
+def replay(roots, rules=DEFAULT_RULES, workers=None):
+    """Per-gameweek results for every gameweek in the archives, in parallel"""
+    from concurrent.futures import ProcessPoolExecutor
+
+    tasks = [(root, gw) for root in roots for gw in archive_gameweeks(root)]
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        futures = [pool.submit(replay_gameweek, root, gw, rules) for root, gw in tasks]
+        return [future.result() for future in futures]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Replay recorded gameweeks to score the player done/didn't-play/bonus rules")
+    parser.add_argument('archives', nargs='+', help='fpl_replay.py archive directories')
+    parser.add_argument('--sub-margin', type=int, default=SUB_MARGIN, help='Minutes behind the clock before a starter counts as subbed off')
+    parser.add_argument('--unused-after', type=int, help='Game minute after which a player without minutes counts as unused')
+    parser.add_argument('--workers', type=int, default=os.cpu_count(), help='Worker processes')
+    args = parser.parse_args()
+    rules = Rules(args.sub_margin, args.unused_after)
+
+    wall = time.perf_counter()
+    results = replay(args.archives, rules, args.workers)
+    wall = time.perf_counter() - wall
+    if not results:
+        print("No recorded gameweeks found")
+        return
+
+    print(f"Rules: sub margin {rules.sub_margin}, unused after {rules.unused_after or '-'}")
+    print(f"{'GW':>4} {'snaps':>6} {'players':>7}   {'done P/R/acc':^17}   {'didnt play P/R':^11}   {'bonus P/R':^11} {'secs':>6}")
+    total = Counter()
+    false_done = Counter()
+    for result in sorted(results, key=lambda r: (r['gw'], r['root'])):
+        total.update(result['counts'])
+        false_done.update(result['false_done'])
+        done = ' '.join(map(_pct, scores(result['counts'], 'done')))
+        didnt_play = ' '.join(map(_pct, scores(result['counts'], 'didnt_play')[:2]))
+        bonus = ' '.join(map(_pct, scores(result['counts'], 'bonus_pending')[:2]))
+        print(f"{result['gw']:>4} {result['snapshots']:>6} {result['players']:>7}   {done}   {didnt_play}   {bonus} {result['seconds']:6.2f}")
+
+    print()
+    for label in LABELS:
+        precision, recall, accuracy = scores(total, label)
+        print(f"{label:<14} precision {_pct(precision)}%  recall {_pct(recall)}%  accuracy {_pct(accuracy)}%")
+    if false_done:
+        print("Wrongly done by rule: " + ', '.join(f"{rule} {count}" for rule, count in false_done.most_common()))
+    busy = sum(result['seconds'] for result in results)
+    print(f"\n{len(results)} gameweeks, {sum(r['snapshots'] for r in results)} snapshots in {wall:.2f}s "
+          f"({busy:.2f}s across {args.workers} workers)")
+
+
+if __name__ == "__main__":
+    main()
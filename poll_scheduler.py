@@ -0,0 +1,108 @@
+"""Fixture-aware polling intervals.
+
+Upstream data only moves while matches are on, so how often an endpoint is
+worth polling follows the gameweek's fixtures:
+
+- idle: nothing on for a while; hours between polls
+- pre_match: a kickoff is close; minutes, so lineups and kickoff are caught
+- live: a match is in play; seconds for live and fixtures
+- bonus: full time but bonus not yet confirmed; a short burst of fast polls
+  right after the whistle, then a slower watch until ``finished`` flips
+
+The scheduler never sleeps past the next kickoff, nor past the next
+gameweek's deadline (from bootstrap ``events``), so the new gameweek is
+picked up before its first match. fplllm.js mirrors these rules in
+``nextRefreshDelay``.
+
+    scheduler = PollScheduler()
+    scheduler.update_events(bootstrap['events'])
+    scheduler.update(fixtures)
+    time.sleep(scheduler.interval('live'))
+"""
+import time
+from datetime import datetime
+
+IDLE, PRE_MATCH, LIVE, BONUS_BURST, BONUS = 'idle', 'pre_match', 'live', 'bonus_burst', 'bonus'
+
+# Seconds between polls of each endpoint in each phase
+ENDPOINT_INTERVALS = {
+    'live': {IDLE: 3600, PRE_MATCH: 300, LIVE: 20, BONUS_BURST: 15, BONUS: 120},
+    'fixtures': {IDLE: 3600, PRE_MATCH: 300, LIVE: 30, BONUS_BURST: 15, BONUS: 120},
+    'standings': {IDLE: 6 * 3600, PRE_MATCH: 1800, LIVE: 120, BONUS_BURST: 60, BONUS: 300},
+    'bootstrap': {IDLE: 6 * 3600, PRE_MATCH: 1800, LIVE: 600, BONUS_BURST: 600, BONUS: 600},
+}
+PRE_MATCH_WINDOW = 30 * 60
+BURST_WINDOW = 20 * 60
+# However close the next kickoff, don't poll faster than this while waiting for it
+MIN_INTERVAL = 10
+# Past the deadline bootstrap may lag before the next gameweek becomes current
+DEADLINE_RETRY = 60
+
+
+def parse_kickoff(value):
+    return datetime.fromisoformat(value.replace('Z', '+00:00')).timestamp() if value else None
+
+
+class PollScheduler:
+    """Tracks the gameweek's fixtures and answers how long to wait per endpoint"""
+
+    def __init__(self, intervals=ENDPOINT_INTERVALS):
+        self.intervals = intervals
+        # Until fixtures have been seen, poll as if a match were on
+        self.phase = LIVE
+        self.next_kickoff = None
+        self.next_deadline = None
+        # fixture id -> when it was first seen provisionally finished
+        self._whistles = {}
+
+    def update(self, fixtures, now=None):
+        """Recompute the phase from a fixtures payload; returns it"""
+        now = time.time() if now is None else now
+        in_play = burst = bonus = False
+        upcoming = []
+        for fixture in fixtures:
+            if fixture.get('finished'):
+                self._whistles.pop(fixture['id'], None)
+                continue
+            if fixture.get('finished_provisional'):
+                whistle = self._whistles.setdefault(fixture['id'], now)
+                burst |= now - whistle < BURST_WINDOW
+                bonus = True
+            elif fixture.get('started'):
+                in_play = True
+            else:
+                kickoff = parse_kickoff(fixture.get('kickoff_time'))
+                if kickoff is not None:
+                    upcoming.append(kickoff)
+
+        self.next_kickoff = min(upcoming, default=None)
+        if in_play:
+            self.phase = LIVE
+        elif burst:
+            self.phase = BONUS_BURST
+        elif bonus:
+            self.phase = BONUS
+        elif self.next_kickoff is not None and self.next_kickoff - now <= PRE_MATCH_WINDOW:
+            self.phase = PRE_MATCH
+        else:
+            self.phase = IDLE
+        return self.phase
+
+    def update_events(self, events):
+        """Note the next gameweek's deadline from bootstrap ``events``"""
+        upcoming = next((event for event in events if event.get('is_next')), None)
+        self.next_deadline = parse_kickoff(upcoming.get('deadline_time')) if upcoming else None
+
+    def interval(self, endpoint, now=None):
+        """Seconds to wait before polling ``endpoint`` again"""
+        now = time.time() if now is None else now
+        seconds = self.intervals[endpoint][self.phase]
+        if self.next_deadline is not None:
+            until_deadline = self.next_deadline - now
+            seconds = min(seconds, max(until_deadline, MIN_INTERVAL) if until_deadline > 0 else DEADLINE_RETRY)
+        if self.next_kickoff is None:
+            return seconds
+        if self.next_kickoff > now:
+            return min(seconds, max(self.next_kickoff - now, MIN_INTERVAL))
+        # Kickoff time has passed but the match isn't marked started yet
+        return min(seconds, self.intervals[endpoint][LIVE])
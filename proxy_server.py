@@ -0,0 +1,434 @@
+#!/usr/bin/env python3
+"""Static file server plus caching FPL API proxy for the PWA.
+
+Run this instead of ``python3 -m http.server``. Static files are served from
+this directory and ``/api/<endpoint>`` is forwarded to FPL_BASE_URL through a
+shared in-memory cache:
+
+- each endpoint has its own TTL (bootstrap long, live data short, picks for a
+  gameweek whose deadline has passed effectively forever)
+- concurrent requests for the same uncached key wait on a single upstream call
+- bodies are held gzip-compressed in an LRU bounded by total bytes
+- picks and entry bodies are also written to a SQLite PicksCache, so a
+  restart doesn't refetch picks that were frozen at the deadline
+- upstream calls go through one RequestScheduler (token bucket, live data
+  ahead of picks ahead of history, backoff on 429/5xx), so a browser fanning
+  out a request per team can't get us throttled
+
+``/stream`` is a Server-Sent Events feed of live deltas for one H2H league
+(see live_stream.py). ``/scheduler`` reports upstream queue depth and waits.
+With ``--leagues leagues.json``, ``/leagues/<id>`` serves the top of the live
+table for every configured league (see multi_league.py), fetched through this
+proxy's cache, ``/leagues/<id>?entry=<entry id>`` one entry's live row,
+and ``/slim/<id>`` the compact payload the app loads them from
+(slim_payload.py), with its static parts on immutable ``/slim/fragment/<hash>``.
+``/metrics`` exposes stage timings, upstream and cache counters for Prometheus;
+``/metrics/profile?seconds=10`` samples every thread's stack (metrics.py).
+"""
+import argparse
+import gzip
+import json
+import os
+import re
+import threading
+import time
+from collections import OrderedDict
+from datetime import datetime, timezone
+from http.server import SimpleHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlsplit
+
+from fpl_client import FPLClient
+from live_stream import Broadcaster, LivePoller, serve_sse
+from metrics import REGISTRY, sample_stacks
+from multi_league import load_config, start_service
+from picks_cache import DEFAULT_PATH as PICKS_CACHE_PATH, PicksCache
+from slim_payload import SlimPayloads
+from request_scheduler import RequestScheduler
+
+STATIC_DIR = os.path.dirname(os.path.abspath(__file__))
+API_PREFIX = '/api/'
+STREAM_PATH = '/stream'
+SCHEDULER_PATH = '/scheduler'
+LEAGUES_PATH = '/leagues'
+METRICS_PATH = '/metrics'
+SLIM_PREFIX = '/slim/'
+FRAGMENT_PREFIX = '/slim/fragment/'
+PROFILE_PATH = '/metrics/profile'
+MAX_PROFILE_SECONDS = 60
+
+# Seconds each endpoint stays fresh. First matching pattern wins.
+IMMUTABLE_TTL = 7 * 24 * 3600
+ENDPOINT_TTLS = [
+    (re.compile(r'^bootstrap-static/'), 600),
+    (re.compile(r'^event/\d+/live/'), 15),
+    (re.compile(r'^fixtures/'), 30),
+    (re.compile(r'^entry/\d+/event/\d+/picks/'), 60),
+    (re.compile(r'^entry/\d+/history/'), 300),
+    (re.compile(r'^entry/\d+/'), 300),
+    (re.compile(r'^leagues-'), 60),
+]
+DEFAULT_TTL = 60
+# While the live poller runs, these follow its fixture-aware schedule instead
+SCHEDULED_TTLS = [
+    (re.compile(r'^bootstrap-static/'), 'bootstrap'),
+    (re.compile(r'^event/\d+/live/'), 'live'),
+    (re.compile(r'^fixtures/'), 'fixtures'),
+    (re.compile(r'^leagues-'), 'standings'),
+]
+PICKS_RE = re.compile(r'^entry/\d+/event/(\d+)/picks/')
+
+
+class CacheEntry:
+    __slots__ = ('body', 'status', 'etag', 'last_modified', 'expires')
+
+    def __init__(self, body, status, etag, last_modified, expires):
+        self.body = body  # gzip-compressed
+        self.status = status
+        self.etag = etag
+        self.last_modified = last_modified
+        self.expires = expires
+
+    @property
+    def size(self):
+        return len(self.body)
+
+
+class ProxyCache:
+    """Byte-bounded LRU of upstream responses with request coalescing"""
+
+    def __init__(self, client, max_bytes=64 * 1024 * 1024, picks_cache=None):
+        self.client = client
+        self.max_bytes = max_bytes
+        self.picks_cache = picks_cache
+        self.total_bytes = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self._inflight = {}
+        self._deadlines = {}
+        self.scheduler = None
+
+    def ttl_for(self, key):
+        match = PICKS_RE.match(key)
+        if match:
+            deadline = self._deadlines.get(int(match.group(1)))
+            if deadline and deadline <= datetime.now(timezone.utc):
+                return IMMUTABLE_TTL
+        if self.scheduler is not None:
+            for pattern, endpoint in SCHEDULED_TTLS:
+                if pattern.match(key):
+                    return self.scheduler.interval(endpoint)
+        for pattern, ttl in ENDPOINT_TTLS:
+            if pattern.match(key):
+                return ttl
+        return DEFAULT_TTL
+
+    def get(self, key):
+        """Return (entry, cache_state) for an endpoint key, fetching if stale"""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry and entry.expires > time.time():
+                self._entries.move_to_end(key)
+                return entry, 'HIT'
+            waiter = self._inflight.get(key)
+            if waiter is None:
+                waiter = self._inflight[key] = threading.Event()
+                leader = True
+            else:
+                leader = False
+
+        if not leader:
+            waiter.wait()
+            with self._lock:
+                entry = self._entries.get(key)
+            if entry is not None:
+                return entry, 'COALESCED'
+            # The leader failed and had nothing stale to fall back on
+            return self.get(key)
+
+        try:
+            loaded = self._load(key) if entry is None else None
+            if loaded is not None:
+                return loaded, 'DISK'
+            entry = self._fetch(key, entry)
+            return entry, 'MISS'
+        finally:
+            with self._lock:
+                del self._inflight[key]
+            waiter.set()
+
+    def _load(self, key):
+        """Entry rebuilt from the persistent picks cache, or None"""
+        body = self.picks_cache.lookup(key) if self.picks_cache is not None else None
+        if body is None:
+            return None
+        entry = CacheEntry(gzip.compress(body.encode(), compresslevel=5), 200, None, None, time.time() + self.ttl_for(key))
+        self._store(key, entry)
+        return entry
+
+    def _fetch(self, key, stale):
+        headers = {}
+        if stale is not None:
+            if stale.etag:
+                headers['If-None-Match'] = stale.etag
+            if stale.last_modified:
+                headers['If-Modified-Since'] = stale.last_modified
+        try:
+            response = self.client.send(key, lambda: self.client.session.get(
+                self.client.url(key), headers=headers, timeout=self.client.timeout), headers)
+        except Exception:
+            if stale is not None:
+                return stale
+            raise
+
+        ttl = self.ttl_for(key)
+        if response.status_code == 304 and stale is not None:
+            stale.expires = time.time() + ttl
+            with self._lock:
+                if key in self._entries:
+                    self._entries.move_to_end(key)
+            return stale
+        if response.status_code >= 500 and stale is not None:
+            return stale
+
+        if response.ok and key.startswith('bootstrap-static/'):
+            self._record_deadlines(response.content)
+        if response.status_code == 200 and self.picks_cache is not None:
+            self.picks_cache.save(key, response.content)
+        # Errors are cached briefly so a missing entry doesn't stampede upstream
+        if not response.ok:
+            ttl = min(ttl, 10)
+        entry = CacheEntry(
+            gzip.compress(response.content, compresslevel=5),
+            response.status_code,
+            response.headers.get('ETag'),
+            response.headers.get('Last-Modified'),
+            time.time() + ttl,
+        )
+        self._store(key, entry)
+        return entry
+
+    def _store(self, key, entry):
+        with self._lock:
+            old = self._entries.pop(key, None)
+            if old is not None:
+                self.total_bytes -= old.size
+            if entry.size > self.max_bytes:
+                return
+            self._entries[key] = entry
+            self.total_bytes += entry.size
+            while self.total_bytes > self.max_bytes:
+                _, evicted = self._entries.popitem(last=False)
+                self.total_bytes -= evicted.size
+
+    def gauges(self):
+        """Prometheus lines for the cache's current size"""
+        with self._lock:
+            entries, total_bytes = len(self._entries), self.total_bytes
+        return (
+            '# HELP fpl_cache_entries Responses held in the proxy cache\n'
+            '# TYPE fpl_cache_entries gauge\n'
+            f'fpl_cache_entries {entries}\n'
+            '# HELP fpl_cache_bytes Compressed bytes held in the proxy cache\n'
+            '# TYPE fpl_cache_bytes gauge\n'
+            f'fpl_cache_bytes {total_bytes}\n'
+        )
+
+    def _record_deadlines(self, raw):
+        try:
+            events = json.loads(raw)['events']
+        except (ValueError, KeyError):
+            return
+        if self.picks_cache is not None:
+            self.picks_cache.update_events(events)
+        for event in events:
+            if event.get('deadline_time'):
+                deadline = datetime.fromisoformat(event['deadline_time'].replace('Z', '+00:00'))
+                self._deadlines[event['id']] = deadline
+
+
+class ProxyHandler(SimpleHTTPRequestHandler):
+    cache = None
+    broadcaster = None
+    leagues = None
+    slim = None
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, directory=STATIC_DIR, **kwargs)
+
+    def do_GET(self):
+        if self.path.startswith(API_PREFIX):
+            self.proxy_api()
+        elif self.path == STREAM_PATH:
+            if self.broadcaster is None:
+                self.send_error(404, 'Live stream disabled')
+            else:
+                serve_sse(self, self.broadcaster)
+        elif self.path == SCHEDULER_PATH:
+            self.send_json(self.cache.client.scheduler.stats() if self.cache.client.scheduler else {})
+        elif self.path == LEAGUES_PATH or self.path.startswith(LEAGUES_PATH + '/'):
+            self.league_tables()
+        elif self.path.startswith(SLIM_PREFIX):
+            self.slim_payload()
+        elif self.path == METRICS_PATH:
+            self.send_text(REGISTRY.render() + self.cache.gauges(), 'text/plain; version=0.0.4')
+        elif urlsplit(self.path).path == PROFILE_PATH:
+            query = parse_qs(urlsplit(self.path).query)
+            try:
+                seconds = min(float(query.get('seconds', ['10'])[0]), MAX_PROFILE_SECONDS)
+            except ValueError:
+                self.send_error(400, 'seconds must be a number')
+                return
+            self.send_text(sample_stacks(seconds), 'text/plain')
+        else:
+            super().do_GET()
+
+    def league_tables(self):
+        if self.leagues is None:
+            self.send_error(404, 'League service disabled')
+            return
+        results = self.leagues.results
+        parts = urlsplit(self.path)
+        league_id = parts.path[len(LEAGUES_PATH) + 1:].strip('/')
+        entry = parse_qs(parts.query).get('entry', [''])[0]
+        if not league_id:
+            self.send_json({'cycle': self.leagues.last_cycle, 'leagues': [
+                {'id': league['id'], 'type': league['type'], 'name': league['name']} for league in self.leagues.leagues]})
+        elif not (league_id.isdigit() and int(league_id) in results):
+            self.send_error(404, 'Unknown league')
+        elif entry:
+            row = self.leagues.entry_row(int(league_id), int(entry)) if entry.isdigit() else None
+            if row is None:
+                self.send_error(404, 'Unknown entry')
+            else:
+                self.send_json(row)
+        else:
+            self.send_json(results[int(league_id)])
+
+    def slim_payload(self):
+        if self.slim is None:
+            self.send_error(404, 'League service disabled')
+            return
+        if self.path.startswith(FRAGMENT_PREFIX):
+            digest = self.path[len(FRAGMENT_PREFIX):]
+            body = self.slim.fragment(digest)
+            # Content-addressed: a hash never changes meaning
+            self.send_gzipped(body, f'"{digest}"', 'public, max-age=31536000, immutable')
+            return
+        league_id = self.path[len(SLIM_PREFIX):].strip('/')
+        result = self.slim.payload(int(league_id)) if league_id.isdigit() else None
+        if result is None:
+            self.send_error(404, 'Unknown league')
+            return
+        etag, body = result
+        self.send_gzipped(body, f'"{etag}"', 'no-cache')
+
+    def send_gzipped(self, body, etag, cache_control):
+        """Send a gzipped JSON body with revalidation by ETag"""
+        if body is None:
+            self.send_error(404, 'Unknown fragment')
+            return
+        if self.headers.get('If-None-Match') == etag:
+            self.send_response(304)
+            self.send_header('ETag', etag)
+            self.send_header('Cache-Control', cache_control)
+            self.end_headers()
+            return
+        accepts_gzip = 'gzip' in self.headers.get('Accept-Encoding', '')
+        if not accepts_gzip:
+            body = gzip.decompress(body)
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.send_header('Cache-Control', cache_control)
+        self.send_header('ETag', etag)
+        if accepts_gzip:
+            self.send_header('Content-Encoding', 'gzip')
+        self.send_header('Vary', 'Accept-Encoding')
+        self.end_headers()
+        self.wfile.write(body)
+
+    def send_json(self, data):
+        self.send_text(json.dumps(data, indent=2), 'application/json')
+
+    def send_text(self, text, content_type):
+        body = text.encode()
+        self.send_response(200)
+        self.send_header('Content-Type', content_type)
+        self.send_header('Content-Length', str(len(body)))
+        self.send_header('Cache-Control', 'no-store')
+        self.end_headers()
+        self.wfile.write(body)
+
+    def proxy_api(self):
+        key = self.path[len(API_PREFIX):]
+        try:
+            entry, state = self.cache.get(key)
+        except Exception as error:
+            self.send_error(502, f'Upstream error: {error}')
+            return
+        REGISTRY.cache_result(key, state)
+
+        accepts_gzip = 'gzip' in self.headers.get('Accept-Encoding', '')
+        body = entry.body if accepts_gzip else gzip.decompress(entry.body)
+        max_age = max(0, int(entry.expires - time.time()))
+
+        self.send_response(entry.status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.send_header('Cache-Control', f'public, max-age={max_age}')
+        self.send_header('Access-Control-Allow-Origin', '*')
+        self.send_header('X-Cache', state)
+        if accepts_gzip:
+            self.send_header('Content-Encoding', 'gzip')
+        self.send_header('Vary', 'Accept-Encoding')
+        self.end_headers()
+        try:
+            self.wfile.write(body)
+        except ConnectionError:
+            # Paginators cancel speculative page requests past the last page
+            pass
+
+    def log_message(self, format, *args):
+        if not self.path.startswith((API_PREFIX, STREAM_PATH, SCHEDULER_PATH, LEAGUES_PATH, METRICS_PATH, SLIM_PREFIX)):
+            super().log_message(format, *args)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Serve the PWA with a caching FPL API proxy')
+    parser.add_argument('--port', type=int, default=8000)
+    parser.add_argument('--bind', default='0.0.0.0')
+    parser.add_argument('--cache-mb', type=int, default=64, help='Upper bound on cached response bytes')
+    parser.add_argument('--live-league', type=int, default=1017641, help='H2H league streamed on /stream (0 disables)')
+    parser.add_argument('--live-interval', type=int, help='Fixed seconds between upstream live polls (default: follow the fixtures)')
+    parser.add_argument('--upstream-rate', type=float, default=10, help='Upstream requests per second (0 disables limiting)')
+    parser.add_argument('--upstream-burst', type=int, default=20, help='Upstream requests allowed back to back')
+    parser.add_argument('--picks-cache', default=PICKS_CACHE_PATH, help='SQLite file persisting picks and entries (empty string disables)')
+    parser.add_argument('--leagues', help='JSON file of leagues to keep live tables for on /leagues')
+    args = parser.parse_args()
+
+    # One scheduler for the proxy and the live poller so live polls jump the queue
+    scheduler = RequestScheduler(args.upstream_rate, args.upstream_burst) if args.upstream_rate else None
+    picks_cache = PicksCache(args.picks_cache) if args.picks_cache else None
+    ProxyHandler.cache = ProxyCache(FPLClient(pool_size=32, scheduler=scheduler), max_bytes=args.cache_mb * 1024 * 1024,
+                                    picks_cache=picks_cache)
+    if args.live_league:
+        ProxyHandler.broadcaster = Broadcaster()
+        poller = LivePoller(FPLClient(scheduler=scheduler), args.live_league, ProxyHandler.broadcaster, args.live_interval,
+                            picks_cache)
+        ProxyHandler.cache.scheduler = poller.scheduler
+        poller.start()
+    server = ThreadingHTTPServer((args.bind, args.port), ProxyHandler)
+    if args.leagues:
+        # Fetch through our own /api so the leagues share the cache and upstream scheduler
+        host = '127.0.0.1' if args.bind in ('', '0.0.0.0') else args.bind
+        ProxyHandler.leagues = start_service(load_config(args.leagues), base_url=f'http://{host}:{args.port}/api')
+        ProxyHandler.slim = SlimPayloads(ProxyHandler.leagues)
+    print(f"Serving on http://localhost:{args.port} (API proxy at {API_PREFIX})")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
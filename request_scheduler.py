@@ -0,0 +1,323 @@
+"""Rate-limited, prioritised upstream request scheduling.
+
+Every upstream call waits for a token from one shared bucket (``rate``
+requests per second, bursts up to ``burst``). When callers queue, live data
+goes first, then picks and league pages, then history and everything else.
+Identical requests already in flight share one call (conditional requests
+only with callers sending the same validators, so a 304 never reaches a
+caller with no body to reuse). A 429 or 5xx (or a connection error) is
+retried with jittered exponential backoff, and a 429 pauses the whole bucket
+for Retry-After so the queue doesn't keep knocking.
+
+RequestScheduler serves threads (FPLClient, the proxy); AsyncRequestScheduler
+does the same for asyncio (AsyncFPLClient). Both expose ``stats()`` with
+queue depth and wait times per priority class.
+
+    client = FPLClient(scheduler=RequestScheduler(rate=10))
+"""
+import asyncio
+import heapq
+import itertools
+import random
+import re
+import threading
+import time
+from collections import deque
+from concurrent.futures import Future
+
+LIVE, PICKS, HISTORY = 0, 1, 2
+PRIORITY_NAMES = {LIVE: 'live', PICKS: 'picks', HISTORY: 'history'}
+# First matching pattern wins; anything else is HISTORY
+ENDPOINT_PRIORITIES = [
+    (re.compile(r'^event/\d+/live/'), LIVE),
+    (re.compile(r'^fixtures/'), LIVE),
+    (re.compile(r'^bootstrap-static/'), LIVE),
+    (re.compile(r'^entry/\d+/event/\d+/picks/'), PICKS),
+    (re.compile(r'^leagues-'), PICKS),
+    (re.compile(r'^entry/\d+/$'), PICKS),
+]
+
+DEFAULT_RATE = 10
+DEFAULT_BURST = 20
+MAX_RETRIES = 4
+BASE_BACKOFF = 0.5
+MAX_BACKOFF = 30
+WAIT_SAMPLES = 1000
+
+
+def priority_for(key):
+    for pattern, priority in ENDPOINT_PRIORITIES:
+        if pattern.match(key):
+            return priority
+    return HISTORY
+
+
+def merge_key(key, headers=None):
+    """In-flight key: the endpoint plus any conditional request validators"""
+    headers = headers or {}
+    return key, headers.get('If-None-Match'), headers.get('If-Modified-Since')
+
+
+def status_of(response):
+    """HTTP status of a requests or aiohttp response"""
+    return getattr(response, 'status_code', None) or getattr(response, 'status', None)
+
+
+def retryable(status):
+    return status == 429 or (status is not None and status >= 500)
+
+
+def backoff_delay(attempt, retry_after=None):
+    """Full-jitter exponential backoff, or the server's Retry-After if longer"""
+    delay = random.uniform(0, min(MAX_BACKOFF, BASE_BACKOFF * 2 ** attempt))
+    if retry_after:
+        try:
+            delay = max(delay, float(retry_after))
+        except ValueError:
+            pass
+    return delay
+
+
+class TokenBucket:
+    def __init__(self, rate, burst):
+        self.rate = rate
+        self.burst = burst
+        self.tokens = float(burst)
+        self.paused_until = 0
+        self._updated = time.monotonic()
+
+    def refill(self, now):
+        self.tokens = min(self.burst, self.tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def delay(self, now):
+        """Seconds until a token can be taken (0 if one is available now)"""
+        self.refill(now)
+        if now < self.paused_until:
+            return self.paused_until - now
+        return 0 if self.tokens >= 1 else (1 - self.tokens) / self.rate
+
+    def take(self):
+        self.tokens -= 1
+
+    def pause(self, seconds):
+        self.paused_until = max(self.paused_until, time.monotonic() + seconds)
+
+
+class SchedulerStats:
+    """Counters plus recent wait times and queue depth per priority class"""
+
+    def __init__(self):
+        self.requests = 0
+        self.deduplicated = 0
+        self.retries = 0
+        self.throttled = 0
+        self.server_errors = 0
+        self.queued = {priority: 0 for priority in PRIORITY_NAMES}
+        self.max_queued = {priority: 0 for priority in PRIORITY_NAMES}
+        self.waits = {priority: deque(maxlen=WAIT_SAMPLES) for priority in PRIORITY_NAMES}
+
+    def enqueue(self, priority):
+        self.queued[priority] += 1
+        self.max_queued[priority] = max(self.max_queued[priority], self.queued[priority])
+
+    def dequeue(self, priority, waited):
+        self.queued[priority] -= 1
+        self.waits[priority].append(waited)
+
+    def response(self, status):
+        self.requests += 1
+        if status == 429:
+            self.throttled += 1
+        elif status is not None and status >= 500:
+            self.server_errors += 1
+
+    def snapshot(self):
+        classes = {}
+        for priority, name in PRIORITY_NAMES.items():
+            waits = sorted(self.waits[priority])
+            classes[name] = {
+                'queued': self.queued[priority],
+                'max_queued': self.max_queued[priority],
+                'wait_p50_ms': waits[len(waits) // 2] * 1000 if waits else 0,
+                'wait_p95_ms': waits[int(len(waits) * 0.95)] * 1000 if waits else 0,
+                'wait_max_ms': waits[-1] * 1000 if waits else 0,
+            }
+        return {
+            'requests': self.requests,
+            'deduplicated': self.deduplicated,
+            'retries': self.retries,
+            'throttled': self.throttled,
+            'server_errors': self.server_errors,
+            'classes': classes,
+        }
+
+
+class RequestScheduler:
+    """Thread-safe scheduler; ``call`` blocks until the request has run"""
+
+    def __init__(self, rate=DEFAULT_RATE, burst=DEFAULT_BURST, max_retries=MAX_RETRIES):
+        self.bucket = TokenBucket(rate, burst)
+        self.max_retries = max_retries
+        self.counters = SchedulerStats()
+        self._condition = threading.Condition()
+        self._waiting = []
+        self._order = itertools.count()
+        self._inflight = {}
+
+    def call(self, key, fetch, priority=None, headers=None):
+        """Run ``fetch()`` (returning a response) for an endpoint key
+
+        ``headers`` are the request headers ``fetch`` sends; their validators
+        decide which in-flight calls can be shared.
+        """
+        inflight = merge_key(key, headers)
+        with self._condition:
+            future = self._inflight.get(inflight)
+            leader = future is None
+            if leader:
+                future = self._inflight[inflight] = Future()
+            else:
+                self.counters.deduplicated += 1
+        if not leader:
+            return future.result()
+
+        try:
+            response = self._run(fetch, priority_for(key) if priority is None else priority)
+            future.set_result(response)
+            return response
+        except BaseException as error:
+            future.set_exception(error)
+            raise
+        finally:
+            with self._condition:
+                del self._inflight[inflight]
+
+    def _run(self, fetch, priority):
+        for attempt in range(self.max_retries + 1):
+            self._acquire(priority)
+            try:
+                response = fetch()
+            except Exception:
+                if attempt == self.max_retries:
+                    raise
+                self.counters.retries += 1
+                time.sleep(backoff_delay(attempt))
+                continue
+            status = status_of(response)
+            with self._condition:
+                self.counters.response(status)
+            if not retryable(status) or attempt == self.max_retries:
+                return response
+            delay = backoff_delay(attempt, response.headers.get('Retry-After'))
+            with self._condition:
+                self.counters.retries += 1
+                if status == 429:
+                    self.bucket.pause(delay)
+            time.sleep(delay)
+
+    def _acquire(self, priority):
+        ticket = (priority, next(self._order))
+        queued_at = time.monotonic()
+        with self._condition:
+            heapq.heappush(self._waiting, ticket)
+            self.counters.enqueue(priority)
+            while True:
+                if self._waiting[0] == ticket:
+                    delay = self.bucket.delay(time.monotonic())
+                    if delay == 0:
+                        self.bucket.take()
+                        heapq.heappop(self._waiting)
+                        self.counters.dequeue(priority, time.monotonic() - queued_at)
+                        self._condition.notify_all()
+                        return
+                    self._condition.wait(delay)
+                else:
+                    self._condition.wait()
+
+    def stats(self):
+        with self._condition:
+            return self.counters.snapshot()
+
+
+class AsyncRequestScheduler:
+    """asyncio counterpart of RequestScheduler; ``call`` takes a coroutine factory
+
+    ``fetch()`` should return the final value (e.g. status and parsed body);
+    ``status`` pulls the HTTP status out of it for the retry decision.
+    """
+
+    def __init__(self, rate=DEFAULT_RATE, burst=DEFAULT_BURST, max_retries=MAX_RETRIES):
+        self.bucket = TokenBucket(rate, burst)
+        self.max_retries = max_retries
+        self.counters = SchedulerStats()
+        self._waiting = []
+        self._order = itertools.count()
+        self._inflight = {}
+        self._wakeup = None
+
+    async def call(self, key, fetch, priority=None, status=status_of, retry_after=None, headers=None):
+        inflight = merge_key(key, headers)
+        task = self._inflight.get(inflight)
+        if task is not None:
+            self.counters.deduplicated += 1
+            return await asyncio.shield(task)
+        priority = priority_for(key) if priority is None else priority
+        task = self._inflight[inflight] = asyncio.ensure_future(self._run(fetch, priority, status, retry_after))
+        try:
+            return await asyncio.shield(task)
+        finally:
+            if task.done():
+                self._inflight.pop(inflight, None)
+            else:
+                task.add_done_callback(lambda _: self._inflight.pop(inflight, None))
+
+    async def _run(self, fetch, priority, status, retry_after):
+        for attempt in range(self.max_retries + 1):
+            await self._acquire(priority)
+            try:
+                result = await fetch()
+            except asyncio.CancelledError:
+                raise
+            except Exception:
+                if attempt == self.max_retries:
+                    raise
+                self.counters.retries += 1
+                await asyncio.sleep(backoff_delay(attempt))
+                continue
+            code = status(result)
+            self.counters.response(code)
+            if not retryable(code) or attempt == self.max_retries:
+                return result
+            delay = backoff_delay(attempt, retry_after(result) if retry_after else None)
+            self.counters.retries += 1
+            if code == 429:
+                self.bucket.pause(delay)
+            await asyncio.sleep(delay)
+
+    async def _acquire(self, priority):
+        if self._wakeup is None:
+            self._wakeup = asyncio.Event()
+        ticket = (priority, next(self._order))
+        queued_at = time.monotonic()
+        heapq.heappush(self._waiting, ticket)
+        self.counters.enqueue(priority)
+        try:
+            while True:
+                if self._waiting[0] == ticket:
+                    delay = self.bucket.delay(time.monotonic())
+                    if delay == 0:
+                        self.bucket.take()
+                        return
+                    await asyncio.sleep(delay)
+                else:
+                    self._wakeup.clear()
+                    await self._wakeup.wait()
+        finally:
+            self._waiting.remove(ticket)
+            heapq.heapify(self._waiting)
+            self.counters.dequeue(priority, time.monotonic() - queued_at)
+            self._wakeup.set()
+
+    def stats(self):
+        return self.counters.snapshot()
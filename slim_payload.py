@@ -0,0 +1,224 @@
+#!/usr/bin/env python3
+"""Compact, versioned per-league payloads for the PWA.
+
+A cold start used to pull all of bootstrap-static (every player and field)
+and the full live endpoint just to draw one league. This projects a
+LeagueService snapshot down to what the league's page shows:
+
+- ``fragments``: content hashes of the static parts, served separately on
+  ``/slim/fragment/<hash>`` as immutable, so a phone downloads teams once a
+  season and the league's players once a gameweek
+    - teams: team ids, names and short names, plus position names
+    - players: only elements picked by the league's entries, as parallel
+      ``id`` / ``name`` / ``team`` / ``pos`` arrays
+- ``live``: one column per LIVE_FIELDS stat, aligned with the players
+  fragment
+- ``bonus``: element id -> provisional bonus (bonus_engine.py) for picked
+  players in fixtures whose bonus FPL hasn't confirmed yet
+- ``fixtures``: one row per fixture in FIXTURE_FIELDS order
+- ``entries``: one row per entry in ENTRY_FIELDS order, with live points
+  (provisional bonus included) already computed by the server
+- ``fields``: the three field orders above, so the rows are self-describing
+- ``picks``: entry id -> [15 element ids by position, captain index, vice index]
+- ``matches``: [entry_1, entry_2] pairs for H2H leagues
+
+``v`` is PAYLOAD_VERSION; clients fall back to the raw API on a version they
+don't know.
+
+    python3 slim_payload.py leagues.json 1017641
+"""
+import gzip
+import hashlib
+import json
+import sys
+import threading
+from collections import OrderedDict
+
+PAYLOAD_VERSION = 2
+LIVE_FIELDS = ('total_points', 'minutes', 'goals_scored', 'assists', 'yellow_cards', 'red_cards', 'saves', 'bonus', 'starts', 'bps')
+FIXTURE_FIELDS = ('id', 'team_h', 'team_a', 'started', 'finished', 'finished_provisional', 'minutes')
+ENTRY_FIELDS = ('id', 'name', 'manager', 'won', 'drawn', 'lost', 'total', 'rank', 'live', 'cost')
+MAX_FRAGMENTS = 64
+
+
+def encode(data):
+    return json.dumps(data, separators=(',', ':')).encode()
+
+
+def content_hash(body):
+    return hashlib.sha1(body).hexdigest()[:16]
+
+
+def teams_fragment(store):
+    team_ids = [team_id for team_id, name in enumerate(store.team_names) if name]
+    return {
+        'id': team_ids,
+        'name': [store.team_names[team_id] for team_id in team_ids],
+        'short': [store.team_short_names[team_id] for team_id in team_ids],
+        'positions': {str(element_type): name for element_type, name in store.positions.items()},
+    }
+
+
+def players_fragment(store, element_ids):
+    return {
+        'id': element_ids,
+        'name': [store.web_names[element_id] for element_id in element_ids],
+        'team': [int(store.team[element_id]) for element_id in element_ids],
+        'pos': [int(store.element_type[element_id]) for element_id in element_ids],
+    }
+
+
+def live_columns(live, element_ids):
+    """LIVE_FIELDS as columns aligned with ``element_ids``"""
+    stats = {element['id']: element['stats'] for element in live['elements']}
+    empty = {}
+    return [[stats.get(element_id, empty).get(field) or 0 for element_id in element_ids] for field in LIVE_FIELDS]
+
+
+def compact_picks(payload):
+    elements = [0] * 15
+    captain = vice = -1
+    for pick in payload['picks']:
+        slot = pick['position'] - 1
+        elements[slot] = pick['element']
+        if pick.get('is_captain'):
+            captain = slot
+        if pick.get('is_vice_captain'):
+            vice = slot
+    return [elements, captain, vice]
+
+
+def entry_row(standing, totals, picks):
+    history = (picks or {}).get('entry_history') or {}
+    return [
+        standing['entry'],
+        standing['entry_name'],
+        standing['player_name'],
+        standing.get('matches_won', 0),
+        standing.get('matches_drawn', 0),
+        standing.get('matches_lost', 0),
+        standing['total'],
+        standing['rank'],
+        totals.get(standing['entry']),
+        history.get('event_transfers_cost') or 0,
+    ]
+
+
+class SlimPayloads:
+    """Builds and caches slim payloads from a LeagueService's snapshots
+
+    A league's payload is rebuilt at most once per refresh cycle; fragments
+    are kept by hash in a small LRU that never evicts a fragment a cached
+    payload still points to.
+    """
+
+    def __init__(self, service, max_fragments=MAX_FRAGMENTS):
+        self.service = service
+        self.max_fragments = max_fragments
+        self._lock = threading.Lock()
+        self._fragments = OrderedDict()
+        # league id -> (cycle, etag, gzipped body, fragment hashes)
+        self._payloads = {}
+
+    def fragment(self, digest):
+        """Gzipped fragment body for a hash, or None once evicted/unknown"""
+        with self._lock:
+            body = self._fragments.get(digest)
+            if body is not None:
+                self._fragments.move_to_end(digest)
+            return body
+
+    def payload(self, league_id):
+        """(etag, gzipped body) for a league, or None if it isn't served"""
+        snapshot = self.service.snapshot
+        if snapshot is None or league_id not in snapshot.leagues:
+            return None
+        with self._lock:
+            cached = self._payloads.get(league_id)
+        if cached and cached[0] == snapshot.cycle:
+            return cached[1:3]
+        payload = self.build(snapshot, league_id)
+        body = encode(payload)
+        result = (snapshot.cycle, content_hash(body), gzip.compress(body, compresslevel=9),
+                  frozenset(payload['fragments'].values()))
+        with self._lock:
+            self._payloads[league_id] = result
+            self._evict()
+        return result[1:3]
+
+    def build(self, snapshot, league_id):
+        league = next(league for league in self.service.leagues if league['id'] == league_id)
+        standings, matches = snapshot.leagues[league_id]
+        standings = sorted(standings, key=lambda row: row['rank'])
+        picks = {row['entry']: snapshot.picks.get(row['entry']) for row in standings}
+        element_ids = sorted({pick['element'] for payload in picks.values() if payload for pick in payload['picks']})
+        return {
+            'v': PAYLOAD_VERSION,
+            'league': league_id,
+            'type': league['type'],
+            'name': league['name'],
+            'gw': snapshot.gameweek,
+            'fields': {'live': LIVE_FIELDS, 'fixtures': FIXTURE_FIELDS, 'entries': ENTRY_FIELDS},
+            'fragments': {
+                'teams': self._add_fragment(teams_fragment(snapshot.store)),
+                'players': self._add_fragment(players_fragment(snapshot.store, element_ids)),
+            },
+            'live': live_columns(snapshot.live, element_ids),
+            'bonus': {str(element_id): snapshot.bonus[element_id] for element_id in element_ids if element_id in snapshot.bonus},
+            'fixtures': [[fixture.get(field) or 0 for field in FIXTURE_FIELDS] for fixture in snapshot.fixtures],
+            'entries': [entry_row(row, snapshot.totals, picks[row['entry']]) for row in standings],
+            'picks': {str(entry_id): compact_picks(payload) for entry_id, payload in picks.items() if payload},
+            'matches': [[m['entry_1_entry'], m['entry_2_entry']] for m in matches],
+        }
+
+    def _add_fragment(self, data):
+        body = encode(data)
+        digest = content_hash(body)
+        with self._lock:
+            if digest in self._fragments:
+                self._fragments.move_to_end(digest)
+            else:
+                self._fragments[digest] = gzip.compress(body, compresslevel=9)
+                self._evict()
+        return digest
+
+    def _evict(self):
+        """Drop least recently used fragments no cached payload refers to"""
+        if len(self._fragments) <= self.max_fragments:
+            return
+        referenced = set().union(*(cached[3] for cached in self._payloads.values()))
+        for digest in list(self._fragments):
+            if len(self._fragments) <= self.max_fragments:
+                break
+            if digest not in referenced:
+                del self._fragments[digest]
+
+
+def main():
+    import asyncio
+
+    from fpl_client import FPLClient
+    from multi_league import load_config, run_once
+
+    leagues = load_config(sys.argv[1] if len(sys.argv) > 1 else 'leagues.json')
+    league_id = int(sys.argv[2]) if len(sys.argv) > 2 else leagues[0]['id']
+    service = asyncio.run(run_once(leagues, 10, 20, None))
+    slim = SlimPayloads(service)
+    etag, body = slim.payload(league_id)
+    payload = json.loads(gzip.decompress(body))
+    gw = payload['gw']
+
+    def sizes(raw):
+        return f"{len(raw):>10,} bytes {len(gzip.compress(raw)):>9,} gzipped"
+
+    print(f"League {league_id} GW{gw}")
+    print(f"  slim payload       {sizes(gzip.decompress(body))}  (etag {etag})")
+    for name, digest in payload['fragments'].items():
+        print(f"  fragment {name:<9} {sizes(gzip.decompress(slim.fragment(digest)))}  ({digest})")
+    with FPLClient() as client:
+        print(f"  bootstrap-static   {sizes(client.request('bootstrap-static/').content)}")
+        print(f"  event live         {sizes(client.request(f'event/{gw}/live/').content)}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,196 @@
+#!/usr/bin/env python3
+"""Columnar on-disk archive of per-gameweek player stats.
+
+Each season is one flat file of fixed-width int16 cells laid out as
+(gameweek, element id, stat) plus a small JSON sidecar naming the columns
+and listing the gameweeks written. Gameweek N always lives at the same
+offset, so appending a finished gameweek is a single write and queries are
+NumPy views over a read-only memory map: nothing is parsed and nothing is
+copied until you index into it.
+
+    python3 stats_archive.py update archive/2024-25
+    python3 stats_archive.py player archive/2024-25 Salah
+    python3 stats_archive.py gameweek archive/2024-25 7
+"""
+import argparse
+import json
+import os
+
+import numpy as np
+
+STAT_COLUMNS = (
+    'minutes', 'total_points', 'bps', 'bonus', 'goals_scored', 'assists', 'clean_sheets',
+    'goals_conceded', 'own_goals', 'penalties_saved', 'penalties_missed', 'yellow_cards',
+    'red_cards', 'saves', 'starts',
+)
+DTYPE = np.int16
+DEFAULT_CAPACITY = 1024
+
+
+class StatsArchive:
+    """One season of live element stats, memory-mapped by gameweek
+
+    ``capacity`` is the number of element id slots per gameweek and is fixed
+    when the archive is created.
+    """
+
+    def __init__(self, path, capacity=DEFAULT_CAPACITY, columns=STAT_COLUMNS):
+        self.data_path = f'{path}.gwstats'
+        self.meta_path = f'{path}.json'
+        if os.path.exists(self.meta_path):
+            with open(self.meta_path) as f:
+                self.meta = json.load(f)
+        else:
+            self.meta = {'columns': list(columns), 'capacity': capacity, 'dtype': np.dtype(DTYPE).str, 'gameweeks': []}
+        self.columns = tuple(self.meta['columns'])
+        self.capacity = self.meta['capacity']
+        self.dtype = np.dtype(self.meta['dtype'])
+        self._column_index = {name: i for i, name in enumerate(self.columns)}
+        self._map = None
+        self._mapped_blocks = 0
+
+    @property
+    def gameweeks(self):
+        return list(self.meta['gameweeks'])
+
+    @property
+    def block_bytes(self):
+        return self.capacity * len(self.columns) * self.dtype.itemsize
+
+    def append(self, gw, live):
+        """Write one gameweek's event/{gw}/live payload (rewrites if present)"""
+        block = np.zeros((self.capacity, len(self.columns)), dtype=self.dtype)
+        for element in live['elements']:
+            element_id = element['id']
+            if element_id >= self.capacity:
+                raise ValueError(f"Element {element_id} exceeds archive capacity {self.capacity}")
+            stats = element['stats']
+            block[element_id] = [stats.get(column) or 0 for column in self.columns]
+
+        mode = 'r+b' if os.path.exists(self.data_path) else 'w+b'
+        with open(self.data_path, mode) as f:
+            f.seek((gw - 1) * self.block_bytes)
+            f.write(block.tobytes())
+
+        if gw not in self.meta['gameweeks']:
+            self.meta['gameweeks'] = sorted(self.meta['gameweeks'] + [gw])
+        tmp_path = f'{self.meta_path}.tmp'
+        with open(tmp_path, 'w') as f:
+            json.dump(self.meta, f)
+        os.replace(tmp_path, self.meta_path)
+        self._map = None
+
+    def _stats(self):
+        """(gameweek slot, element, stat) memory map covering every block on disk"""
+        if not os.path.exists(self.data_path):
+            return np.zeros((0, self.capacity, len(self.columns)), dtype=self.dtype)
+        blocks = os.path.getsize(self.data_path) // self.block_bytes
+        if self._map is None or blocks != self._mapped_blocks:
+            self._map = np.memmap(self.data_path, dtype=self.dtype, mode='r',
+                                  shape=(blocks, self.capacity, len(self.columns)))
+            self._mapped_blocks = blocks
+        return self._map
+
+    def column_index(self, name):
+        return self._column_index[name]
+
+    def gameweek(self, gw):
+        """(element id x stat) view of one gameweek"""
+        if gw not in self.meta['gameweeks']:
+            raise KeyError(f"GW{gw} not archived")
+        return self._stats()[gw - 1]
+
+    def player(self, element_id):
+        """(gameweeks, stats) for one element across every archived gameweek
+
+        ``stats`` is a strided view, one row per entry of ``gameweeks``.
+        """
+        gws = self.gameweeks
+        stats = self._stats()[:, element_id, :]
+        if gws == list(range(1, len(gws) + 1)):
+            return gws, stats[:len(gws)]
+        return gws, stats[np.asarray(gws, dtype=np.intp) - 1]
+
+    def column(self, name, gw=None):
+        """One stat for every element, either for a gameweek or (gameweek x element)"""
+        index = self._column_index[name]
+        if gw is not None:
+            return self.gameweek(gw)[:, index]
+        return self._stats()[:, :, index]
+
+    def totals(self, name):
+        """Season total of one stat per element id"""
+        gws = np.asarray(self.gameweeks, dtype=np.intp) - 1
+        return self.column(name)[gws].sum(axis=0, dtype=np.int32)
+
+
+def update(args):
+    from fpl_client import FPLClient
+
+    client = FPLClient()
+    archive = StatsArchive(args.archive)
+    finished = [event['id'] for event in client.bootstrap()['events'] if event['finished']]
+    missing = [gw for gw in finished if gw not in archive.gameweeks]
+    for gw, live in zip(missing, client.get_many([f'event/{gw}/live/' for gw in missing])):
+        archive.append(gw, live)
+        print(f"Archived GW{gw}")
+    print(f"{len(archive.gameweeks)} gameweeks archived")
+
+
+def show_player(args):
+    from bootstrap_store import BootstrapStore
+    from fpl_client import FPLClient
+
+    archive = StatsArchive(args.archive)
+    store = BootstrapStore.from_client(FPLClient())
+    element_id = int(args.player) if args.player.isdigit() else store.find(args.player)
+    if element_id is None:
+        matches = store.search(args.player, limit=1)
+        element_id = matches[0] if matches else None
+    if element_id is None:
+        raise SystemExit(f"Player '{args.player}' not found")
+
+    gws, stats = archive.player(element_id)
+    shown = ('minutes', 'total_points', 'goals_scored', 'assists', 'bonus', 'bps')
+    columns = [archive.column_index(name) for name in shown]
+    print(f"{store.web_names[element_id]} ({element_id})")
+    print('GW   ' + ' '.join(f'{name[:6]:>6}' for name in shown))
+    for gw, row in zip(gws, stats):
+        print(f'{gw:<4} ' + ' '.join(f'{row[i]:>6}' for i in columns))
+
+
+def show_gameweek(args):
+    archive = StatsArchive(args.archive)
+    stats = archive.gameweek(args.gw)
+    points = stats[:, archive.column_index('total_points')]
+    top = np.argsort(points)[::-1][:args.top]
+    print(f"GW{args.gw} top scorers (element id: points)")
+    for element_id in top:
+        print(f"  {element_id}: {points[element_id]}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Per-gameweek player stats archive')
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    update_parser = commands.add_parser('update', help='Append any finished gameweeks not yet archived')
+    update_parser.add_argument('archive', help='Archive path without extension, e.g. archive/2024-25')
+    update_parser.set_defaults(func=update)
+
+    player_parser = commands.add_parser('player', help='One player across all archived gameweeks')
+    player_parser.add_argument('archive')
+    player_parser.add_argument('player', help='Element id or name')
+    player_parser.set_defaults(func=show_player)
+
+    gw_parser = commands.add_parser('gameweek', help='All players in one gameweek')
+    gw_parser.add_argument('archive')
+    gw_parser.add_argument('gw', type=int)
+    gw_parser.add_argument('--top', type=int, default=10)
+    gw_parser.set_defaults(func=show_gameweek)
+
+    args = parser.parse_args()
+    args.func(args)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,4 +1,4 @@
-const CACHE_NAME = 'fpl-tracker-v2';
+const CACHE_NAME = 'fpl-tracker-v3';
 const urlsToCache = [
     '/',
     '/index.html',
@@ -47,9 +47,10 @@ self.addEventListener('fetch', event => {
         return;
     }
     
-    // Handle API requests differently (network first)
-    if (event.request.url.includes('fantasy.premierleague.com') || 
-        event.request.url.includes('corsproxy.io')) {
+    // Handle API requests and slim league payloads differently (network first);
+    // slim fragments are content-addressed, so cache first is always right for them
+    const pathname = new URL(event.request.url).pathname;
+    if (pathname.startsWith('/api/') || (pathname.startsWith('/slim/') && !pathname.startsWith('/slim/fragment/'))) {
         event.respondWith(
             fetch(event.request)
                 .then(response => {
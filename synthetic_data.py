@@ -0,0 +1,258 @@
+"""Synthetic FPL payloads for benchmarks and offline experiments.
+
+Produces bootstrap-static, fixtures, event live and entry picks payloads in
+the same shape the API returns, at any scale: ~700 players across 20 teams,
+a 380-fixture double round robin, live stats at any match minute, and
+leagues of random but valid squads (2/5/5/3, at most three per club, legal
+starting formation).
+"""
+import random
+from datetime import datetime, timedelta, timezone
+
+GKP, DEF, MID, FWD = 1, 2, 3, 4
+POSITIONS = {GKP: 'GKP', DEF: 'DEF', MID: 'MID', FWD: 'FWD'}
+SQUAD_SHAPE = {GKP: 2, DEF: 5, MID: 5, FWD: 3}
+TEAM_SHAPE = {GKP: 4, DEF: 12, MID: 12, FWD: 7}
+FORMATIONS = [(3, 4, 3), (3, 5, 2), (4, 4, 2), (4, 3, 3), (4, 5, 1), (5, 3, 2), (5, 4, 1)]
+GOAL_POINTS = {GKP: 10, DEF: 6, MID: 5, FWD: 4}
+SEASON_START = datetime(2024, 8, 16, 19, 0, tzinfo=timezone.utc)
+
+
+def _iso(moment):
+    return moment.strftime('%Y-%m-%dT%H:%M:%SZ')
+
+
+def generate_bootstrap(n_teams=20, current_gw=1, seed=0):
+    rng = random.Random(seed)
+    teams = [{'id': t, 'name': f'Team {t}', 'short_name': f'T{t:02d}', 'code': t} for t in range(1, n_teams + 1)]
+    elements = []
+    for team in teams:
+        for element_type, count in TEAM_SHAPE.items():
+            for _ in range(count):
+                element_id = len(elements) + 1
+                status = rng.choices('adisu', weights=[88, 5, 4, 2, 1])[0]
+                elements.append({
+                    'id': element_id,
+                    'web_name': f'Player{element_id}',
+                    'first_name': 'Synthetic',
+                    'second_name': f'Player{element_id}',
+                    'team': team['id'],
+                    'element_type': element_type,
+                    'status': status,
+                    'now_cost': rng.randrange(40, 130, 5),
+                    'chance_of_playing_this_round': None if status == 'a' else rng.choice([0, 25, 50, 75]),
+                    'chance_of_playing_next_round': None,
+                    'news': '' if status == 'a' else 'Knock',
+                    'points_per_game': f'{rng.uniform(1.0, 7.0):.1f}',
+                    'form': f'{rng.uniform(0.0, 8.0):.1f}',
+                })
+    events = []
+    for gw in range(1, 39):
+        deadline = SEASON_START + timedelta(days=7 * (gw - 1)) - timedelta(hours=1, minutes=30)
+        events.append({
+            'id': gw,
+            'name': f'Gameweek {gw}',
+            'deadline_time': _iso(deadline),
+            'is_current': gw == current_gw,
+            'is_next': gw == current_gw + 1,
+            'is_previous': gw == current_gw - 1,
+            'finished': gw < current_gw,
+        })
+    element_types = [{'id': t, 'singular_name_short': name} for t, name in POSITIONS.items()]
+    return {'events': events, 'teams': teams, 'elements': elements, 'element_types': element_types}
+
+
+def generate_fixtures(bootstrap, seed=0):
+    """Double round robin (circle method), ten fixtures per gameweek"""
+    rng = random.Random(seed)
+    team_ids = [t['id'] for t in bootstrap['teams']]
+    n = len(team_ids)
+    rotation = team_ids[1:]
+    rounds = []
+    for _ in range(n - 1):
+        order = [team_ids[0]] + rotation
+        rounds.append([(order[i], order[n - 1 - i]) for i in range(n // 2)])
+        rotation = rotation[-1:] + rotation[:-1]
+    rounds += [[(away, home) for home, away in pairs] for pairs in rounds]
+
+    fixtures = []
+    for gw, pairs in enumerate(rounds, 1):
+        base = SEASON_START + timedelta(days=7 * (gw - 1))
+        for home, away in pairs:
+            kickoff = base + timedelta(hours=rng.choice([0, 18, 20, 21, 23, 42, 44]))
+            fixtures.append({
+                'id': len(fixtures) + 1,
+                'event': gw,
+                'team_h': home,
+                'team_a': away,
+                'kickoff_time': _iso(kickoff),
+                'started': False,
+                'finished': False,
+                'finished_provisional': False,
+                'minutes': 0,
+                'team_h_score': None,
+                'team_a_score': None,
+                'stats': [],
+            })
+    return fixtures
+
+
+def advance_fixtures(fixtures, gw, minute, seed=0):
+    """Copies of a gameweek's fixtures as they stand ``minute`` into the round
+
+    Fixtures kick off in a staggered sequence so a single call yields a mix of
+    unstarted, live, provisionally finished and finished matches.
+    """
+    rng = random.Random(seed + gw)
+    state = []
+    for i, fixture in enumerate(f for f in fixtures if f['event'] == gw):
+        clock = minute - (i % 4) * 30
+        played = max(0, min(clock, 90))
+        fixture = dict(fixture)
+        fixture.update({
+            'started': clock > 0,
+            'minutes': played,
+            'finished_provisional': clock >= 95,
+            'finished': clock >= 150,
+            'team_h_score': rng.randint(0, 3) if clock > 0 else None,
+            'team_a_score': rng.randint(0, 3) if clock > 0 else None,
+        })
+        state.append(fixture)
+    return state
+
+
+def generate_live(bootstrap, gw_fixtures, seed=0):
+    """event/{gw}/live payload consistent with the given fixture states"""
+    rng = random.Random(seed)
+    fixture_by_team = {}
+    for fixture in gw_fixtures:
+        fixture_by_team[fixture['team_h']] = fixture
+        fixture_by_team[fixture['team_a']] = fixture
+
+    by_team = {}
+    for element in bootstrap['elements']:
+        by_team.setdefault(element['team'], []).append(element)
+
+    elements = []
+    for team_id, players in by_team.items():
+        fixture = fixture_by_team.get(team_id)
+        game_minutes = fixture['minutes'] if fixture and fixture['started'] else 0
+        starters = set()
+        for element_type, count in ((GKP, 1), (DEF, 4), (MID, 4), (FWD, 2)):
+            pool = [p['id'] for p in players if p['element_type'] == element_type]
+            starters.update(rng.sample(pool, count))
+        bench = [p['id'] for p in players if p['id'] not in starters]
+        subs_on = set(rng.sample(bench, 3))
+        subbed_off = set(rng.sample(sorted(starters), 3))
+        sub_minute = rng.randint(55, 80)
+
+        for player in players:
+            element_id = player['id']
+            if element_id in starters:
+                minutes = game_minutes
+                if element_id in subbed_off and game_minutes > sub_minute:
+                    minutes = sub_minute
+            elif element_id in subs_on and game_minutes > sub_minute:
+                minutes = game_minutes - sub_minute
+            else:
+                minutes = 0
+            elements.append({'id': element_id, 'stats': _player_stats(rng, player['element_type'], minutes, element_id in starters)})
+    elements.sort(key=lambda e: e['id'])
+    return {'elements': elements}
+
+
+def _player_stats(rng, element_type, minutes, started):
+    stats = {
+        'minutes': minutes, 'goals_scored': 0, 'assists': 0, 'clean_sheets': 0, 'goals_conceded': 0,
+        'own_goals': 0, 'penalties_saved': 0, 'penalties_missed': 0, 'yellow_cards': 0, 'red_cards': 0,
+        'saves': 0, 'bonus': 0, 'bps': 0, 'starts': int(started and minutes > 0), 'total_points': 0,
+    }
+    if minutes == 0:
+        return stats
+    share = minutes / 90
+    if element_type != GKP:
+        stats['goals_scored'] = int(rng.random() < 0.08 * element_type * share)
+        stats['assists'] = int(rng.random() < 0.1 * share)
+    else:
+        stats['saves'] = rng.randint(0, int(6 * share))
+    stats['yellow_cards'] = int(rng.random() < 0.1 * share)
+    stats['red_cards'] = int(rng.random() < 0.005 * share)
+    stats['goals_conceded'] = rng.randint(0, int(3 * share)) if element_type in (GKP, DEF) else 0
+    clean_sheet = minutes >= 60 and stats['goals_conceded'] == 0
+    stats['clean_sheets'] = int(clean_sheet)
+    stats['bps'] = rng.randint(-3, 30) + 24 * stats['goals_scored'] + 9 * stats['assists']
+
+    points = 2 if minutes >= 60 else 1
+    points += GOAL_POINTS[element_type] * stats['goals_scored'] + 3 * stats['assists']
+    if clean_sheet and element_type in (GKP, DEF):
+        points += 4
+    elif clean_sheet and element_type == MID:
+        points += 1
+    points += stats['saves'] // 3 - stats['yellow_cards'] - 3 * stats['red_cards']
+    stats['total_points'] = points
+    return stats
+
+
+def generate_picks(bootstrap, n_entries, seed=0, transfer_hit_rate=0.15):
+    """{entry_id: picks payload} for n_entries random valid squads"""
+    rng = random.Random(seed)
+    pools = {t: [e for e in bootstrap['elements'] if e['element_type'] == t] for t in POSITIONS}
+    picks_by_entry = {}
+    for entry_id in range(1, n_entries + 1):
+        squad = _random_squad(rng, pools)
+        n_def, n_mid, n_fwd = rng.choice(FORMATIONS)
+        xi = squad[GKP][:1] + squad[DEF][:n_def] + squad[MID][:n_mid] + squad[FWD][:n_fwd]
+        bench_outfield = squad[DEF][n_def:] + squad[MID][n_mid:] + squad[FWD][n_fwd:]
+        rng.shuffle(bench_outfield)
+        order = xi + squad[GKP][1:] + bench_outfield
+        captain, vice = rng.sample(range(1, 11), 2)
+        picks = []
+        for slot, element in enumerate(order):
+            picks.append({
+                'element': element['id'],
+                'position': slot + 1,
+                'multiplier': (2 if slot == captain else 1) if slot < 11 else 0,
+                'is_captain': slot == captain,
+                'is_vice_captain': slot == vice,
+            })
+        cost = 4 * rng.randint(1, 2) if rng.random() < transfer_hit_rate else 0
+        picks_by_entry[entry_id] = {
+            'picks': picks,
+            'active_chip': None,
+            'entry_history': {'event_transfers_cost': cost},
+        }
+    return picks_by_entry
+
+
+def _random_squad(rng, pools):
+    while True:
+        per_team = {}
+        squad = {}
+        for element_type, count in SQUAD_SHAPE.items():
+            chosen = []
+            for element in rng.sample(pools[element_type], len(pools[element_type])):
+                if per_team.get(element['team'], 0) >= 3:
+                    continue
+                chosen.append(element)
+                per_team[element['team']] = per_team.get(element['team'], 0) + 1
+                if len(chosen) == count:
+                    break
+            squad[element_type] = chosen
+        if all(len(squad[t]) == SQUAD_SHAPE[t] for t in SQUAD_SHAPE):
+            return squad
+
+
+def generate_standings(picks_by_entry, seed=0):
+    """Classic-league style standings rows for the given entries"""
+    rng = random.Random(seed)
+    rows = [{
+        'entry': entry_id,
+        'entry_name': f'Entry {entry_id}',
+        'player_name': f'Manager {entry_id}',
+        'total': rng.randint(200, 900),
+        'event_total': 0,
+    } for entry_id in picks_by_entry]
+    rows.sort(key=lambda r: -r['total'])
+    for rank, row in enumerate(rows, 1):
+        row['rank'] = row['last_rank'] = rank
+    return rows
@@ -0,0 +1,54 @@
+import asyncio
+import threading
+import time
+from types import SimpleNamespace
+
+from request_scheduler import AsyncRequestScheduler, RequestScheduler
+
+KEY = 'event/1/live/'
+CONDITIONAL = {'If-None-Match': '"abc"'}
+
+
+def test_conditional_and_plain_requests_are_not_merged():
+    scheduler = RequestScheduler(rate=100)
+    started = threading.Event()
+    results = {}
+
+    def conditional():
+        started.set()
+        time.sleep(0.2)
+        return SimpleNamespace(status_code=304, headers={})
+
+    def plain():
+        return SimpleNamespace(status_code=200, headers={})
+
+    thread = threading.Thread(target=lambda: results.setdefault(
+        'conditional', scheduler.call(KEY, conditional, headers=CONDITIONAL)))
+    thread.start()
+    assert started.wait(timeout=5)
+    results['plain'] = scheduler.call(KEY, plain, headers={})
+    thread.join(timeout=5)
+
+    assert results['conditional'].status_code == 304
+    assert results['plain'].status_code == 200
+    assert scheduler.stats()['deduplicated'] == 0
+
+
+def test_async_conditional_and_plain_requests_are_not_merged():
+    scheduler = AsyncRequestScheduler(rate=100)
+
+    async def conditional():
+        await asyncio.sleep(0.1)
+        return 304
+
+    async def plain():
+        return 200
+
+    async def run():
+        return await asyncio.gather(
+            scheduler.call(KEY, conditional, status=lambda code: code, headers=CONDITIONAL),
+            scheduler.call(KEY, plain, status=lambda code: code),
+        )
+
+    assert asyncio.run(run()) == [304, 200]
+    assert scheduler.stats()['deduplicated'] == 0